@@ -24,8 +24,6 @@ class AnalysisService:
         """Lazy initialization of scrapers"""
         if not self.scrapers_initialized:
             try:
-                import sys
-                sys.path.insert(0, '/app')
                 from scrapers.scraper_manager import ScraperManager
                 
                 data_dir = Path('/app/data')
@@ -42,8 +40,6 @@ class AnalysisService:
         """Lazy initialization of AI analyzer"""
         if not self.analyzer_initialized:
             try:
-                import sys
-                sys.path.insert(0, '/app')
                 from llm.analyzer import ForexAnalyzer
                 
                 self.analyzer = ForexAnalyzer()
@@ -57,11 +53,11 @@ class AnalysisService:
         """Lazy initialization of chart image analyzer"""
         if not self.chart_analyzer_initialized:
             try:
-                import sys
-                sys.path.insert(0, '/app')
                 from llm.chart_analyzer import ChartImageAnalyzer
                 
-                self.chart_analyzer = ChartImageAnalyzer()
+                # Share the news analyzer's OpenAI connection pool
+                self._init_analyzer()
+                self.chart_analyzer = ChartImageAnalyzer(client=self.analyzer.client)
                 self.chart_analyzer_initialized = True
                 logger.info("Chart analyzer initialized successfully")
             except Exception as e:
@@ -193,22 +189,13 @@ class AnalysisService:
             
             # Analyze with AI
             logger.info(f"Analyzing {pair} with {len(articles)} articles...")
-            analysis = await self.analyzer.analyze_pair(
+            analysis, recommendation = await self.analyzer.analyze_and_recommend(
                 pair=pair,
                 articles=articles,
                 timeframe=timeframe,
                 trading_style=trading_style
             )
             
-            # Get trade recommendation
-            logger.info(f"Getting trade recommendation for {pair}...")
-            recommendation = await self.analyzer.get_trade_recommendation(
-                pair=pair,
-                analysis=analysis,
-                timeframe=timeframe,
-                trading_style=trading_style
-            )
-            
             return {
                 'pair': pair,
                 'analysis': {
@@ -495,8 +482,6 @@ class AnalysisService:
         """Generate analysis based on pair configuration when chart image not available"""
         try:
             # Get pair config
-            import sys
-            sys.path.insert(0, '/app')
             from config.settings import PAIR_CONFIGS
             
             config = PAIR_CONFIGS.get(pair.upper(), {
@@ -4,14 +4,11 @@ Scraping Service - Integration with scrapers module
 import asyncio
 import logging
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 
 from django.conf import settings
-
-# Import scrapers module
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from django.core.cache import cache
 
 from scrapers.scraper_manager import ScraperManager
 from scrapers.base_scraper import NewsArticle as ScraperNewsArticle
@@ -20,6 +17,50 @@ from .models import NewsArticle, ScrapeLog
 
 logger = logging.getLogger(__name__)
 
+# News API response cache
+NEWS_CACHE_TTL = 60  # seconds
+NEWS_CACHE_VERSION_KEY = 'news:version'
+
+
+def get_news_cache_key(
+    pairs: Optional[List[str]] = None,
+    limit: int = 50,
+    source: Optional[str] = None
+) -> str:
+    """Build the cache key for a news query"""
+    return f"news:{','.join(pairs or [])}:{limit}:{source or ''}"
+
+
+def get_cached_news(cache_key: str) -> Tuple[int, Optional[Dict]]:
+    """
+    Fetch the news cache version and a cached response in one round-trip
+    
+    Entries are stored as (version, payload); one written before the last
+    invalidate_news_cache() call is treated as a miss.
+    
+    Returns:
+        Tuple of (current version, cached payload or None)
+    """
+    values = cache.get_many([NEWS_CACHE_VERSION_KEY, cache_key])
+    version = values.get(NEWS_CACHE_VERSION_KEY, 0)
+    entry = values.get(cache_key)
+    if entry is not None and entry[0] == version:
+        return version, entry[1]
+    return version, None
+
+
+def set_cached_news(cache_key: str, version: int, payload: Dict):
+    """Cache a news response under the version read by get_cached_news"""
+    cache.set(cache_key, (version, payload), NEWS_CACHE_TTL)
+
+
+def invalidate_news_cache():
+    """Invalidate all cached news responses by bumping the cache version"""
+    try:
+        cache.incr(NEWS_CACHE_VERSION_KEY)
+    except ValueError:
+        cache.set(NEWS_CACHE_VERSION_KEY, 1, timeout=None)
+
 
 class ScrapingService:
     """Service for managing news scraping operations"""
@@ -117,6 +158,9 @@ class ScrapingService:
                 logger.error(f"Failed to save article {article.url}: {e}")
                 continue
         
+        if new_count:
+            invalidate_news_cache()
+        
         logger.info(f"Saved {new_count} new articles to database")
         return new_count
     
@@ -203,9 +247,20 @@ class ScrapingService:
         
         return list(queryset[:limit])
     
-    def get_scrape_logs(self, limit: int = 20) -> List[ScrapeLog]:
-        """Get recent scrape logs"""
-        return list(ScrapeLog.objects.all().order_by('-started_at')[:limit])
+    def get_scrape_logs(self, limit: int = 20) -> List[Dict]:
+        """
+        Get recent scrape logs as plain dicts
+        
+        Rows are projected with ``values()`` so no model instances are built;
+        datetimes are left for the JSON renderer to encode.
+        """
+        return list(
+            ScrapeLog.objects.order_by('-started_at')
+            .values(
+                'id', 'source', 'started_at', 'completed_at',
+                'articles_found', 'articles_new', 'success', 'error_message'
+            )[:limit]
+        )
 
 
 # Singleton instance
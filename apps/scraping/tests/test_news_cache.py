@@ -0,0 +1,91 @@
+"""
+Test the get_news response cache and its invalidation on new articles
+"""
+
+import asyncio
+import os
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'forex_assistant.settings')
+
+import django
+
+django.setup()
+
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory
+
+from apps.scraping import services, views
+from apps.scraping.models import NewsArticle
+
+LOCMEM = override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'news-tests'}
+})
+
+
+def _get_news(**params):
+    return views.get_news(APIRequestFactory().get('/api/news/', params))
+
+
+def _scraped(url):
+    return SimpleNamespace(
+        source='fxstreet', title=url, url=url, summary='', content='', published_at=None,
+        related_pairs=['EURUSD'], sentiment=None, importance='high'
+    )
+
+
+def _save(urls, existing=()):
+    """Run _save_articles_to_db for urls without a database"""
+    service = services.ScrapingService.__new__(services.ScrapingService)
+    with mock.patch.object(NewsArticle.objects, 'filter') as filter_, \
+            mock.patch.object(NewsArticle.objects, 'create'):
+        filter_.side_effect = lambda url: mock.Mock(exists=lambda: url in existing)
+        return asyncio.run(service._save_articles_to_db([_scraped(url) for url in urls]))
+
+
+@LOCMEM
+def test_repeat_query_is_served_from_cache():
+    cache.clear()
+    service = mock.Mock(get_recent_articles=mock.Mock(return_value=[]))
+    with mock.patch.object(views, 'get_scraping_service', return_value=service):
+        assert _get_news(pair='eurusd').data == {'count': 0, 'articles': []}
+        assert _get_news(pair='EURUSD').data['count'] == 0
+        _get_news(pair='GBPUSD')
+    assert service.get_recent_articles.call_count == 2
+
+
+@LOCMEM
+def test_new_articles_invalidate_cached_news():
+    cache.clear()
+    key = services.get_news_cache_key(['EURUSD'], 50, None)
+    version, _ = services.get_cached_news(key)
+    services.set_cached_news(key, version, {'count': 0, 'articles': []})
+    assert services.get_cached_news(key)[1] is not None
+
+    assert _save(['https://a', 'https://b'], existing={'https://a', 'https://b'}) == 0
+    assert services.get_cached_news(key)[1] is not None
+
+    assert _save(['https://a', 'https://c'], existing={'https://a'}) == 1
+    new_version, cached = services.get_cached_news(key)
+    assert new_version != version
+    assert cached is None
+
+
+def test_lookup_is_one_cache_round_trip():
+    key = services.get_news_cache_key(None, 50, None)
+    fake_cache = mock.Mock()
+    fake_cache.get_many.return_value = {services.NEWS_CACHE_VERSION_KEY: 3, key: (3, {'count': 0})}
+    with mock.patch.object(services, 'cache', fake_cache):
+        assert services.get_cached_news(key) == (3, {'count': 0})
+    # RedisCache.get_many is a single MGET
+    assert fake_cache.mock_calls == [mock.call.get_many([services.NEWS_CACHE_VERSION_KEY, key])]
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
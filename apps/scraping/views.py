@@ -11,7 +11,7 @@ from rest_framework.response import Response
 
 from .models import NewsArticle, ScrapeLog
 from .tasks import trigger_scrape_task
-from .services import get_scraping_service
+from .services import get_scraping_service, get_news_cache_key, get_cached_news, set_cached_news
 
 
 @api_view(['POST'])
@@ -51,9 +51,6 @@ def get_news(request):
     limit = int(request.query_params.get('limit', 50))
     source = request.query_params.get('source')  # Filter by source
     
-    # Use service for better query handling
-    service = get_scraping_service()
-    
     # Build pairs list
     if pair:
         pairs = [pair.upper()]
@@ -62,6 +59,15 @@ def get_news(request):
     else:
         pairs = None
     
+    # Serve repeated queries from cache
+    cache_key = get_news_cache_key(pairs, limit, source)
+    version, cached = get_cached_news(cache_key)
+    if cached is not None:
+        return Response(cached)
+    
+    # Use service for better query handling
+    service = get_scraping_service()
+    
     # Get articles
     articles = service.get_recent_articles(pairs=pairs, limit=limit)
     
@@ -69,7 +75,7 @@ def get_news(request):
     if source:
         articles = [a for a in articles if a.source == source]
     
-    return Response({
+    payload = {
         'count': len(articles),
         'articles': [
             {
@@ -85,7 +91,10 @@ def get_news(request):
             }
             for article in articles
         ]
-    })
+    }
+    set_cached_news(cache_key, version, payload)
+    
+    return Response(payload)
 
 
 @api_view(['GET'])
@@ -97,19 +106,10 @@ def get_scrape_logs(request):
     service = get_scraping_service()
     logs = service.get_scrape_logs(limit=limit)
     
+    for log in logs:
+        log['id'] = str(log['id'])
+    
     return Response({
         'count': len(logs),
-        'logs': [
-            {
-                'id': str(log.id),
-                'source': log.source,
-                'started_at': log.started_at.isoformat(),
-                'completed_at': log.completed_at.isoformat() if log.completed_at else None,
-                'articles_found': log.articles_found,
-                'articles_new': log.articles_new,
-                'success': log.success,
-                'error_message': log.error_message,
-            }
-            for log in logs
-        ]
+        'logs': logs
     })
@@ -0,0 +1,58 @@
+"""
+Serializers for Trading App
+"""
+from rest_framework import serializers
+from .models import TradingAccount, TradingRobot
+
+
+class TradingAccountSerializer(serializers.ModelSerializer):
+    """
+    Serializer for TradingAccount list responses
+    
+    Also accepts ``values()`` rows, so list views can skip model instances.
+    """
+    
+    id = serializers.CharField(read_only=True)
+    
+    class Meta:
+        model = TradingAccount
+        fields = [
+            'id', 'broker', 'login', 'server', 'nickname', 'balance', 'equity',
+            'currency', 'risk_percent', 'is_connected', 'last_connected'
+        ]
+        read_only_fields = fields
+
+
+class TradingRobotSerializer(serializers.ModelSerializer):
+    """
+    Serializer for TradingRobot list responses
+    
+    Also accepts ``values()`` rows, so list views can skip model instances.
+    """
+    
+    id = serializers.CharField(read_only=True)
+    # Annotated by the queryset: winning trades in percent, 0 without trades
+    win_rate = serializers.FloatField(read_only=True)
+    
+    class Meta:
+        model = TradingRobot
+        fields = [
+            'id', 'name', 'robot_type', 'symbol', 'timeframe', 'sl_strategy',
+            'tp_strategy', 'risk_percent', 'is_active', 'total_trades', 'winning_trades',
+            'win_rate'
+        ]
+        read_only_fields = fields
+
+
+class TradingRobotCreateSerializer(serializers.Serializer):
+    """Validates one robot of a create request; defaults match create_robot"""
+    
+    robot_name = serializers.CharField(max_length=100, default='New Robot')
+    robot_type = serializers.CharField(max_length=50, default='stochastic')
+    symbol = serializers.CharField(max_length=20, default='EURUSD')
+    timeframe = serializers.CharField(max_length=10, default='H1')
+    sl_strategy = serializers.CharField(max_length=50, default='atr')
+    tp_strategy = serializers.CharField(max_length=50, default='risk_reward')
+    sl_params = serializers.DictField(default=dict)
+    tp_params = serializers.DictField(default=dict)
+    risk_percent = serializers.FloatField(default=1.0)
@@ -2,16 +2,11 @@
 Trading Service - Integration with trading modules
 """
 import logging
-from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 from decimal import Decimal
 
 from django.conf import settings
 
-# Import trading modules
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
-
 from trading.robot_manager import RobotManager
 from indicators.risk_manager import RiskManager
 
@@ -25,7 +20,14 @@ class TradingService:
     
     def __init__(self):
         self.robot_manager = None  # Lazy initialization
-        self.risk_manager = RiskManager()
+        self._risk_manager = None  # Lazy initialization
+    
+    @property
+    def risk_manager(self) -> RiskManager:
+        """Risk manager, created on first access"""
+        if self._risk_manager is None:
+            self._risk_manager = RiskManager()
+        return self._risk_manager
     
     def connect_account(self, account: TradingAccount, password: str) -> Dict:
         """
@@ -78,11 +80,12 @@ class TradingService:
             Dict with updated account info
         """
         try:
-            # TODO: Implement actual broker API call
+            # TODO: Implement actual broker API call and set from_broker
             # For now, return current values
             
             return {
                 'success': True,
+                'from_broker': False,
                 'balance': float(account.balance),
                 'equity': float(account.equity),
                 'currency': account.currency,
@@ -96,6 +99,114 @@ class TradingService:
                 'error': str(e)
             }
     
+    def refresh_accounts_bulk(
+        self,
+        accounts: Optional[Iterable[TradingAccount]] = None,
+        batch_size: int = 500
+    ) -> Dict:
+        """
+        Refresh balance and equity for many accounts with batched UPDATEs
+        
+        Broker data is fetched before any row is locked; the rows are then
+        locked and written in one short transaction per batch. Rows locked by
+        another refresher are skipped rather than waited on. Only accounts the
+        broker actually reported on, and whose balance or equity changed, are
+        written, so last_connected is never bumped without a broker call.
+        
+        Args:
+            accounts: Accounts to refresh (default: all connected accounts)
+            batch_size: Maximum rows per lock query and UPDATE statement
+        
+        Returns:
+            Dict with counts of updated, unchanged, skipped and failed accounts
+        """
+        from django.db import transaction
+        from django.utils import timezone
+        
+        cent = Decimal('0.01')
+        
+        try:
+            if accounts is None:
+                accounts = (
+                    TradingAccount.objects
+                    .filter(is_connected=True)
+                    .only('id', 'login', 'balance', 'equity', 'currency', 'leverage', 'last_connected')
+                )
+            
+            # Broker round-trips happen outside any transaction
+            refreshed = []
+            unchanged = 0
+            failed = 0
+            for account in accounts:
+                info = self.refresh_account_info(account)
+                if not info.get('success'):
+                    failed += 1
+                    continue
+                if not info.get('from_broker'):
+                    # The row's own values echoed back; nothing to write
+                    unchanged += 1
+                    continue
+                balance = Decimal(str(info['balance'])).quantize(cent)
+                equity = Decimal(str(info['equity'])).quantize(cent)
+                refreshed.append((account, balance, equity))
+            
+            now = timezone.now()
+            updated = 0
+            skipped = 0
+            for start in range(0, len(refreshed), batch_size):
+                batch = refreshed[start:start + batch_size]
+                with transaction.atomic():
+                    # Compare against the values under the lock, not the
+                    # snapshot the broker call was made from
+                    locked = {
+                        account_id: (balance, equity)
+                        for account_id, balance, equity in (
+                            TradingAccount.objects
+                            .select_for_update(skip_locked=True)
+                            .filter(id__in=[account.id for account, _, _ in batch])
+                            .values_list('id', 'balance', 'equity')
+                        )
+                    }
+                    to_update = []
+                    for account, balance, equity in batch:
+                        if account.id not in locked:
+                            skipped += 1
+                            continue
+                        if locked[account.id] == (balance, equity):
+                            unchanged += 1
+                            continue
+                        account.balance = balance
+                        account.equity = equity
+                        account.last_connected = now
+                        to_update.append(account)
+                    
+                    if to_update:
+                        TradingAccount.objects.bulk_update(
+                            to_update,
+                            ['balance', 'equity', 'last_connected']
+                        )
+                updated += len(to_update)
+            
+            logger.info(
+                f"Refreshed {updated} accounts "
+                f"({unchanged} unchanged, {skipped} locked, {failed} failed)"
+            )
+            
+            return {
+                'success': True,
+                'updated': updated,
+                'unchanged': unchanged,
+                'skipped': skipped,
+                'failed': failed
+            }
+            
+        except Exception as e:
+            logger.error(f"Bulk account refresh failed: {e}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
     def calculate_position_size(
         self,
         account: TradingAccount,
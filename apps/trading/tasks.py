@@ -0,0 +1,25 @@
+"""
+Celery Tasks for Trading App
+"""
+import logging
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def refresh_trading_accounts_task():
+    """
+    Refresh balance/equity of all connected trading accounts
+    Not on the beat schedule until refresh_account_info calls the broker
+    """
+    from .services import get_trading_service
+    
+    try:
+        result = get_trading_service().refresh_accounts_bulk()
+        logger.info(f"Trading account refresh completed: {result}")
+        return result
+        
+    except Exception as e:
+        logger.error(f"Trading account refresh task failed: {e}", exc_info=True)
+        return {'success': False, 'error': str(e)}
@@ -0,0 +1,90 @@
+"""
+Test validation of the bulk robot creation endpoint
+"""
+
+import os
+import sys
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'forex_assistant.settings')
+
+import django
+
+django.setup()
+
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.trading import views
+from apps.trading.models import TradingRobot
+
+
+def _post(body):
+    request = APIRequestFactory().post('/api/robots/create/bulk/', body, format='json')
+    force_authenticate(request, user=get_user_model()(email='trader@example.com'))
+    return views.create_robots_bulk(request)
+
+
+def _fake_bulk_create(robots, batch_size=None):
+    for i, robot in enumerate(robots, start=1):
+        robot.id = i
+    return robots
+
+
+def test_rejects_non_object_body():
+    response = _post([{'robot_name': 'A'}])
+    assert response.status_code == 400
+    assert 'robots' in response.data['detail']
+
+
+def test_rejects_missing_or_non_list_robots():
+    assert _post({}).status_code == 400
+    assert _post({'robots': {'robot_name': 'A'}}).status_code == 400
+
+
+def test_rejects_empty_list():
+    assert _post({'robots': []}).status_code == 400
+
+
+def test_rejects_non_object_items():
+    response = _post({'robots': [{'robot_name': 'A'}, 1]})
+    assert response.status_code == 400
+    assert response.data['robots'][0] == {}
+    assert 'non_field_errors' in response.data['robots'][1]
+
+
+def test_rejects_invalid_fields():
+    response = _post({'robots': [{'risk_percent': 'high'}, {'symbol': 'X' * 21}]})
+    assert response.status_code == 400
+    assert 'risk_percent' in response.data['robots'][0]
+    assert 'symbol' in response.data['robots'][1]
+
+
+def test_caps_list_length():
+    with mock.patch.object(TradingRobot.objects, 'bulk_create') as bulk_create:
+        response = _post({'robots': [{}] * (views.MAX_BULK_ROBOTS + 1)})
+    assert response.status_code == 400
+    bulk_create.assert_not_called()
+
+
+def test_creates_and_initializes_valid_robots():
+    init_result = {'success': True, 'robot_id': 'x'}
+    with mock.patch.object(TradingRobot.objects, 'bulk_create', side_effect=_fake_bulk_create), \
+            mock.patch.object(views.get_trading_service(), 'create_robot_instance',
+                              return_value=init_result) as create_instance:
+        response = _post({'robots': [{'robot_name': 'A'}, {'symbol': 'GBPUSD'}]})
+
+    assert response.status_code == 200
+    assert response.data['count'] == 2
+    assert [r['name'] for r in response.data['robots']] == ['A', 'New Robot']
+    assert all(r['initialization'] == init_result for r in response.data['robots'])
+    created = [call.args[0] for call in create_instance.call_args_list]
+    assert [robot.symbol for robot in created] == ['EURUSD', 'GBPUSD']
+    assert created[0].sl_params == {} and created[0].risk_percent == 1.0
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
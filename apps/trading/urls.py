@@ -16,6 +16,7 @@ urlpatterns = [
     path('robots/available/', views.get_available_robots, name='available_robots'),
     path('robots/', views.list_user_robots, name='list_robots'),
     path('robots/create/', views.create_robot, name='create_robot'),
+    path('robots/create/bulk/', views.create_robots_bulk, name='create_robots_bulk'),
     path('robots/<int:robot_id>/', views.update_robot, name='update_robot'),
     path('robots/<int:robot_id>/delete/', views.delete_robot, name='delete_robot'),
 ]
@@ -2,40 +2,41 @@
 Views for Trading App
 Integrated with trading/ module
 """
+from django.db.models import Case, F, FloatField, Value, When
+from django.utils import timezone
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from apps.accounts.authentication import TokenAuthentication
+
 from .models import TradingAccount, TradingRobot
+from .serializers import TradingAccountSerializer, TradingRobotCreateSerializer, TradingRobotSerializer
 from .services import get_trading_service
 
+# Read-only endpoints try the session cookie first so browser clients are
+# authenticated without a token lookup; API clients still use Bearer tokens.
+READ_AUTHENTICATION_CLASSES = [SessionAuthentication, TokenAuthentication]
+
+# Largest robot list accepted by create_robots_bulk
+MAX_BULK_ROBOTS = 100
+
 
 # ============== Trading Accounts API ==============
 
 @api_view(['GET'])
+@authentication_classes(READ_AUTHENTICATION_CLASSES)
 @permission_classes([IsAuthenticated])
 def list_trading_accounts(request):
     """Get all trading accounts for the current user"""
-    accounts = TradingAccount.objects.filter(user=request.user)
+    accounts = TradingAccount.objects.filter(user=request.user).values(
+        *TradingAccountSerializer.Meta.fields
+    )
     
     return Response({
-        'accounts': [
-            {
-                'id': str(acc.id),
-                'broker': acc.broker,
-                'login': acc.login,
-                'server': acc.server,
-                'nickname': acc.nickname,
-                'balance': float(acc.balance),
-                'equity': float(acc.equity),
-                'currency': acc.currency,
-                'risk_percent': acc.risk_percent,
-                'is_connected': acc.is_connected,
-                'last_connected': acc.last_connected.isoformat() if acc.last_connected else None,
-            }
-            for acc in accounts
-        ]
+        'accounts': TradingAccountSerializer(accounts, many=True).data
     })
 
 
@@ -59,26 +60,25 @@ def add_trading_account(request):
             status=status.HTTP_400_BAD_REQUEST
         )
     
-    # Check if account already exists
-    if TradingAccount.objects.filter(
-        user=request.user, broker=broker, login=login, server=server
-    ).exists():
-        return Response(
-            {'detail': 'Account already exists'},
-            status=status.HTTP_400_BAD_REQUEST
-        )
-    
-    # Create account
-    account = TradingAccount.objects.create(
+    # Create account (uniqueness is enforced by the user/broker/login/server constraint)
+    account, created = TradingAccount.objects.get_or_create(
         user=request.user,
         broker=broker,
         login=login,
         server=server,
-        nickname=nickname,
-        risk_percent=risk_percent
+        defaults={
+            'nickname': nickname,
+            'risk_percent': risk_percent,
+        }
     )
+    if not created:
+        return Response(
+            {'detail': 'Account already exists'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
     
     # Try to connect
+    service = get_trading_service()
     connection_result = service.connect_account(account, password)
     
     return Response({
@@ -98,9 +98,7 @@ def add_trading_account(request):
 @permission_classes([IsAuthenticated])
 def refresh_trading_account(request, account_id):
     """Refresh account information by reconnecting to broker"""
-    try:
-        account = TradingAccount.objects.get(id=account_id, user=request.user)
-    except TradingAccount.DoesNotExist:
+    if not TradingAccount.objects.filter(id=account_id, user=request.user).exists():
         return Response(
             {'detail': 'Account not found'},
             status=status.HTTP_404_NOT_FOUND
@@ -117,15 +115,13 @@ def refresh_trading_account(request, account_id):
 @permission_classes([IsAuthenticated])
 def delete_trading_account(request, account_id):
     """Delete a trading account"""
-    try:
-        account = TradingAccount.objects.get(id=account_id, user=request.user)
-    except TradingAccount.DoesNotExist:
+    deleted, _ = TradingAccount.objects.filter(id=account_id, user=request.user).delete()
+    if not deleted:
         return Response(
             {'detail': 'Account not found'},
             status=status.HTTP_404_NOT_FOUND
         )
     
-    account.delete()
     return Response({'success': True, 'message': 'Account deleted'})
 
 
@@ -133,25 +129,29 @@ def delete_trading_account(request, account_id):
 @permission_classes([IsAuthenticated])
 def update_account_risk(request, account_id):
     """Update risk percentage for an account"""
-    try:
-        account = TradingAccount.objects.get(id=account_id, user=request.user)
-    except TradingAccount.DoesNotExist:
+    accounts = TradingAccount.objects.filter(id=account_id, user=request.user)
+    
+    risk_percent = request.data.get('risk_percent')
+    if risk_percent is not None:
+        # Single UPDATE - no need to fetch the row first
+        found = accounts.update(risk_percent=risk_percent)
+    else:
+        risk_percent = accounts.values_list('risk_percent', flat=True).first()
+        found = risk_percent is not None
+    
+    if not found:
         return Response(
             {'detail': 'Account not found'},
             status=status.HTTP_404_NOT_FOUND
         )
     
-    risk_percent = request.data.get('risk_percent')
-    if risk_percent is not None:
-        account.risk_percent = risk_percent
-        account.save(update_fields=['risk_percent'])
-    
-    return Response({'success': True, 'risk_percent': account.risk_percent})
+    return Response({'success': True, 'risk_percent': risk_percent})
 
 
 # ============== Trading Robots API ==============
 
 @api_view(['GET'])
+@authentication_classes(READ_AUTHENTICATION_CLASSES)
 @permission_classes([IsAuthenticated])
 def get_available_robots(request):
     """Get available robots and strategies"""
@@ -165,49 +165,47 @@ def get_available_robots(request):
 
 
 @api_view(['GET'])
+@authentication_classes(READ_AUTHENTICATION_CLASSES)
 @permission_classes([IsAuthenticated])
 def list_user_robots(request):
     """Get user's active robots"""
-    robots = TradingRobot.objects.filter(user=request.user)
+    robots = TradingRobot.objects.filter(user=request.user).annotate(
+        win_rate=Case(
+            When(total_trades=0, then=Value(0.0)),
+            default=F('winning_trades') * 100.0 / F('total_trades'),
+            output_field=FloatField()
+        )
+    ).values(*TradingRobotSerializer.Meta.fields)
     
     return Response({
-        'robots': [
-            {
-                'id': str(robot.id),
-                'name': robot.name,
-                'robot_type': robot.robot_type,
-                'symbol': robot.symbol,
-                'timeframe': robot.timeframe,
-                'sl_strategy': robot.sl_strategy,
-                'tp_strategy': robot.tp_strategy,
-                'risk_percent': robot.risk_percent,
-                'is_active': robot.is_active,
-                'total_trades': robot.total_trades,
-                'winning_trades': robot.winning_trades,
-            }
-            for robot in robots
-        ]
+        'robots': TradingRobotSerializer(robots, many=True).data
     })
 
 
+def _build_robot(user, data) -> TradingRobot:
+    """Build an unsaved TradingRobot from request data"""
+    return TradingRobot(
+        user=user,
+        name=data.get('robot_name', 'New Robot'),
+        robot_type=data.get('robot_type', 'stochastic'),
+        symbol=data.get('symbol', 'EURUSD'),
+        timeframe=data.get('timeframe', 'H1'),
+        sl_strategy=data.get('sl_strategy', 'atr'),
+        tp_strategy=data.get('tp_strategy', 'risk_reward'),
+        sl_params=data.get('sl_params', {}),
+        tp_params=data.get('tp_params', {}),
+        risk_percent=data.get('risk_percent', 1.0),
+    )
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def create_robot(request):
     """Create a new trading robot"""
     service = get_trading_service()
     
-    robot = TradingRobot.objects.create(
-        user=request.user,
-        name=request.data.get('robot_name', 'New Robot'),
-        robot_type=request.data.get('robot_type', 'stochastic'),
-        symbol=request.data.get('symbol', 'EURUSD'),
-        timeframe=request.data.get('timeframe', 'H1'),
-        sl_strategy=request.data.get('sl_strategy', 'atr'),
-        tp_strategy=request.data.get('tp_strategy', 'risk_reward'),
-        sl_params=request.data.get('sl_params', {}),
-        tp_params=request.data.get('tp_params', {}),
-        risk_percent=request.data.get('risk_percent', 1.0),
-    )
+    robot = _build_robot(request.user, request.data)
+    robot.save(force_insert=True)
     
     # Initialize robot
     init_result = service.create_robot_instance(robot)
@@ -223,25 +221,64 @@ def create_robot(request):
     })
 
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def create_robots_bulk(request):
+    """Create several trading robots in batched INSERTs"""
+    robots_data = request.data.get('robots') if isinstance(request.data, dict) else None
+    if not isinstance(robots_data, list):
+        return Response(
+            {'detail': 'robots must be a list'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    serializer = TradingRobotCreateSerializer(
+        data=robots_data, many=True, allow_empty=False, max_length=MAX_BULK_ROBOTS
+    )
+    if not serializer.is_valid():
+        return Response({'robots': serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+    
+    service = get_trading_service()
+    robots = TradingRobot.objects.bulk_create(
+        [_build_robot(request.user, data) for data in serializer.validated_data],
+        batch_size=500
+    )
+    
+    return Response({
+        'success': True,
+        'count': len(robots),
+        'robots': [
+            {
+                'id': str(robot.id),
+                'name': robot.name,
+                'robot_type': robot.robot_type,
+                'initialization': service.create_robot_instance(robot),
+            }
+            for robot in robots
+        ]
+    })
+
+
 @api_view(['PATCH'])
 @permission_classes([IsAuthenticated])
 def update_robot(request, robot_id):
     """Update robot configuration"""
-    try:
-        robot = TradingRobot.objects.get(id=robot_id, user=request.user)
-    except TradingRobot.DoesNotExist:
+    editable_fields = ['sl_strategy', 'tp_strategy', 'sl_params', 'tp_params', 'risk_percent', 'is_active']
+    robots = TradingRobot.objects.filter(id=robot_id, user=request.user)
+    
+    # Update fields with a single UPDATE - no need to fetch the row first
+    updates = {field: request.data[field] for field in editable_fields if field in request.data}
+    if updates:
+        found = robots.update(**updates, updated_at=timezone.now())
+    else:
+        found = robots.exists()
+    
+    if not found:
         return Response(
             {'detail': 'Robot not found'},
             status=status.HTTP_404_NOT_FOUND
         )
     
-    # Update fields
-    for field in ['sl_strategy', 'tp_strategy', 'sl_params', 'tp_params', 'risk_percent', 'is_active']:
-        if field in request.data:
-            setattr(robot, field, request.data[field])
-    
-    robot.save()
-    
     return Response({'success': True, 'message': 'Robot updated'})
 
 
@@ -249,13 +286,11 @@ def update_robot(request, robot_id):
 @permission_classes([IsAuthenticated])
 def delete_robot(request, robot_id):
     """Delete a robot"""
-    try:
-        robot = TradingRobot.objects.get(id=robot_id, user=request.user)
-    except TradingRobot.DoesNotExist:
+    deleted, _ = TradingRobot.objects.filter(id=robot_id, user=request.user).delete()
+    if not deleted:
         return Response(
             {'detail': 'Robot not found'},
             status=status.HTTP_404_NOT_FOUND
         )
     
-    robot.delete()
     return Response({'success': True, 'message': 'Robot deleted'})
@@ -9,8 +9,10 @@ from .settings import (
 from .timeframes import (
     Timeframe,
     TIMEFRAME_NAMES, TIMEFRAME_WEIGHTS,
+    TIMEFRAME_ORDER, TIMEFRAME_INDEX, TIMEFRAME_WEIGHTS_ARR,
     TRADING_STYLES, MTF_CONFIG,
-    get_mtf_timeframes, calculate_mtf_score
+    get_mtf_timeframes, calculate_mtf_score,
+    SIGNAL_CODES, calculate_mtf_score_batch
 )
 
 __all__ = [
@@ -24,6 +26,8 @@ __all__ = [
     # Timeframes
     "Timeframe",
     "TIMEFRAME_NAMES", "TIMEFRAME_WEIGHTS",
+    "TIMEFRAME_ORDER", "TIMEFRAME_INDEX", "TIMEFRAME_WEIGHTS_ARR",
     "TRADING_STYLES", "MTF_CONFIG",
-    "get_mtf_timeframes", "calculate_mtf_score"
+    "get_mtf_timeframes", "calculate_mtf_score",
+    "SIGNAL_CODES", "calculate_mtf_score_batch"
 ]
@@ -3,6 +3,7 @@ Application Settings and Configuration
 """
 import os
 from pathlib import Path
+from types import MappingProxyType
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -14,14 +15,32 @@ DATA_DIR = BASE_DIR / "data"
 LOGS_DIR = BASE_DIR / "logs"
 
 # Create directories if they don't exist
-DATA_DIR.mkdir(exist_ok=True)
-LOGS_DIR.mkdir(exist_ok=True)
+for _dir in (DATA_DIR, LOGS_DIR):
+    if not _dir.exists():
+        _dir.mkdir()
 
 # OpenAI Configuration
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
 OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 
+# LLM response cache (exact match on model + prompts + sampling params)
+LLM_CACHE_PATH = Path(os.getenv("LLM_CACHE_PATH", DATA_DIR / "llm_cache.sqlite3"))
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", 900))  # seconds, 0 disables the cache
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", 10000))
+
+# Semantic cache: reuse responses of near-identical prompts (costs one embedding call per miss)
+LLM_SEMANTIC_CACHE = os.getenv("LLM_SEMANTIC_CACHE", "false").lower() in ("true", "1", "yes")
+LLM_SEMANTIC_CACHE_THRESHOLD = float(os.getenv("LLM_SEMANTIC_CACHE_THRESHOLD", 0.92))
+LLM_EMBEDDING_MODEL = os.getenv("LLM_EMBEDDING_MODEL", "text-embedding-3-small")
+
+# Client-side throttling of OpenAI calls (keep below the account's rate limits)
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", 16))
+LLM_MAX_REQUESTS_PER_MIN = int(os.getenv("LLM_MAX_REQUESTS_PER_MIN", 5000))
+LLM_MAX_TOKENS_PER_MIN = int(os.getenv("LLM_MAX_TOKENS_PER_MIN", 15_000_000))
+# Retries of 429 / 5xx / connection errors, with exponential backoff honouring Retry-After
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", 4))
+
 # Server Configuration
 HOST = os.getenv("HOST", "0.0.0.0")
 PORT = int(os.getenv("PORT", 8000))
@@ -37,7 +56,7 @@ LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 DEFAULT_PAIRS = ["EURUSD", "XAUUSD", "GBPUSD", "USDJPY"]
 
 # News sources configuration
-NEWS_SOURCES = {
+_NEWS_SOURCES = {
     "investing": {
         "name": "Investing.com",
         "base_url": "https://www.investing.com",
@@ -66,7 +85,7 @@ NEWS_SOURCES = {
 }
 
 # Pair-specific configurations
-PAIR_CONFIGS = {
+_PAIR_CONFIGS = {
     "EURUSD": {
         "volatility": "medium",
         "default_sl_pips": 30,
@@ -93,23 +112,12 @@ PAIR_CONFIGS = {
     }
 }
 
-# Email Configuration (Gmail SMTP)
-EMAIL_BACKEND = os.getenv('EMAIL_BACKEND', 'django.core.mail.backends.smtp.EmailBackend')
-EMAIL_HOST = os.getenv('EMAIL_HOST', 'smtp.gmail.com')
-EMAIL_PORT = int(os.getenv('EMAIL_PORT', 587))
-EMAIL_USE_TLS = os.getenv('EMAIL_USE_TLS', 'True').lower() == 'true'
-EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER', '')
-EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD', '')
-DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', EMAIL_HOST_USER)
-EMAIL_FROM_NAME = os.getenv('EMAIL_FROM_NAME', 'Forex Assistant')
-
-# Frontend URL for email links
-FRONTEND_URL = os.getenv('FRONTEND_URL', 'http://localhost:3000')
+# Read-only views of the configs above (keyword lists frozen to tuples)
+NEWS_SOURCES = MappingProxyType({
+    name: MappingProxyType(source) for name, source in _NEWS_SOURCES.items()
+})
+PAIR_CONFIGS = MappingProxyType({
+    pair: MappingProxyType({**config, "keywords": tuple(config["keywords"])})
+    for pair, config in _PAIR_CONFIGS.items()
+})
 
-# Celery Configuration
-CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL', 'redis://localhost:6379/0')
-CELERY_RESULT_BACKEND = os.getenv('CELERY_RESULT_BACKEND', 'redis://localhost:6379/0')
-CELERY_ACCEPT_CONTENT = ['json']
-CELERY_TASK_SERIALIZER = 'json'
-CELERY_RESULT_SERIALIZER = 'json'
-CELERY_TIMEZONE = 'UTC'
@@ -2,7 +2,10 @@
 Timeframe Configuration for Multi-Timeframe Analysis
 """
 from enum import Enum
-from typing import Dict, List
+from functools import lru_cache
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
 
 
 class Timeframe(str, Enum):
@@ -44,6 +47,11 @@ TIMEFRAME_WEIGHTS = {
     "MN1": 0.20
 }
 
+# Timeframe weights as a contiguous array in Timeframe order, for vectorized scoring
+TIMEFRAME_ORDER = tuple(tf.value for tf in Timeframe)
+TIMEFRAME_INDEX = {tf: i for i, tf in enumerate(TIMEFRAME_ORDER)}
+TIMEFRAME_WEIGHTS_ARR = np.array([TIMEFRAME_WEIGHTS[tf] for tf in TIMEFRAME_ORDER], dtype=np.float64)
+
 # Default timeframes for different trading styles
 TRADING_STYLES = {
     "scalping": {
@@ -83,10 +91,10 @@ MTF_CONFIG = {
 }
 
 
-def get_mtf_timeframes(primary_tf: str) -> List[str]:
-    """Get timeframes for multi-timeframe analysis"""
-    higher_tfs = MTF_CONFIG.get(primary_tf, [])
-    return [primary_tf] + higher_tfs
+@lru_cache(maxsize=16)
+def get_mtf_timeframes(primary_tf: str) -> Tuple[str, ...]:
+    """Get timeframes for multi-timeframe analysis (cached, so returned as a tuple)"""
+    return (primary_tf, *MTF_CONFIG.get(primary_tf, ()))
 
 
 def calculate_mtf_score(signals: Dict[str, str]) -> Dict:
@@ -94,15 +102,20 @@ def calculate_mtf_score(signals: Dict[str, str]) -> Dict:
     bullish_score = 0
     bearish_score = 0
     total_weight = 0
+    # Signals per direction, counted in the same pass for the confluence figure
+    counts = {"bullish": 0, "bearish": 0, "neutral": 0}
     
     for tf, signal in signals.items():
         weight = TIMEFRAME_WEIGHTS.get(tf, 0.1)
         total_weight += weight
         
-        if signal.lower() == "bullish":
+        signal = signal.lower()
+        if signal == "bullish":
             bullish_score += weight
-        elif signal.lower() == "bearish":
+        elif signal == "bearish":
             bearish_score += weight
+        if signal in counts:
+            counts[signal] += 1
     
     if total_weight == 0:
         return {"direction": "neutral", "confidence": 0, "confluence": 0}
@@ -120,7 +133,7 @@ def calculate_mtf_score(signals: Dict[str, str]) -> Dict:
         direction = "neutral"
         confidence = 50
     
-    agreeing = sum(1 for s in signals.values() if s.lower() == direction)
+    agreeing = counts[direction]
     confluence = (agreeing / len(signals)) * 100 if signals else 0
     
     return {
@@ -130,3 +143,65 @@ def calculate_mtf_score(signals: Dict[str, str]) -> Dict:
         "bullish_score": round(bullish_pct, 1),
         "bearish_score": round(bearish_pct, 1)
     }
+
+
+# Signal encoding for batch scoring
+SIGNAL_CODES = {"bullish": 1, "bearish": -1, "neutral": 0}
+
+
+def calculate_mtf_score_batch(
+    signals_matrix: np.ndarray,
+    timeframes: Sequence[str]
+) -> Dict[str, np.ndarray]:
+    """
+    Calculate multi-timeframe confluence scores for many symbols at once
+    
+    Args:
+        signals_matrix: (n_symbols, n_timeframes) array of SIGNAL_CODES values
+            (1 = bullish, -1 = bearish, 0 = neutral)
+        timeframes: Timeframe of each column, e.g. ["H1", "H4", "D1"]
+    
+    Returns:
+        Dict of per-symbol arrays with the same keys as calculate_mtf_score
+    """
+    signals_matrix = np.asarray(signals_matrix, dtype=np.int8)
+    n_symbols, n_timeframes = signals_matrix.shape
+    
+    if n_timeframes == 0:
+        zeros = np.zeros(n_symbols)
+        return {
+            "direction": np.full(n_symbols, "neutral"),
+            "confidence": zeros,
+            "confluence": zeros,
+            "bullish_score": zeros,
+            "bearish_score": zeros
+        }
+    
+    indices = np.array([TIMEFRAME_INDEX.get(tf, -1) for tf in timeframes], dtype=np.intp)
+    weights = np.where(indices >= 0, TIMEFRAME_WEIGHTS_ARR[indices], 0.1)
+    bullish = signals_matrix == 1
+    bearish = signals_matrix == -1
+    
+    total_weight = weights.sum()
+    bullish_pct = (bullish @ weights) / total_weight * 100
+    bearish_pct = (bearish @ weights) / total_weight * 100
+    
+    is_bullish = bullish_pct > bearish_pct
+    is_bearish = bearish_pct > bullish_pct
+    
+    direction = np.where(is_bullish, "bullish", np.where(is_bearish, "bearish", "neutral"))
+    confidence = np.where(is_bullish, bullish_pct, np.where(is_bearish, bearish_pct, 50.0))
+    agreeing = np.where(
+        is_bullish,
+        bullish.sum(axis=1),
+        np.where(is_bearish, bearish.sum(axis=1), (signals_matrix == 0).sum(axis=1))
+    )
+    confluence = agreeing / n_timeframes * 100
+    
+    return {
+        "direction": direction,
+        "confidence": np.round(confidence, 1),
+        "confluence": np.round(confluence, 1),
+        "bullish_score": np.round(bullish_pct, 1),
+        "bearish_score": np.round(bearish_pct, 1)
+    }
@@ -87,7 +87,7 @@ start_dev() {
     create_env_file
     
     # Build and start containers
-    docker compose -f "$SCRIPT_DIR/docker-compose.yml" up -d --build db redis web celery_worker celery_beat
+    docker compose -f "$SCRIPT_DIR/docker-compose.yml" up -d --build db redis web celery_worker celery_worker_bulk celery_beat
     
     wait_for_db
     run_migrations
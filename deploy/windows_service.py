@@ -11,12 +11,20 @@ Usage:
 import sys
 import os
 import time
+import asyncio
+import contextlib
 import logging
+import threading
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+if TYPE_CHECKING:
+    # Imported at runtime in main(): TradingBot pulls in MetaTrader5
+    from trading_bot import TradingBot
+
 try:
     import win32serviceutil
     import win32service
@@ -39,6 +47,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger("ForexService")
 
+# Seconds between trading cycles
+CYCLE_INTERVAL = 300
+
 
 if HAS_PYWIN32:
     class ForexAssistantService(win32serviceutil.ServiceFramework):
@@ -72,7 +83,6 @@ if HAS_PYWIN32:
         
         def main(self):
             """Main service loop"""
-            import asyncio
             from trading_bot import TradingBot
             from dotenv import load_dotenv
             
@@ -88,24 +98,55 @@ if HAS_PYWIN32:
                 demo_mode=os.getenv("DEMO_MODE", "true").lower() == "true"
             )
             
-            # Run bot with periodic check for stop signal
+            # One event loop for the whole service lifetime
             loop = asyncio.new_event_loop()
             asyncio.set_event_loop(loop)
             
             try:
-                while self.running:
-                    # Run one trading cycle
-                    loop.run_until_complete(bot._trading_cycle())
-                    
-                    # Wait 5 minutes or until stop signal
-                    result = win32event.WaitForSingleObject(self.stop_event, 300000)
-                    if result == win32event.WAIT_OBJECT_0:
-                        break
+                loop.run_until_complete(self._service_main(bot))
             except Exception as e:
                 logger.error(f"Service error: {e}")
             finally:
                 loop.close()
                 logger.info("Service stopped")
+        
+        async def _service_main(self, bot: "TradingBot"):
+            """Run trading cycles until the service stop event is signalled"""
+            loop = asyncio.get_running_loop()
+            stop = asyncio.Event()
+            
+            def wait_for_stop():
+                win32event.WaitForSingleObject(self.stop_event, win32event.INFINITE)
+                loop.call_soon_threadsafe(stop.set)
+            
+            threading.Thread(target=wait_for_stop, name="ServiceStopWatcher", daemon=True).start()
+            
+            trading = asyncio.create_task(self._trading_loop(bot, stop))
+            stopper = asyncio.create_task(stop.wait())
+            try:
+                await asyncio.wait({trading, stopper}, return_when=asyncio.FIRST_COMPLETED)
+                stopper.cancel()
+                
+                if trading.done():
+                    # Surface errors raised by the trading loop
+                    trading.result()
+                else:
+                    # Stop requested: interrupt the cycle in progress
+                    trading.cancel()
+                    with contextlib.suppress(asyncio.CancelledError):
+                        await trading
+            finally:
+                await bot.analyzer.aclose()
+        
+        async def _trading_loop(self, bot: "TradingBot", stop: asyncio.Event):
+            """Run one trading cycle, then wait CYCLE_INTERVAL or until stopped"""
+            while not stop.is_set():
+                await bot._trading_cycle()
+                
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=CYCLE_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
 
 
 def install_with_nssm():
@@ -2,8 +2,34 @@
 ASGI config for Forex Analysis Assistant project.
 """
 import os
-from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'forex_assistant.settings')
+# Persistent connections are per-thread and are not reused reliably under
+# ASGI; close them after each request and put a pooler (PgBouncer) in front
+# of Postgres instead.
+os.environ.setdefault('DB_CONN_MAX_AGE', '0')
+
+from asgiref.sync import sync_to_async
+from django.core.asgi import get_asgi_application
+from django.db import connections
+
+django_application = get_asgi_application()
+
+
+async def _lifespan(receive, send):
+    """Handle ASGI lifespan events, closing DB connections on shutdown"""
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await sync_to_async(connections.close_all)()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
 
-application = get_asgi_application()
+async def application(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        await _lifespan(receive, send)
+    else:
+        await django_application(scope, receive, send)
@@ -1,44 +1,95 @@
 """
 Celery Configuration for Forex Analysis Assistant
 """
+import logging
 import os
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import beat_init
+from kombu import Queue
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'forex_assistant.settings')
 
+logger = logging.getLogger(__name__)
+
 app = Celery('forex_assistant')
 app.config_from_object('django.conf:settings', namespace='CELERY')
 app.autodiscover_tasks()
 
-# Periodic task schedule
-app.conf.beat_schedule = {
-    # Check subscription expiry daily at 9:00 AM
-    'check-subscription-expiry-daily': {
-        'task': 'apps.accounts.tasks.check_subscription_expiry',
-        'schedule': crontab(hour=9, minute=0),
-    },
-    'scrape-news-every-4-hours': {
-        'task': 'apps.scraping.tasks.trigger_scrape_task',
-        'schedule': crontab(minute=0, hour='*/4'),  # Every 4 hours
+# Periodic task schedule, grouped by beat shard:
+# shard -> name -> (task, crontab hour, crontab minute)
+_SCHEDULES = {
+    'subscription': {
+        # Check subscription expiry daily at 9:00 AM
+        'check-subscription-expiry-daily': ('apps.accounts.tasks.check_subscription_expiry', 9, 0),
+        # Check expired subscriptions daily at 10:00 AM
+        'check-expired-subscriptions-daily': ('apps.accounts.tasks.check_expired_subscriptions', 10, 0),
     },
-    'daily-market-analysis': {
-        'task': 'apps.scraping.tasks.daily_analysis_task',
-        'schedule': crontab(hour=8, minute=0),  # Daily at 8 AM
+    'intraday': {
+        # Scrape news every 4 hours
+        'scrape-news-every-4-hours': ('apps.scraping.tasks.trigger_scrape_task', '*/4', 0),
     },
-    # Check expired subscriptions daily at 10:00 AM
-    'check-expired-subscriptions-daily': {
-        'task': 'apps.accounts.tasks.check_expired_subscriptions',
-        'schedule': crontab(hour=10, minute=0),
+    'daily': {
+        # Daily market analysis at 8:00 AM
+        'daily-market-analysis': ('apps.scraping.tasks.daily_analysis_task', 8, 0),
     },
 }
 
+# Comma-separated shards this beat process schedules (all when unset). Each
+# sharded beat needs its own file-based scheduler; the DatabaseScheduler from
+# settings runs every entry stored in the shared DB, whatever this process
+# loaded, so sharded beats on it would fire every task more than once:
+#   FOREX_BEAT_SHARD=intraday celery -A forex_assistant beat \
+#       -S celery.beat:PersistentScheduler -s celerybeat-intraday
+_BEAT_SHARDS = [
+    shard.strip() for shard in os.environ.get('FOREX_BEAT_SHARD', '').split(',') if shard.strip()
+] or list(_SCHEDULES)
+
+# Every worker imports this module, so a typo is logged and skipped, not raised
+_UNKNOWN_SHARDS = [shard for shard in _BEAT_SHARDS if shard not in _SCHEDULES]
+if _UNKNOWN_SHARDS:
+    logger.warning(
+        f"Ignoring unknown FOREX_BEAT_SHARD {', '.join(_UNKNOWN_SHARDS)}; "
+        f"valid shards: {', '.join(_SCHEDULES)}"
+    )
+    _BEAT_SHARDS = [shard for shard in _BEAT_SHARDS if shard in _SCHEDULES]
+
+app.conf.beat_schedule = {
+    name: {'task': task, 'schedule': crontab(hour=hour, minute=minute)}
+    for shard in _BEAT_SHARDS
+    for name, (task, hour, minute) in _SCHEDULES[shard].items()
+}
+
+
+@beat_init.connect
+def _warn_sharded_database_beat(sender, **kwargs):
+    """Warn when a sharded beat runs on the shared DatabaseScheduler"""
+    from django_celery_beat.schedulers import DatabaseScheduler
+    
+    if os.environ.get('FOREX_BEAT_SHARD') and isinstance(sender.scheduler, DatabaseScheduler):
+        logger.warning(
+            "FOREX_BEAT_SHARD is set but beat is using DatabaseScheduler, which runs "
+            "every entry in the shared DB; start sharded beats with "
+            "-S celery.beat:PersistentScheduler to avoid duplicate runs"
+        )
+
+
 # Celery configuration
 app.conf.update(
     task_track_started=True,
     task_time_limit=30 * 60,  # 30 minutes
     worker_prefetch_multiplier=1,
     worker_max_tasks_per_child=1000,
+    # realtime: scraping/analysis/trading, consumed with prefetch 1 for latency
+    # bulk: short account bookkeeping and email tasks, consumed with a high
+    # prefetch (--prefetch-multiplier=16) to save broker round-trips.
+    # A worker started without -Q consumes all queues.
+    task_queues=(Queue('celery'), Queue('realtime'), Queue('bulk')),
+    task_routes={
+        'apps.scraping.tasks.*': {'queue': 'realtime'},
+        'apps.trading.tasks.*': {'queue': 'realtime'},
+        'apps.accounts.tasks.*': {'queue': 'bulk'},
+    },
 )
 
 @app.task(bind=True, ignore_result=True)
@@ -0,0 +1,25 @@
+"""
+REST Framework renderers
+"""
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSON renderer backed by orjson
+    
+    datetimes, UUIDs, dataclasses (TradeResult, Position) and numpy arrays
+    are encoded natively in C; anything orjson does not know (Decimal, lazy
+    strings, querysets, ...) falls back to DRF's encoder.
+    """
+    
+    options = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z | orjson.OPT_SERIALIZE_NUMPY
+    
+    _default = JSONEncoder().default
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return orjson.dumps(data, default=self._default, option=self.options)
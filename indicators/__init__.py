@@ -1,4 +1,4 @@
-from .risk_manager import RiskManager, PositionSize
+from .risk_manager import RiskManager, PositionSize, PositionSizes
 from .trade_executor import TradeExecutor, TradeResult, Position, OrderType
 
-__all__ = ["RiskManager", "PositionSize", "TradeExecutor", "TradeResult", "Position", "OrderType"]
+__all__ = ["RiskManager", "PositionSize", "PositionSizes", "TradeExecutor", "TradeResult", "Position", "OrderType"]
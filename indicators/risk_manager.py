@@ -3,13 +3,40 @@ Risk Manager - Position sizing and risk calculations
 Phase 3: Trading Algorithm Support
 """
 import logging
-from typing import Dict, Optional
-from pydantic import BaseModel
+import sys
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Minimum SL per pair based on typical spreads
+_MIN_SL = {
+    "EURUSD": 10,
+    "GBPUSD": 15,
+    "USDJPY": 10,
+    "XAUUSD": 50,
+    "AUDUSD": 12,
+    "USDCAD": 15,
+}
+
+# Maximum recommended SL per pair
+_MAX_SL = {
+    "EURUSD": 100,
+    "GBPUSD": 120,
+    "USDJPY": 100,
+    "XAUUSD": 300,
+    "AUDUSD": 100,
+    "USDCAD": 100,
+}
+
+# (pip_value, min_sl, max_sl) for pairs not listed above
+_DEFAULT_ROW: Tuple[float, int, int] = (10.0, 15, 100)
+
 
-class PositionSize(BaseModel):
+@dataclass(slots=True)
+class PositionSize:
     """Position size calculation result"""
     lots: float
     risk_amount: float
@@ -21,12 +48,51 @@ class PositionSize(BaseModel):
     potential_loss: float
 
 
+@dataclass
+class PositionSizes:
+    """Bulk position size calculation result (one array entry per pair)"""
+    pairs: List[str]
+    lots: np.ndarray
+    risk_amount: float
+    risk_percent: float
+    pip_value: np.ndarray
+    sl_pips: np.ndarray
+    tp_pips: np.ndarray
+    potential_profit: np.ndarray
+    potential_loss: np.ndarray
+    
+    def __len__(self) -> int:
+        return len(self.pairs)
+    
+    def get(self, index: int) -> PositionSize:
+        """Materialize a single PositionSize"""
+        return PositionSize(
+            lots=float(self.lots[index]),
+            risk_amount=self.risk_amount,
+            risk_percent=self.risk_percent,
+            pip_value=float(self.pip_value[index]),
+            sl_pips=int(self.sl_pips[index]),
+            tp_pips=int(self.tp_pips[index]),
+            potential_profit=float(self.potential_profit[index]),
+            potential_loss=float(self.potential_loss[index])
+        )
+
+
 class RiskManager:
     """
     Risk management for forex trading
     Calculates position sizes based on account balance and risk parameters
     """
     
+    __slots__ = (
+        "account_balance",
+        "risk_percent",
+        "max_risk_percent",
+        "min_lot_size",
+        "max_lot_size",
+        "_max_daily_loss_5pct",
+    )
+    
     # Standard lot sizes
     STANDARD_LOT = 100000
     MINI_LOT = 10000
@@ -44,6 +110,12 @@ class RiskManager:
         "XAUUSD": 1.0,  # Gold - $1 per 0.01 move per 1 oz
     }
     
+    # (pip_value, min_sl, max_sl) per pair, resolved with a single lookup
+    _PAIR_TABLE: Dict[str, Tuple[float, int, int]] = {
+        sys.intern(pair): (pip_value, _MIN_SL.get(pair, 15), _MAX_SL.get(pair, 100))
+        for pair, pip_value in PIP_VALUES.items()
+    }
+    
     def __init__(
         self,
         account_balance: float = 10000.0,
@@ -57,6 +129,8 @@ class RiskManager:
         self.max_risk_percent = max_risk_percent
         self.min_lot_size = min_lot_size
         self.max_lot_size = max_lot_size
+        # Default (5%) daily loss limit, refreshed in update_balance
+        self._max_daily_loss_5pct = account_balance * 0.05
     
     def calculate_position_size(
         self,
@@ -77,18 +151,13 @@ class RiskManager:
         Returns:
             PositionSize with calculated values
         """
-        risk_pct = risk_percent or self.risk_percent
-        
-        # Ensure risk doesn't exceed maximum
-        if risk_pct > self.max_risk_percent:
-            logger.warning(f"Risk {risk_pct}% exceeds max {self.max_risk_percent}%, using max")
-            risk_pct = self.max_risk_percent
+        risk_pct = self._effective_risk_percent(risk_percent)
         
         # Calculate risk amount
         risk_amount = self.account_balance * (risk_pct / 100)
         
         # Get pip value for the pair
-        pip_value = self.PIP_VALUES.get(pair.upper(), 10.0)
+        pip_value = self._pair_row(pair)[0]
         
         # Calculate position size in lots
         # Formula: Lots = Risk Amount / (SL Pips * Pip Value)
@@ -102,8 +171,9 @@ class RiskManager:
         lots = max(self.min_lot_size, min(lots, self.max_lot_size))
         
         # Calculate potential profit/loss
-        potential_loss = lots * sl_pips * pip_value
-        potential_profit = lots * tp_pips * pip_value
+        value_per_pip = lots * pip_value
+        potential_loss = value_per_pip * sl_pips
+        potential_profit = value_per_pip * tp_pips
         
         return PositionSize(
             lots=lots,
@@ -116,6 +186,74 @@ class RiskManager:
             potential_loss=potential_loss
         )
     
+    def calculate_position_sizes_bulk(
+        self,
+        pairs: Sequence[str],
+        sl_pips: Sequence[int],
+        tp_pips: Sequence[int],
+        risk_percent: Optional[float] = None
+    ) -> PositionSizes:
+        """
+        Calculate position sizes for many pairs at once
+        
+        Same rules as calculate_position_size, evaluated as NumPy arrays.
+        Use PositionSizes.get() to materialize a single PositionSize.
+        """
+        risk_pct = self._effective_risk_percent(risk_percent)
+        risk_amount = self.account_balance * (risk_pct / 100)
+        
+        pairs = list(pairs)
+        sl = np.asarray(sl_pips, dtype=np.int64)
+        tp = np.asarray(tp_pips, dtype=np.int64)
+        pip_values = np.fromiter(
+            (self._pair_row(pair)[0] for pair in pairs),
+            dtype=np.float64,
+            count=len(pairs)
+        )
+        
+        # Lots = Risk Amount / (SL Pips * Pip Value), min lot when SL is not set
+        with np.errstate(divide='ignore', invalid='ignore'):
+            lots = np.where(sl > 0, risk_amount / (sl * pip_values), self.min_lot_size)
+        lots = np.clip(self._round_lots(lots), self.min_lot_size, self.max_lot_size)
+        value_per_pip = lots * pip_values
+        
+        return PositionSizes(
+            pairs=pairs,
+            lots=lots,
+            risk_amount=risk_amount,
+            risk_percent=risk_pct,
+            pip_value=pip_values,
+            sl_pips=sl,
+            tp_pips=tp,
+            potential_profit=value_per_pip * tp,
+            potential_loss=value_per_pip * sl
+        )
+    
+    @staticmethod
+    def _round_lots(lots: np.ndarray) -> np.ndarray:
+        """
+        Round lots to 2 decimals exactly as round() does in calculate_position_size
+        
+        np.round rounds lots * 100 half-to-even, so a product that lands on .5
+        (e.g. 0.025 -> 2.5 -> 0.02) can differ from round(), which looks at the
+        exact binary value (round(0.025, 2) == 0.03). Only those ties are redone.
+        """
+        cents = lots * 100
+        rounded = np.rint(cents) / 100
+        for i in np.flatnonzero(np.abs(cents - np.trunc(cents)) == 0.5):
+            rounded[i] = round(float(lots[i]), 2)
+        return rounded
+    
+    def _effective_risk_percent(self, risk_percent: Optional[float]) -> float:
+        """Requested (or default) risk percent, capped at the maximum"""
+        risk_pct = risk_percent or self.risk_percent
+        
+        # Ensure risk doesn't exceed maximum
+        if risk_pct > self.max_risk_percent:
+            logger.warning(f"Risk {risk_pct}% exceeds max {self.max_risk_percent}%, using max")
+            risk_pct = self.max_risk_percent
+        return risk_pct
+    
     def validate_trade(
         self,
         pair: str,
@@ -129,57 +267,47 @@ class RiskManager:
         Returns:
             Dict with validation result and reasons
         """
-        issues = []
+        _, min_sl, max_sl = self._pair_row(pair)
+        rr_ratio = tp_pips / sl_pips if sl_pips > 0 else 0
         
-        # Check minimum SL distance
-        min_sl = self._get_min_sl(pair)
-        if sl_pips < min_sl:
-            issues.append(f"SL too tight: {sl_pips} pips < minimum {min_sl} pips")
+        # Evaluate all checks up front; messages are only built on failure
+        sl_too_tight = sl_pips < min_sl
+        rr_too_low = sl_pips > 0 and tp_pips < min_rr_ratio * sl_pips
+        sl_too_wide = sl_pips > max_sl
         
-        # Check risk-reward ratio
-        if sl_pips > 0:
-            rr_ratio = tp_pips / sl_pips
-            if rr_ratio < min_rr_ratio:
-                issues.append(f"R:R ratio {rr_ratio:.2f} < minimum {min_rr_ratio}")
+        if not (sl_too_tight or rr_too_low or sl_too_wide):
+            return {"valid": True, "issues": [], "rr_ratio": rr_ratio}
         
-        # Check maximum SL
-        max_sl = self._get_max_sl(pair)
-        if sl_pips > max_sl:
+        issues = []
+        if sl_too_tight:
+            issues.append(f"SL too tight: {sl_pips} pips < minimum {min_sl} pips")
+        if rr_too_low:
+            issues.append(f"R:R ratio {rr_ratio:.2f} < minimum {min_rr_ratio}")
+        if sl_too_wide:
             issues.append(f"SL too wide: {sl_pips} pips > maximum {max_sl} pips")
         
         return {
-            "valid": len(issues) == 0,
+            "valid": False,
             "issues": issues,
-            "rr_ratio": tp_pips / sl_pips if sl_pips > 0 else 0
+            "rr_ratio": rr_ratio
         }
     
+    def _pair_row(self, pair: str) -> Tuple[float, int, int]:
+        """Get (pip_value, min_sl, max_sl) for a pair"""
+        return self._PAIR_TABLE.get(pair) or self._PAIR_TABLE.get(pair.upper(), _DEFAULT_ROW)
+    
     def _get_min_sl(self, pair: str) -> int:
         """Get minimum SL for a pair based on typical spreads"""
-        min_sl_map = {
-            "EURUSD": 10,
-            "GBPUSD": 15,
-            "USDJPY": 10,
-            "XAUUSD": 50,
-            "AUDUSD": 12,
-            "USDCAD": 15,
-        }
-        return min_sl_map.get(pair.upper(), 15)
+        return self._pair_row(pair)[1]
     
     def _get_max_sl(self, pair: str) -> int:
         """Get maximum recommended SL for a pair"""
-        max_sl_map = {
-            "EURUSD": 100,
-            "GBPUSD": 120,
-            "USDJPY": 100,
-            "XAUUSD": 300,
-            "AUDUSD": 100,
-            "USDCAD": 100,
-        }
-        return max_sl_map.get(pair.upper(), 100)
+        return self._pair_row(pair)[2]
     
     def update_balance(self, new_balance: float):
         """Update account balance"""
         self.account_balance = new_balance
+        self._max_daily_loss_5pct = new_balance * 0.05
         logger.info(f"Account balance updated to {new_balance}")
     
     def calculate_max_daily_loss(self, max_daily_risk_percent: float = 5.0) -> float:
@@ -192,5 +320,7 @@ class RiskManager:
         max_daily_risk_percent: float = 5.0
     ) -> bool:
         """Check if trading should stop due to daily loss limit"""
+        if max_daily_risk_percent == 5.0:
+            return daily_pnl <= -self._max_daily_loss_5pct
         max_loss = self.calculate_max_daily_loss(max_daily_risk_percent)
         return daily_pnl <= -max_loss
@@ -3,43 +3,83 @@ Trade Executor - MetaTrader 5 Integration
 Phase 3: Algorithmic Trading
 """
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Optional, Any
-from enum import Enum
-from pydantic import BaseModel
+from functools import lru_cache, wraps
+from types import SimpleNamespace
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Any
+from enum import IntEnum
 
 logger = logging.getLogger(__name__)
 
+# Worker threads for bulk operations
+BULK_MAX_WORKERS = 8
 
-class OrderType(Enum):
-    BUY = "buy"
-    SELL = "sell"
-    BUY_LIMIT = "buy_limit"
-    SELL_LIMIT = "sell_limit"
-    BUY_STOP = "buy_stop"
-    SELL_STOP = "sell_stop"
+# The MetaTrader5 binding has one terminal IPC connection per process and is not
+# documented as thread-safe, so every call into it is serialized
+_MT5_LOCK = threading.RLock()
 
 
-class TradeResult(BaseModel):
+def _mt5_serialized(method):
+    """Run method while holding the process-wide MT5 lock"""
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        with _MT5_LOCK:
+            return method(*args, **kwargs)
+    return wrapper
+
+
+@lru_cache(maxsize=None)
+def _mt5_module():
+    """Import MetaTrader5 on first use (loads the terminal DLL)"""
+    import MetaTrader5
+    return MetaTrader5
+
+
+class OrderType(IntEnum):
+    # Even values are buy-side, odd values sell-side
+    BUY = 0
+    SELL = 1
+    BUY_LIMIT = 2
+    SELL_LIMIT = 3
+    BUY_STOP = 4
+    SELL_STOP = 5
+    
+    @property
+    def label(self) -> str:
+        """Lowercase name used in results and logs (e.g. "buy_limit")"""
+        return self.name.lower()
+    
+    @property
+    def is_buy(self) -> bool:
+        return not self & 1
+
+
+@dataclass(slots=True)
+class TradeResult:
     """Result of a trade execution"""
     success: bool
-    order_id: Optional[int] = None
     pair: str
     order_type: str
     lots: float
+    message: str
+    order_id: Optional[int] = None
     entry_price: Optional[float] = None
     sl_price: Optional[float] = None
     tp_price: Optional[float] = None
-    message: str
-    timestamp: datetime = None
+    timestamp_ns: int = field(default_factory=time.time_ns)
     
-    def __init__(self, **data):
-        if 'timestamp' not in data or data['timestamp'] is None:
-            data['timestamp'] = datetime.now()
-        super().__init__(**data)
+    @property
+    def timestamp(self) -> datetime:
+        """Local time the result was created"""
+        return datetime.fromtimestamp(self.timestamp_ns / 1e9)
 
 
-class Position(BaseModel):
+@dataclass(slots=True)
+class Position:
     """Open position"""
     ticket: int
     pair: str
@@ -47,10 +87,10 @@ class Position(BaseModel):
     lots: float
     entry_price: float
     current_price: float
-    sl_price: Optional[float] = None
-    tp_price: Optional[float] = None
     profit: float
     opened_at: datetime
+    sl_price: Optional[float] = None
+    tp_price: Optional[float] = None
 
 
 class TradeExecutor:
@@ -74,11 +114,17 @@ class TradeExecutor:
         self.demo = demo
         self.connected = False
         self.mt5 = None
+        # Static symbol metadata (point, digits, volume limits), per session
+        self._symbol_cache: Dict[str, SimpleNamespace] = {}
+        # Built on connect() once MT5 constants are available
+        self._deal_template: Dict[str, Any] = {}
+        self._order_types: Tuple[int, ...] = ()
     
+    @_mt5_serialized
     def connect(self) -> bool:
         """Connect to MetaTrader 5 terminal"""
         try:
-            import MetaTrader5 as mt5
+            mt5 = _mt5_module()
             self.mt5 = mt5
             
             # Initialize MT5
@@ -97,6 +143,7 @@ class TradeExecutor:
                     logger.error(f"MT5 login failed: {mt5.last_error()}")
                     return False
             
+            self._build_request_tables(mt5)
             self.connected = True
             account_info = mt5.account_info()
             logger.info(f"Connected to MT5: {account_info.name} (Balance: {account_info.balance})")
@@ -109,13 +156,35 @@ class TradeExecutor:
             logger.error(f"MT5 connection error: {e}")
             return False
     
+    def _build_request_tables(self, mt5):
+        """Prebuild the fixed parts of order requests"""
+        self._deal_template = {
+            "action": mt5.TRADE_ACTION_DEAL,
+            "deviation": 20,
+            "magic": 123456,
+            "type_time": mt5.ORDER_TIME_GTC,
+            "type_filling": mt5.ORDER_FILLING_IOC,
+        }
+        # Indexed by OrderType value
+        self._order_types = (
+            mt5.ORDER_TYPE_BUY,
+            mt5.ORDER_TYPE_SELL,
+            mt5.ORDER_TYPE_BUY_LIMIT,
+            mt5.ORDER_TYPE_SELL_LIMIT,
+            mt5.ORDER_TYPE_BUY_STOP,
+            mt5.ORDER_TYPE_SELL_STOP,
+        )
+    
+    @_mt5_serialized
     def disconnect(self):
         """Disconnect from MT5"""
         if self.mt5:
             self.mt5.shutdown()
             self.connected = False
+            self._symbol_cache.clear()
             logger.info("Disconnected from MT5")
     
+    @_mt5_serialized
     def get_account_info(self) -> Optional[Dict]:
         """Get account information"""
         if not self.connected:
@@ -135,6 +204,7 @@ class TradeExecutor:
             }
         return None
     
+    @_mt5_serialized
     def get_symbol_info(self, symbol: str) -> Optional[Dict]:
         """Get symbol information"""
         if not self.connected:
@@ -156,6 +226,33 @@ class TradeExecutor:
             }
         return None
     
+    @_mt5_serialized
+    def _get_symbol_info_cached(self, pair: str) -> Optional[SimpleNamespace]:
+        """Get static symbol metadata, selecting the symbol on first use"""
+        cached = self._symbol_cache.get(pair)
+        if cached is not None:
+            return cached
+        
+        info = self.mt5.symbol_info(pair)
+        if not info:
+            return None
+        
+        # Enable symbol for trading
+        if not info.visible:
+            self.mt5.symbol_select(pair, True)
+        
+        cached = SimpleNamespace(
+            point=info.point,
+            digits=info.digits,
+            volume_min=info.volume_min,
+            volume_max=info.volume_max,
+            volume_step=info.volume_step,
+            visible=True
+        )
+        self._symbol_cache[pair] = cached
+        return cached
+    
+    @_mt5_serialized
     def execute_trade(
         self,
         pair: str,
@@ -163,7 +260,8 @@ class TradeExecutor:
         lots: float,
         sl_pips: int = 0,
         tp_pips: int = 0,
-        comment: str = "AI Trade"
+        comment: str = "AI Trade",
+        tick: Optional[Any] = None
     ) -> TradeResult:
         """
         Execute a trade
@@ -175,6 +273,7 @@ class TradeExecutor:
             sl_pips: Stop loss in pips
             tp_pips: Take profit in pips
             comment: Trade comment
+            tick: Current tick for the pair (from snapshot_ticks), fetched if omitted
         
         Returns:
             TradeResult with execution details
@@ -183,33 +282,30 @@ class TradeExecutor:
             return TradeResult(
                 success=False,
                 pair=pair,
-                order_type=order_type.value,
+                order_type=order_type.label,
                 lots=lots,
                 message="Not connected to MT5"
             )
         
         try:
-            # Get symbol info
-            symbol_info = self.mt5.symbol_info(pair)
+            # Get symbol info (cached per session)
+            symbol_info = self._get_symbol_info_cached(pair)
             if not symbol_info:
                 return TradeResult(
                     success=False,
                     pair=pair,
-                    order_type=order_type.value,
+                    order_type=order_type.label,
                     lots=lots,
                     message=f"Symbol {pair} not found"
                 )
             
-            # Enable symbol for trading
-            if not symbol_info.visible:
-                self.mt5.symbol_select(pair, True)
-            
             # Get current price
-            tick = self.mt5.symbol_info_tick(pair)
+            if tick is None:
+                tick = self.mt5.symbol_info_tick(pair)
             point = symbol_info.point
             
             # Determine price based on order type
-            if order_type in [OrderType.BUY, OrderType.BUY_LIMIT, OrderType.BUY_STOP]:
+            if order_type.is_buy:
                 price = tick.ask
                 sl_price = price - (sl_pips * point * 10) if sl_pips > 0 else 0
                 tp_price = price + (tp_pips * point * 10) if tp_pips > 0 else 0
@@ -218,30 +314,16 @@ class TradeExecutor:
                 sl_price = price + (sl_pips * point * 10) if sl_pips > 0 else 0
                 tp_price = price - (tp_pips * point * 10) if tp_pips > 0 else 0
             
-            # Map order type to MT5 constants
-            mt5_order_type = {
-                OrderType.BUY: self.mt5.ORDER_TYPE_BUY,
-                OrderType.SELL: self.mt5.ORDER_TYPE_SELL,
-                OrderType.BUY_LIMIT: self.mt5.ORDER_TYPE_BUY_LIMIT,
-                OrderType.SELL_LIMIT: self.mt5.ORDER_TYPE_SELL_LIMIT,
-                OrderType.BUY_STOP: self.mt5.ORDER_TYPE_BUY_STOP,
-                OrderType.SELL_STOP: self.mt5.ORDER_TYPE_SELL_STOP,
-            }[order_type]
-            
             # Prepare request
             request = {
-                "action": self.mt5.TRADE_ACTION_DEAL,
+                **self._deal_template,
                 "symbol": pair,
                 "volume": lots,
-                "type": mt5_order_type,
+                "type": self._order_types[order_type],
                 "price": price,
                 "sl": sl_price,
                 "tp": tp_price,
-                "deviation": 20,
-                "magic": 123456,
                 "comment": comment,
-                "type_time": self.mt5.ORDER_TIME_GTC,
-                "type_filling": self.mt5.ORDER_FILLING_IOC,
             }
             
             # Send order
@@ -251,7 +333,7 @@ class TradeExecutor:
                 return TradeResult(
                     success=False,
                     pair=pair,
-                    order_type=order_type.value,
+                    order_type=order_type.label,
                     lots=lots,
                     message=f"Order failed: {result.comment}"
                 )
@@ -260,7 +342,7 @@ class TradeExecutor:
                 success=True,
                 order_id=result.order,
                 pair=pair,
-                order_type=order_type.value,
+                order_type=order_type.label,
                 lots=lots,
                 entry_price=price,
                 sl_price=sl_price,
@@ -273,11 +355,55 @@ class TradeExecutor:
             return TradeResult(
                 success=False,
                 pair=pair,
-                order_type=order_type.value,
+                order_type=order_type.label,
                 lots=lots,
                 message=f"Error: {str(e)}"
             )
     
+    def execute_trades_bulk(self, orders: List[Dict[str, Any]]) -> List[TradeResult]:
+        """
+        Execute several trades on the bulk thread pool
+        
+        Args:
+            orders: List of execute_trade keyword arguments
+                    (pair, order_type, lots, sl_pips, tp_pips, comment)
+        
+        Returns:
+            TradeResult per order, in input order
+        """
+        ticks = self.snapshot_ticks({order["pair"] for order in orders})
+        return self._run_bulk(
+            lambda order: self.execute_trade(tick=ticks.get(order["pair"]), **order),
+            orders
+        )
+    
+    def snapshot_ticks(self, pairs: Iterable[str]) -> Dict[str, Any]:
+        """Fetch the current tick for several symbols"""
+        if not self.connected:
+            return {}
+        
+        pairs = list(pairs)
+        ticks = self._run_bulk(self._symbol_tick, pairs)
+        return {pair: tick for pair, tick in zip(pairs, ticks) if tick is not None}
+    
+    @_mt5_serialized
+    def _symbol_tick(self, pair: str) -> Optional[Any]:
+        return self.mt5.symbol_info_tick(pair)
+    
+    def _run_bulk(self, func: Callable[[Any], Any], items: Iterable) -> List:
+        """
+        Map func over items on a thread pool, preserving order
+        
+        The MT5 calls inside func still run one at a time under _MT5_LOCK.
+        """
+        items = list(items)
+        if len(items) <= 1:
+            return [func(item) for item in items]
+        
+        with ThreadPoolExecutor(max_workers=min(BULK_MAX_WORKERS, len(items))) as pool:
+            return list(pool.map(func, items))
+    
+    @_mt5_serialized
     def get_open_positions(self) -> List[Position]:
         """Get all open positions"""
         if not self.connected:
@@ -287,9 +413,9 @@ class TradeExecutor:
         if not positions:
             return []
         
-        result = []
-        for pos in positions:
-            result.append(Position(
+        fromtimestamp = datetime.fromtimestamp
+        return [
+            Position(
                 ticket=pos.ticket,
                 pair=pos.symbol,
                 order_type="buy" if pos.type == 0 else "sell",
@@ -299,11 +425,12 @@ class TradeExecutor:
                 sl_price=pos.sl,
                 tp_price=pos.tp,
                 profit=pos.profit,
-                opened_at=datetime.fromtimestamp(pos.time)
-            ))
-        
-        return result
+                opened_at=fromtimestamp(pos.time)
+            )
+            for pos in positions
+        ]
     
+    @_mt5_serialized
     def close_position(self, ticket: int) -> TradeResult:
         """Close a specific position by ticket"""
         if not self.connected:
@@ -333,17 +460,13 @@ class TradeExecutor:
             price = self.mt5.symbol_info_tick(pos.symbol).bid if pos.type == 0 else self.mt5.symbol_info_tick(pos.symbol).ask
             
             request = {
-                "action": self.mt5.TRADE_ACTION_DEAL,
+                **self._deal_template,
                 "symbol": pos.symbol,
                 "volume": pos.volume,
                 "type": close_type,
                 "position": ticket,
                 "price": price,
-                "deviation": 20,
-                "magic": 123456,
                 "comment": "AI Close",
-                "type_time": self.mt5.ORDER_TIME_GTC,
-                "type_filling": self.mt5.ORDER_FILLING_IOC,
             }
             
             result = self.mt5.order_send(request)
@@ -377,6 +500,11 @@ class TradeExecutor:
                 message=f"Error: {str(e)}"
             )
     
+    def close_positions_bulk(self, tickets: List[int]) -> List[TradeResult]:
+        """Close several positions, results in ticket order"""
+        return self._run_bulk(self.close_position, tickets)
+    
+    @_mt5_serialized
     def modify_position(
         self,
         ticket: int,
@@ -445,3 +573,16 @@ class TradeExecutor:
                 lots=0,
                 message=f"Error: {str(e)}"
             )
+    
+    def modify_positions_bulk(self, modifications: List[Dict[str, Any]]) -> List[TradeResult]:
+        """
+        Modify SL/TP of several positions
+        
+        Args:
+            modifications: List of modify_position keyword arguments
+                           (ticket, sl_price, tp_price)
+        
+        Returns:
+            TradeResult per modification, in input order
+        """
+        return self._run_bulk(lambda modification: self.modify_position(**modification), modifications)
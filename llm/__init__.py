@@ -2,6 +2,7 @@ from .analyzer import ForexAnalyzer, MarketAnalysis, TradeRecommendation, MultiT
 from .prompts import (
     ANALYSIS_PROMPT, 
     TRADE_SUGGESTION_PROMPT, 
+    ANALYSIS_AND_TRADE_PROMPT,
     SUMMARY_PROMPT,
     SUMMARY_PROMPT_FA,
     SUMMARY_PROMPT_EN,
@@ -19,6 +20,7 @@ __all__ = [
     "TimeframeAnalysis",
     "ANALYSIS_PROMPT", 
     "TRADE_SUGGESTION_PROMPT",
+    "ANALYSIS_AND_TRADE_PROMPT",
     "SUMMARY_PROMPT",
     "SUMMARY_PROMPT_FA",
     "SUMMARY_PROMPT_EN",
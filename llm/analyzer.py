@@ -1,18 +1,46 @@
 """
 Forex Analyzer - AI-powered market analysis
 """
+import asyncio
+import copy
+import hashlib
+import heapq
+import importlib.util
+import io
 import json
 import logging
+import re
+import sqlite3
+import string
+import threading
+import time
+import weakref
+from collections import defaultdict, deque
+from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Dict, Optional, Any
+from functools import lru_cache
+from operator import itemgetter
+from pathlib import Path
+from types import MappingProxyType
+from typing import List, Dict, Optional, Any, Tuple, Mapping, Callable, Iterable, Iterator
+
+import httpx
+import numpy as np
+import orjson
+from cachetools import TTLCache
 from openai import AsyncOpenAI
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
-from config.settings import OPENAI_API_KEY, OPENAI_BASE_URL, OPENAI_MODEL, PAIR_CONFIGS
+from config.settings import (
+    OPENAI_API_KEY, OPENAI_BASE_URL, OPENAI_MODEL, PAIR_CONFIGS,
+    LLM_CACHE_PATH, LLM_CACHE_TTL, LLM_CACHE_MAX_ENTRIES,
+    LLM_SEMANTIC_CACHE, LLM_SEMANTIC_CACHE_THRESHOLD, LLM_EMBEDDING_MODEL,
+    LLM_CONCURRENCY, LLM_MAX_REQUESTS_PER_MIN, LLM_MAX_TOKENS_PER_MIN, LLM_MAX_RETRIES
+)
 from config.timeframes import TIMEFRAME_NAMES, TRADING_STYLES, get_mtf_timeframes, calculate_mtf_score
 from scrapers.base_scraper import NewsArticle
 from .prompts import (
-    ANALYSIS_PROMPT, TRADE_SUGGESTION_PROMPT, SUMMARY_PROMPT_FA, SUMMARY_PROMPT_EN,
+    ANALYSIS_PROMPT, TRADE_SUGGESTION_PROMPT, ANALYSIS_AND_TRADE_PROMPT, SUMMARY_PROMPT_FA, SUMMARY_PROMPT_EN,
     PAIR_CLASSIFIER_PROMPT, MULTI_TIMEFRAME_PROMPT, TIMEFRAME_SPECIFIC_PROMPT,
     TIMEFRAME_GUIDELINES
 )
@@ -20,6 +48,57 @@ from .prompts import (
 logger = logging.getLogger(__name__)
 
 
+def _compile_template(template: str) -> Callable[..., str]:
+    """
+    Turn a str.format template into a renderer with the placeholders parsed once
+    
+    Only plain ``{name}`` fields are supported (``{{``/``}}`` escapes are
+    fine); render(**kwargs) returns the same string as template.format(**kwargs).
+    """
+    parts = []
+    for literal, field, format_spec, conversion in string.Formatter().parse(template):
+        if format_spec or conversion or (field is not None and not field.isidentifier()):
+            raise ValueError(f"Unsupported template field: {{{field}}}")
+        parts.append((literal, field))
+    parts = tuple(parts)
+    
+    def render(**kwargs) -> str:
+        out = []
+        for literal, field in parts:
+            out.append(literal)
+            if field is not None:
+                out.append(format(kwargs[field]))
+        return "".join(out)
+    
+    return render
+
+
+_ANALYSIS_PROMPT_FN = _compile_template(ANALYSIS_PROMPT)
+_TRADE_SUGGESTION_PROMPT_FN = _compile_template(TRADE_SUGGESTION_PROMPT)
+_ANALYSIS_AND_TRADE_PROMPT_FN = _compile_template(ANALYSIS_AND_TRADE_PROMPT)
+_PAIR_CLASSIFIER_PROMPT_FN = _compile_template(PAIR_CLASSIFIER_PROMPT)
+_MULTI_TIMEFRAME_PROMPT_FN = _compile_template(MULTI_TIMEFRAME_PROMPT)
+_TIMEFRAME_SPECIFIC_PROMPT_FN = _compile_template(TIMEFRAME_SPECIFIC_PROMPT)
+
+CLASSIFIER_SYSTEM_PROMPT = "You are a forex news classifier. Respond only with a JSON object."
+
+# Below this many articles a Batch API job is not worth its turnaround time
+BATCH_CLASSIFY_MIN_ARTICLES = 50
+BATCH_POLL_INTERVAL = 60  # seconds
+
+# Responses longer than this are parsed off the event loop
+THREAD_PARSE_MIN_CHARS = 4096
+
+# In-memory cache of finished timeframe analyses
+RESULT_CACHE_SIZE = 256
+RESULT_CACHE_TTL = 60  # seconds
+_BATCH_FINAL_STATUSES = frozenset(("completed", "failed", "expired", "cancelled"))
+
+# Pair -> [(position in the article list, article)], see ForexAnalyzer.build_pair_index
+ArticleIndex = Dict[str, List[Tuple[int, NewsArticle]]]
+_ALL_PAIRS = "__ALL__"
+
+
 class TradeRecommendation(BaseModel):
     """Model for trade recommendation"""
     pair: str
@@ -34,12 +113,42 @@ class TradeRecommendation(BaseModel):
     key_levels: List[str]
     invalidation: str
     news_to_watch: List[str]
-    generated_at: datetime = None
-    
-    def __init__(self, **data):
-        if 'generated_at' not in data or data['generated_at'] is None:
-            data['generated_at'] = datetime.now()
-        super().__init__(**data)
+    generated_at: datetime = Field(default_factory=datetime.now)
+
+
+# Fallbacks for fields the LLM leaves out of a trade recommendation; SL/TP
+# defaults depend on the pair and are filled in by the analyzer
+_TRADE_DEFAULTS: Mapping[str, Any] = MappingProxyType({
+    "recommendation": "HOLD",
+    "confidence": 50,
+    "timeframe": "H1",
+    "entry_zone": {"type": "market", "price_description": "Current market price"},
+    "risk_reward_ratio": 1.5,
+    "reasoning": "Based on market analysis",
+    "key_levels": [],
+    "invalidation": "Price breaks key levels",
+    "news_to_watch": []
+})
+
+# Fixed fields of the results returned when an LLM call fails
+_TRADE_ERROR: Mapping[str, Any] = MappingProxyType({
+    "recommendation": "HOLD",
+    "confidence": 0,
+    "timeframe": "H1",
+    "entry_zone": {"type": "none", "price_description": "No trade recommended"},
+    "stop_loss": {"pips": 0, "description": "N/A"},
+    "take_profit": {"pips": 0, "description": "N/A"},
+    "risk_reward_ratio": 0,
+    "key_levels": [],
+    "invalidation": "N/A",
+    "news_to_watch": []
+})
+_MTF_ERROR: Mapping[str, Any] = MappingProxyType({
+    "timeframe_details": {},
+    "overall_bias": "neutral",
+    "confidence": 0,
+    "trade_recommendation": {"action": "WAIT", "reason": "Analysis failed"}
+})
 
 
 class MarketAnalysis(BaseModel):
@@ -52,12 +161,7 @@ class MarketAnalysis(BaseModel):
     technical_outlook: str
     risk_factors: List[str]
     sources_count: int
-    generated_at: datetime = None
-    
-    def __init__(self, **data):
-        if 'generated_at' not in data or data['generated_at'] is None:
-            data['generated_at'] = datetime.now()
-        super().__init__(**data)
+    generated_at: datetime = Field(default_factory=datetime.now)
 
 
 class TimeframeAnalysis(BaseModel):
@@ -81,80 +185,533 @@ class MultiTimeframeAnalysis(BaseModel):
     overall_bias: str
     confidence: int
     trade_recommendation: Dict[str, Any]
-    generated_at: datetime = None
+    generated_at: datetime = Field(default_factory=datetime.now)
+
+
+class _ResponseCache:
+    """
+    Exact-match LLM response cache stored in SQLite
+    
+    Keys are SHA-256 hashes of the full request (model, prompts, sampling
+    params). Entries expire after ``ttl`` seconds and the least recently
+    used ones are evicted once the table grows past ``max_entries``. The
+    cache is best-effort: SQLite errors (e.g. a locked file shared between
+    workers) are logged and treated as a miss. get/set run the blocking
+    SQLite calls in a worker thread.
+    """
+    
+    def __init__(self, path: Path, ttl: int, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "hash TEXT PRIMARY KEY, payload BLOB, created_at REAL, accessed_at REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_created_at ON cache(created_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed_at ON cache(accessed_at)")
+        self._conn.commit()
+        # Upper bound on the row count (a replaced key is counted twice), so
+        # eviction only runs when the table may be over the limit
+        self._rows = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+    
+    @staticmethod
+    def make_key(**request) -> str:
+        return hashlib.sha256(orjson.dumps(request, option=orjson.OPT_SORT_KEYS)).hexdigest()
+    
+    async def get(self, key: str) -> Optional[str]:
+        try:
+            return await asyncio.to_thread(self._get, key)
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache read failed: {e}")
+            return None
+    
+    async def set(self, key: str, payload: str):
+        try:
+            await asyncio.to_thread(self._set, key, payload)
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache write failed: {e}")
+    
+    def _get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM cache WHERE hash = ? AND created_at > ?",
+                (key, now - self.ttl)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE cache SET accessed_at = ? WHERE hash = ?", (now, key))
+            self._conn.commit()
+        return row[0].decode()
     
-    def __init__(self, **data):
-        if 'generated_at' not in data or data['generated_at'] is None:
-            data['generated_at'] = datetime.now()
-        super().__init__(**data)
+    def _set(self, key: str, payload: str):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (hash, payload, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, payload.encode(), now, now)
+            )
+            self._rows += 1
+            if self._rows > self.max_entries:
+                # Drop expired rows, then the least recently used beyond max_entries
+                self._conn.execute("DELETE FROM cache WHERE created_at <= ?", (now - self.ttl,))
+                self._conn.execute(
+                    "DELETE FROM cache WHERE hash IN ("
+                    "SELECT hash FROM cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+                self._rows = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+            self._conn.commit()
 
 
-class ForexAnalyzer:
-    """AI-powered forex market analyzer"""
+class _SemanticCache:
+    """
+    In-memory semantic response cache
     
-    def __init__(self):
-        self.client = AsyncOpenAI(
-            api_key=OPENAI_API_KEY,
-            base_url=OPENAI_BASE_URL
+    Prompts are grouped by namespace (model, system prompt, sampling params, scope)
+    and stored as L2-normalized embeddings. A lookup returns the response of
+    the most similar cached prompt in the same namespace when its cosine
+    similarity reaches ``threshold``.
+    """
+    
+    def __init__(self, threshold: float, ttl: int, max_entries: int):
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # namespace -> (embedding matrix, [(response, created_at), ...])
+        self._entries: Dict[str, Tuple[np.ndarray, List[Tuple[str, float]]]] = {}
+    
+    def lookup(self, namespace: str, vector: np.ndarray) -> Optional[str]:
+        entry = self._entries.get(namespace)
+        if entry is None:
+            return None
+        
+        matrix, items = entry
+        scores = matrix @ vector
+        best = int(np.argmax(scores))
+        response, created_at = items[best]
+        if scores[best] >= self.threshold and created_at > time.time() - self.ttl:
+            return response
+        return None
+    
+    def add(self, namespace: str, vector: np.ndarray, response: str):
+        now = time.time()
+        matrix, items = self._entries.get(namespace, (np.empty((0, vector.size), dtype=np.float32), []))
+        
+        # Keep unexpired entries, leaving room for the new one
+        keep = [i for i, (_, created_at) in enumerate(items) if created_at > now - self.ttl]
+        if len(keep) >= self.max_entries:
+            keep = keep[len(keep) - self.max_entries + 1:]
+        
+        self._entries[namespace] = (
+            np.vstack([matrix[keep], vector[None, :]]),
+            [items[i] for i in keep] + [(response, now)]
         )
-        self.model = OPENAI_MODEL
+
+
+_JSON_DECODER = json.JSONDecoder()
+_JSON_RESPONSE_FORMAT = MappingProxyType({"response_format": {"type": "json_object"}})
+
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# api.openai.com routes requests sharing a prompt_cache_key to the same prompt
+# prefix cache; other OpenAI-compatible servers may reject the unknown field
+_PROMPT_CACHE_KEY_SUPPORTED = OPENAI_BASE_URL.rstrip("/").startswith("https://api.openai.com")
+
+
+@lru_cache(maxsize=128)
+def _prompt_cache_key(system_prompt: str) -> str:
+    return hashlib.sha1(system_prompt.encode("utf-8")).hexdigest()[:16]
+
+
+def _prompt_cache_kwargs(system_prompt: str) -> Dict[str, Any]:
+    """Extra create() arguments grouping requests that share system_prompt for prefix caching"""
+    if not _PROMPT_CACHE_KEY_SUPPORTED:
+        return {}
+    return {"extra_body": {"prompt_cache_key": _prompt_cache_key(system_prompt)}}
+
+
+def create_openai_client() -> AsyncOpenAI:
+    """
+    OpenAI client on a pooled HTTP connection set
     
-    # Trading style configurations - Enhanced
-    TRADING_STYLES = {
-        'scalp': {
-            'name': 'Scalping',
-            'name_fa': 'اسکالپ',
-            'sl_range': (10, 20),
-            'tp_range': (15, 30),
-            'sl_multiplier': 0.5,
-            'tp_multiplier': 0.5,
-            'timeframes': ['M1', 'M5', 'M15'],
-            'min_rr': 1.5,
-            'duration': 'minutes to hours',
-            'description': 'Quick trades with tight stops. Focus on momentum and quick profits.'
-        },
-        'day': {
-            'name': 'Day Trading',
-            'name_fa': 'روزانه',
-            'sl_range': (20, 40),
-            'tp_range': (40, 80),
-            'sl_multiplier': 1.0,
-            'tp_multiplier': 1.0,
-            'timeframes': ['M15', 'H1', 'H4'],
-            'min_rr': 2.0,
-            'duration': 'hours to 1 day',
-            'description': 'Intraday trades closed before market close. Focus on daily trends.'
-        },
-        'swing': {
-            'name': 'Swing Trading',
-            'name_fa': 'سوئینگ',
-            'sl_range': (50, 100),
-            'tp_range': (100, 200),
-            'sl_multiplier': 2.0,
-            'tp_multiplier': 2.5,
-            'timeframes': ['H4', 'D1', 'W1'],
-            'min_rr': 2.0,
-            'duration': 'days to weeks',
-            'description': 'Multi-day trades capturing larger moves. Focus on swing highs/lows.'
-        },
-        'position': {
-            'name': 'Position Trading',
-            'name_fa': 'پوزیشن',
-            'sl_range': (100, 200),
-            'tp_range': (200, 500),
-            'sl_multiplier': 3.0,
-            'tp_multiplier': 4.0,
-            'timeframes': ['D1', 'W1', 'MN1'],
-            'min_rr': 2.5,
-            'duration': 'weeks to months',
-            'description': 'Long-term trades based on fundamental analysis. Focus on major trends.'
-        }
-    }
+    Pass one client to every analyzer that runs in the same process so
+    concurrent calls share keep-alive connections (and HTTP/2 multiplexing
+    when the optional h2 package is installed) instead of each opening its own.
+    Rate limits (429), server errors and dropped connections are retried by
+    the SDK with jittered exponential backoff, honouring Retry-After.
+    """
+    return AsyncOpenAI(
+        api_key=OPENAI_API_KEY,
+        base_url=OPENAI_BASE_URL,
+        max_retries=LLM_MAX_RETRIES,
+        http_client=httpx.AsyncClient(
+            http2=_HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=60),
+            timeout=httpx.Timeout(60.0, connect=10.0)
+        )
+    )
+
+# Per-article content cap in prompts, and the smallest useful remainder when
+# the last article has to be cut to fit the budget
+ARTICLE_CONTENT_TOKENS = 128
+MIN_ARTICLE_CONTENT_TOKENS = 16
+
+
+@lru_cache(maxsize=8)
+def _encoding(model: str):
+    """tiktoken encoding for model, None to fall back to a character estimate"""
+    # Imported on first use: optional, and slow to import
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        # The encoding files are downloaded on first use
+        logger.warning(f"tiktoken encoding unavailable, estimating tokens: {e}")
+        return None
+
+
+def _count_tokens(text: str, encoding) -> int:
+    if encoding is None:
+        return -(-len(text) // 4)  # ~4 characters per token
+    return len(encoding.encode(text))
+
+
+def _truncate_tokens(text: str, max_tokens: int, encoding) -> str:
+    if encoding is None:
+        return text[:max_tokens * 4]
+    tokens = encoding.encode(text)
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens])
+
+# Keywords looked for in free-text analyses. The lookahead makes findall
+# report overlapping matches, so the sweep sees the same hits as separate
+# substring checks ("rate" also covers "interest rate").
+_KEY_FACTOR_KEYWORDS: Tuple[Tuple[str, frozenset], ...] = (
+    ("Interest rate expectations", frozenset({"rate"})),
+    ("Inflation data", frozenset({"inflation"})),
+    ("Employment data", frozenset({"employment", "jobs"})),
+    ("GDP growth", frozenset({"gdp"})),
+)
+_ANALYSIS_KEYWORDS_RE = re.compile(
+    r"(?=(bullish|bearish|rate|inflation|employment|jobs|gdp))", re.IGNORECASE
+)
+
+_ARTICLE_TPL = """
+### Article {i}
+**Source**: {source}
+**Title**: {title}
+**Content**: {content}...
+**Importance**: {importance}
+"""
+_ARTICLE_FN = _compile_template(_ARTICLE_TPL)
+
+
+def _json_start(text: str, pos: int) -> int:
+    """Index of the next '{' or '[' at or after pos, -1 if none"""
+    brace = text.find('{', pos)
+    bracket = text.find('[', pos)
+    if brace == -1 or bracket == -1:
+        return max(brace, bracket)
+    return min(brace, bracket)
+
+
+# System prompts depend only on a few small enumerations (style, timeframe,
+# language), so each distinct one is built once
+@lru_cache(maxsize=64)
+def _analysis_system_prompt(style_name: str, timeframe: str, timeframes: Tuple[str, ...]) -> str:
+    return f"""You are an expert forex market analyst specializing in {style_name} trading.
+Your analysis should be optimized for {timeframe} timeframe traders.
+Provide actionable insights with specific price levels and clear trade setups.
+Consider multi-timeframe analysis using: {', '.join(timeframes)}."""
+
+
+@lru_cache(maxsize=64)
+def _trade_system_prompt(style_name: str, timeframe: str) -> str:
+    return f"""You are an expert forex trading advisor specializing in {style_name}.
+You MUST respond with valid JSON only. No markdown, no explanations outside JSON.
+Provide specific, actionable trade recommendations optimized for {timeframe} timeframe.
+Consider the full analysis context and multi-timeframe alignment."""
+
+
+@lru_cache(maxsize=64)
+def _combined_system_prompt(style_name: str, timeframe: str, timeframes: str) -> str:
+    return f"""You are an expert forex market analyst and trading advisor specializing in {style_name} trading.
+You MUST respond with valid JSON only. No markdown, no explanations outside JSON.
+Provide actionable insights and trade recommendations optimized for {timeframe} timeframe.
+Consider multi-timeframe analysis using: {timeframes}."""
+
+
+@lru_cache(maxsize=64)
+def _mtf_system_prompt(style_name: str, style_params: str, timeframes: Tuple[str, ...], primary_tf: str) -> str:
+    return f"""You are an expert multi-timeframe forex analyst specializing in {style_name}.
+Analyze ALL provided timeframes: {', '.join(timeframes)}
+Primary entry timeframe: {primary_tf}
+
+Trading Style Parameters:
+{style_params}
+
+You MUST respond with valid JSON only. Provide specific price levels and actionable recommendations.
+Grade the setup quality honestly based on timeframe alignment and confluence."""
+
+
+@lru_cache(maxsize=64)
+def _timeframe_system_prompt(style_name: str, timeframe: str, risk_profile: str, tf_guidelines: str) -> str:
+    return f"""You are an expert forex analyst specializing in {timeframe} timeframe trading.
+Trading Style: {style_name}
+Risk Profile: {risk_profile}
+
+Timeframe Guidelines: {tf_guidelines}
+
+You MUST respond with valid JSON only. Provide specific, actionable analysis with:
+- Exact entry zones and triggers
+- Precise SL/TP levels in pips
+- Multiple take profit targets
+- Clear trade management rules"""
+
+
+@lru_cache(maxsize=32)
+def _summary_system_prompt(system_msg: str, target_lang_name: str) -> str:
+    return f"""{system_msg}
+
+CRITICAL INSTRUCTION: You MUST respond ONLY in {target_lang_name} language. 
+Every word of your response must be in {target_lang_name}.
+Do not use English or any other language unless it's a proper noun or technical term.
+If you cannot write in {target_lang_name}, translate your response to {target_lang_name}."""
+
+
+@lru_cache(maxsize=32)
+def _translation_system_prompt(target_lang_name: str) -> str:
+    return (
+        f"You are a professional translator. Translate the given text to {target_lang_name}. "
+        f"Preserve all formatting, markdown, and structure. Only output the translated text, nothing else."
+    )
+
+
+# Characters that matter for finding the end of a JSON value
+_JSON_STRUCTURE_RE = re.compile(r'[][{}"\\]')
+
+
+class _JsonEndScanner:
+    """
+    Incrementally find where a JSON object/array that opens the text ends
     
-    def _get_style_params(self, trading_style: str) -> str:
-        """Get formatted trading style parameters for prompts"""
-        style = self.TRADING_STYLES.get(trading_style, self.TRADING_STYLES['day'])
-        return f"""
+    Tracks nesting depth and string/escape state across chunks so brackets
+    inside string values are ignored. Text that does not start with JSON
+    (prose, code fences) is never cut short.
+    """
+    
+    __slots__ = ("depth", "state", "in_string", "escaped")
+    
+    # state: None until the first non-blank character, then True if it
+    # opened a JSON value (scanning) or False (give up)
+    def __init__(self):
+        self.depth = 0
+        self.state = None
+        self.in_string = False
+        self.escaped = False
+    
+    def feed(self, chunk: str) -> Optional[int]:
+        """Consume chunk; return the offset just past the closing bracket, or None"""
+        if self.state is None:
+            stripped = chunk.lstrip()
+            if not stripped:
+                return None
+            self.state = stripped[0] in "{["
+        if not self.state:
+            return None
+        
+        skip = 0 if self.escaped else -1
+        self.escaped = False
+        for match in _JSON_STRUCTURE_RE.finditer(chunk):
+            pos = match.start()
+            if pos == skip:
+                continue
+            char = match.group()
+            if self.in_string:
+                if char == "\\":
+                    skip = pos + 1
+                    if skip == len(chunk):
+                        self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char in "{[":
+                self.depth += 1
+            else:
+                self.depth -= 1
+                if self.depth == 0:
+                    return pos + 1
+        return None
+
+
+async def _read_json_stream(stream) -> Tuple[str, bool]:
+    """
+    Collect a streamed completion, closing the stream once its JSON value is complete
+    
+    Returns the text and whether the model stopped because it hit max_tokens.
+    """
+    parts = []
+    scanner = _JsonEndScanner()
+    finish_reason = None
+    async with stream:
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            finish_reason = chunk.choices[0].finish_reason or finish_reason
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+            end = scanner.feed(delta)
+            if end is not None:
+                parts.append(delta[:end])
+                break
+            parts.append(delta)
+    return "".join(parts), finish_reason == "length"
+
+
+class _LoopLocal:
+    """
+    One instance of an asyncio primitive per running event loop
+    
+    Locks and semaphores bind to the loop they are first contended on, but
+    the analyzer outlives loops: views and jobs call asyncio.run (or a new
+    loop) per request. Each loop gets its own instance, dropped with the loop.
+    """
+    
+    def __init__(self, factory: Callable[[], Any]):
+        self._factory = factory
+        self._by_loop: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+    
+    def get(self) -> Any:
+        loop = asyncio.get_running_loop()
+        obj = self._by_loop.get(loop)
+        if obj is None:
+            obj = self._by_loop[loop] = self._factory()
+        return obj
+
+
+class _TokenBucket:
+    """
+    Async token bucket refilled continuously at ``per_minute`` tokens per minute
+    
+    Used to keep request and token throughput under the API rate limits. The
+    token count is shared by every event loop; only the lock is per loop.
+    """
+    
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = _LoopLocal(asyncio.Lock)
+    
+    async def acquire(self, amount: float = 1):
+        amount = min(amount, self.capacity)
+        async with self._lock.get():
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+
+class CompletionTokenStats:
+    """
+    Size max_tokens from the completion lengths seen per prompt shape
+    
+    Until a shape has ``min_samples`` observations the caller's ceiling is
+    used as is; after that the budget is the 95th percentile of recent
+    lengths times ``margin``, kept between ``floor`` and the ceiling.
+    Responses cut off at the smaller budget should be retried at the
+    ceiling and are not recorded.
+    """
+    
+    def __init__(self, window: int = 200, min_samples: int = 20, margin: float = 1.2, floor: int = 800):
+        self.min_samples = min_samples
+        self.margin = margin
+        self.floor = floor
+        self._lengths: Dict[Any, deque] = defaultdict(lambda: deque(maxlen=window))
+    
+    def budget(self, shape: Any, ceiling: int) -> int:
+        lengths = self._lengths.get(shape)
+        if not lengths or len(lengths) < self.min_samples:
+            return ceiling
+        p95 = float(np.percentile(lengths, 95))
+        return min(ceiling, max(self.floor, int(p95 * self.margin)))
+    
+    def record(self, shape: Any, tokens: int):
+        self._lengths[shape].append(tokens)
+
+
+# Trading style configurations - Enhanced
+_TRADING_STYLES: Mapping[str, dict] = MappingProxyType({
+    'scalp': {
+        'name': 'Scalping',
+        'name_fa': 'اسکالپ',
+        'sl_range': (10, 20),
+        'tp_range': (15, 30),
+        'sl_multiplier': 0.5,
+        'tp_multiplier': 0.5,
+        'timeframes': ['M1', 'M5', 'M15'],
+        'min_rr': 1.5,
+        'duration': 'minutes to hours',
+        'description': 'Quick trades with tight stops. Focus on momentum and quick profits.'
+    },
+    'day': {
+        'name': 'Day Trading',
+        'name_fa': 'روزانه',
+        'sl_range': (20, 40),
+        'tp_range': (40, 80),
+        'sl_multiplier': 1.0,
+        'tp_multiplier': 1.0,
+        'timeframes': ['M15', 'H1', 'H4'],
+        'min_rr': 2.0,
+        'duration': 'hours to 1 day',
+        'description': 'Intraday trades closed before market close. Focus on daily trends.'
+    },
+    'swing': {
+        'name': 'Swing Trading',
+        'name_fa': 'سوئینگ',
+        'sl_range': (50, 100),
+        'tp_range': (100, 200),
+        'sl_multiplier': 2.0,
+        'tp_multiplier': 2.5,
+        'timeframes': ['H4', 'D1', 'W1'],
+        'min_rr': 2.0,
+        'duration': 'days to weeks',
+        'description': 'Multi-day trades capturing larger moves. Focus on swing highs/lows.'
+    },
+    'position': {
+        'name': 'Position Trading',
+        'name_fa': 'پوزیشن',
+        'sl_range': (100, 200),
+        'tp_range': (200, 500),
+        'sl_multiplier': 3.0,
+        'tp_multiplier': 4.0,
+        'timeframes': ['D1', 'W1', 'MN1'],
+        'min_rr': 2.5,
+        'duration': 'weeks to months',
+        'description': 'Long-term trades based on fundamental analysis. Focus on major trends.'
+    }
+})
+
+
+def _format_style_params(style: dict) -> str:
+    return f"""
 - Style: {style['name']}
 - Recommended SL Range: {style['sl_range'][0]}-{style['sl_range'][1]} pips
 - Recommended TP Range: {style['tp_range'][0]}-{style['tp_range'][1]} pips
@@ -164,12 +721,313 @@ class ForexAnalyzer:
 - Description: {style['description']}
 """
 
-    async def analyze_pair(self, pair: str, articles: List[NewsArticle], timeframe: str = "H1", trading_style: str = "day") -> MarketAnalysis:
+
+# Prompt fragments are fixed per style, so format them once
+_STYLE_PARAMS: Mapping[str, str] = MappingProxyType({
+    name: _format_style_params(style) for name, style in _TRADING_STYLES.items()
+})
+_DEFAULT_STYLE = _TRADING_STYLES['day']
+_DEFAULT_STYLE_PARAMS = _STYLE_PARAMS['day']
+
+
+@dataclass(frozen=True, slots=True)
+class _StyleBundle:
+    """Everything the timeframe analyses derive from a trading style name"""
+    normalized: str
+    config: Mapping[str, Any]
+    params: str
+
+
+# Long and short trading style names accepted by the timeframe analyses,
+# resolved to their bundle in one lookup
+_STYLE_BUNDLES: Mapping[str, _StyleBundle] = MappingProxyType({
+    name: _StyleBundle(style, _TRADING_STYLES[style], _STYLE_PARAMS[style])
+    for name, style in (
+        ('scalping', 'scalp'), ('scalp', 'scalp'),
+        ('day_trading', 'day'), ('day', 'day'),
+        ('swing_trading', 'swing'), ('swing', 'swing'),
+        ('position_trading', 'position'), ('position', 'position')
+    )
+})
+_DEFAULT_STYLE_BUNDLE = _STYLE_BUNDLES['day']
+
+
+# Asset configurations for market overview - multilingual
+_ASSET_INFO: Mapping[str, dict] = MappingProxyType({
+    # Currencies
+    "USD": {"name_fa": "دلار آمریکا", "name_en": "US Dollar", "type": "currency", "country_fa": "آمریکا", "country_en": "USA"},
+    "EUR": {"name_fa": "یورو", "name_en": "Euro", "type": "currency", "country_fa": "اتحادیه اروپا", "country_en": "Eurozone"},
+    "GBP": {"name_fa": "پوند انگلیس", "name_en": "British Pound", "type": "currency", "country_fa": "انگلیس", "country_en": "UK"},
+    "JPY": {"name_fa": "ین ژاپن", "name_en": "Japanese Yen", "type": "currency", "country_fa": "ژاپن", "country_en": "Japan"},
+    "CHF": {"name_fa": "فرانک سوئیس", "name_en": "Swiss Franc", "type": "currency", "country_fa": "سوئیس", "country_en": "Switzerland"},
+    "AUD": {"name_fa": "دلار استرالیا", "name_en": "Australian Dollar", "type": "currency", "country_fa": "استرالیا", "country_en": "Australia"},
+    "CAD": {"name_fa": "دلار کانادا", "name_en": "Canadian Dollar", "type": "currency", "country_fa": "کانادا", "country_en": "Canada"},
+    "NZD": {"name_fa": "دلار نیوزیلند", "name_en": "New Zealand Dollar", "type": "currency", "country_fa": "نیوزیلند", "country_en": "New Zealand"},
+    "CNY": {"name_fa": "یوان چین", "name_en": "Chinese Yuan", "type": "currency", "country_fa": "چین", "country_en": "China"},
+    # Commodities
+    "XAU": {"name_fa": "طلا", "name_en": "Gold", "type": "commodity", "country_fa": "جهانی", "country_en": "Global"},
+    "XAG": {"name_fa": "نقره", "name_en": "Silver", "type": "commodity", "country_fa": "جهانی", "country_en": "Global"},
+    "OIL": {"name_fa": "نفت", "name_en": "Crude Oil", "type": "commodity", "country_fa": "جهانی", "country_en": "Global"},
+    # Indices
+    "SPX": {"name_fa": "اس اند پی ۵۰۰", "name_en": "S&P 500", "type": "index", "country_fa": "آمریکا", "country_en": "USA"},
+    "DJI": {"name_fa": "داوجونز", "name_en": "Dow Jones", "type": "index", "country_fa": "آمریکا", "country_en": "USA"},
+    "NDX": {"name_fa": "نزدک", "name_en": "NASDAQ", "type": "index", "country_fa": "آمریکا", "country_en": "USA"},
+    "FTSE": {"name_fa": "فوتسی ۱۰۰", "name_en": "FTSE 100", "type": "index", "country_fa": "انگلیس", "country_en": "UK"},
+    "DAX": {"name_fa": "داکس", "name_en": "DAX", "type": "index", "country_fa": "آلمان", "country_en": "Germany"},
+    "NKY": {"name_fa": "نیکی", "name_en": "Nikkei 225", "type": "index", "country_fa": "ژاپن", "country_en": "Japan"},
+    # Cryptocurrencies
+    "BTC": {"name_fa": "بیت‌کوین", "name_en": "Bitcoin", "type": "crypto", "country_fa": "جهانی", "country_en": "Global"},
+    "ETH": {"name_fa": "اتریوم", "name_en": "Ethereum", "type": "crypto", "country_fa": "جهانی", "country_en": "Global"},
+    "BNB": {"name_fa": "بایننس کوین", "name_en": "Binance Coin", "type": "crypto", "country_fa": "جهانی", "country_en": "Global"},
+    "XRP": {"name_fa": "ریپل", "name_en": "Ripple", "type": "crypto", "country_fa": "جهانی", "country_en": "Global"},
+    "SOL": {"name_fa": "سولانا", "name_en": "Solana", "type": "crypto", "country_fa": "جهانی", "country_en": "Global"},
+    "ADA": {"name_fa": "کاردانو", "name_en": "Cardano", "type": "crypto", "country_fa": "جهانی", "country_en": "Global"},
+    "DOGE": {"name_fa": "دوج‌کوین", "name_en": "Dogecoin", "type": "crypto", "country_fa": "جهانی", "country_en": "Global"},
+    "DOT": {"name_fa": "پولکادات", "name_en": "Polkadot", "type": "crypto", "country_fa": "جهانی", "country_en": "Global"}
+})
+
+# Fallback for assets missing from _ASSET_INFO; the name falls back to the symbol
+_UNKNOWN_ASSET: Mapping[str, str] = MappingProxyType({
+    "type": "unknown", "country_fa": "نامشخص", "country_en": "Unknown"
+})
+
+
+# Complete prompts in each language
+_LANG_PROMPTS: Mapping[str, dict] = MappingProxyType({
+    'en': {
+        'system': "You are an expert financial market analyst. Provide comprehensive market analysis in English.",
+        'sections': ('Market Summary', 'Economic Analysis', 'Political Analysis', 'Financial Markets', 'Key Headlines', 'Upcoming Events', 'Market Sentiment')
+    },
+    'fa': {
+        'system': "شما یک تحلیلگر حرفه‌ای بازارهای مالی هستید. تحلیل جامع بازار را به زبان فارسی ارائه دهید.",
+        'sections': ('خلاصه بازار', 'تحلیل اقتصادی', 'تحلیل سیاسی', 'وضعیت بازارهای مالی', 'تیترهای مهم', 'رویدادهای پیش رو', 'حال و هوای بازار')
+    },
+    'ar': {
+        'system': "أنت محلل خبير في الأسواق المالية. قدم تحليلاً شاملاً للسوق باللغة العربية.",
+        'sections': ('ملخص السوق', 'التحليل الاقتصادي', 'التحليل السياسي', 'حالة الأسواق المالية', 'العناوين الرئيسية', 'الأحداث القادمة', 'معنويات السوق')
+    },
+    'tr': {
+        'system': "Uzman bir finansal piyasa analistisiniz. Kapsamlı piyasa analizini Türkçe olarak sunun.",
+        'sections': ('Piyasa Özeti', 'Ekonomik Analiz', 'Politik Analiz', 'Finansal Piyasalar', 'Önemli Başlıklar', 'Yaklaşan Olaylar', 'Piyasa Duyarlılığı')
+    },
+    'de': {
+        'system': "Sie sind ein erfahrener Finanzmarktanalyst. Erstellen Sie eine umfassende Marktanalyse auf Deutsch.",
+        'sections': ('Marktübersicht', 'Wirtschaftsanalyse', 'Politische Analyse', 'Finanzmärkte', 'Wichtige Schlagzeilen', 'Kommende Ereignisse', 'Marktstimmung')
+    },
+    'fr': {
+        'system': "Vous êtes un analyste expert des marchés financiers. Fournissez une analyse complète du marché en français.",
+        'sections': ('Résumé du marché', 'Analyse économique', 'Analyse politique', 'Marchés financiers', 'Titres importants', 'Événements à venir', 'Sentiment du marché')
+    },
+    'es': {
+        'system': "Eres un analista experto en mercados financieros. Proporciona un análisis completo del mercado en español.",
+        'sections': ('Resumen del mercado', 'Análisis económico', 'Análisis político', 'Mercados financieros', 'Titulares importantes', 'Próximos eventos', 'Sentimiento del mercado')
+    },
+    'ru': {
+        'system': "Вы эксперт-аналитик финансовых рынков. Предоставьте комплексный анализ рынка на русском языке.",
+        'sections': ('Обзор рынка', 'Экономический анализ', 'Политический анализ', 'Финансовые рынки', 'Ключевые заголовки', 'Предстоящие события', 'Настроение рынка')
+    },
+    'zh': {
+        'system': "您是一位专业的金融市场分析师。请用中文提供全面的市场分析。",
+        'sections': ('市场概述', '经济分析', '政治分析', '金融市场', '重要头条', '即将发生的事件', '市场情绪')
+    },
+    'ja': {
+        'system': "あなたは金融市場の専門アナリストです。日本語で包括的な市場分析を提供してください。",
+        'sections': ('市場概要', '経済分析', '政治分析', '金融市場', '重要なヘッドライン', '今後のイベント', '市場センチメント')
+    },
+    'ko': {
+        'system': "당신은 금융 시장 전문 분석가입니다. 한국어로 포괄적인 시장 분석을 제공하세요.",
+        'sections': ('시장 개요', '경제 분석', '정치 분석', '금융 시장', '주요 헤드라인', '다가오는 이벤트', '시장 심리')
+    },
+    'pt': {
+        'system': "Você é um analista especialista em mercados financeiros. Forneça uma análise abrangente do mercado em português.",
+        'sections': ('Resumo do mercado', 'Análise econômica', 'Análise política', 'Mercados financeiros', 'Manchetes importantes', 'Próximos eventos', 'Sentimento do mercado')
+    },
+    'it': {
+        'system': "Sei un analista esperto dei mercati finanziari. Fornisci un'analisi completa del mercato in italiano.",
+        'sections': ('Riepilogo del mercato', 'Analisi economica', 'Analisi politica', 'Mercati finanziari', 'Titoli importanti', 'Prossimi eventi', 'Sentiment del mercato')
+    },
+    'hi': {
+        'system': "आप एक विशेषज्ञ वित्तीय बाजार विश्लेषक हैं। हिंदी में व्यापक बाजार विश्लेषण प्रदान करें।",
+        'sections': ('बाजार सारांश', 'आर्थिक विश्लेषण', 'राजनीतिक विश्लेषण', 'वित्तीय बाजार', 'महत्वपूर्ण सुर्खियां', 'आगामी घटनाएं', 'बाजार भावना')
+    }
+})
+
+_LANG_PROMPTS_FORMATTED: Mapping[str, Tuple[str, Tuple[str, ...]]] = MappingProxyType({
+    lang: (data['system'], data['sections']) for lang, data in _LANG_PROMPTS.items()
+})
+
+# Language names for explicit instruction
+_LANG_NAMES: Mapping[str, str] = MappingProxyType({
+    'en': 'English', 'fa': 'Persian/Farsi', 'ar': 'Arabic', 'tr': 'Turkish',
+    'de': 'German', 'fr': 'French', 'es': 'Spanish', 'ru': 'Russian',
+    'zh': 'Chinese', 'ja': 'Japanese', 'ko': 'Korean', 'pt': 'Portuguese',
+    'it': 'Italian', 'hi': 'Hindi'
+})
+
+# Timeframe descriptions
+_TF_DESC: Mapping[str, str] = MappingProxyType({
+    "short": "Short-term", "medium": "Medium-term", "long": "Long-term",
+    "M15": "Short-term", "H1": "Short-term", "H4": "Medium-term", "D1": "Long-term"
+})
+
+
+class ForexAnalyzer:
+    """AI-powered forex market analyzer"""
+    
+    def __init__(self, client: Optional[AsyncOpenAI] = None):
+        # A client passed in is shared with its other users and is not closed by aclose()
+        self._owns_client = client is None
+        self.client = client if client is not None else create_openai_client()
+        self.model = OPENAI_MODEL
+        self._cache = (
+            _ResponseCache(LLM_CACHE_PATH, LLM_CACHE_TTL, LLM_CACHE_MAX_ENTRIES)
+            if LLM_CACHE_TTL > 0 else None
+        )
+        self._semantic_cache = (
+            _SemanticCache(LLM_SEMANTIC_CACHE_THRESHOLD, LLM_CACHE_TTL, LLM_CACHE_MAX_ENTRIES)
+            if LLM_SEMANTIC_CACHE and LLM_CACHE_TTL > 0 else None
+        )
+        self._sem = _LoopLocal(lambda: asyncio.Semaphore(LLM_CONCURRENCY))
+        self._rpm_bucket = _TokenBucket(LLM_MAX_REQUESTS_PER_MIN)
+        self._tpm_bucket = _TokenBucket(LLM_MAX_TOKENS_PER_MIN)
+        self._token_stats = CompletionTokenStats()
+        # Finished timeframe analyses for an unchanged prompt, so quick repeat requests
+        # skip the response cache lookup and parsing entirely
+        self._result_cache = (
+            TTLCache(maxsize=RESULT_CACHE_SIZE, ttl=RESULT_CACHE_TTL) if LLM_CACHE_TTL > 0 else None
+        )
+    
+    async def aclose(self):
+        """Close the pooled HTTP connections"""
+        if self._owns_client:
+            await self.client.close()
+    
+    async def _cached_completion(
+        self,
+        system_prompt: str,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        semantic: bool = False,
+        semantic_scope: str = "",
+        json_mode: bool = False,
+        shape: Optional[Any] = None
+    ) -> str:
+        """
+        Run a chat completion, answering repeated requests from the cache
+        
+        With ``semantic=True`` (and LLM_SEMANTIC_CACHE enabled), a near-identical
+        prompt under the same system prompt and ``semantic_scope`` (e.g. the pair,
+        which similar prompts for different pairs must not share) also counts
+        as a hit. ``json_mode``
+        asks the API for a single JSON object (the prompts must mention JSON).
+        With a ``shape`` key, max_tokens is only a ceiling and the request asks
+        for what responses of that shape have needed (see CompletionTokenStats).
+        """
+        key = None
+        if self._cache is not None:
+            key = _ResponseCache.make_key(
+                m=self.model, sys=system_prompt, usr=prompt, t=temperature, mx=max_tokens, j=json_mode
+            )
+            cached = await self._cache.get(key)
+            if cached is not None:
+                return cached
+        
+        namespace = vector = None
+        if semantic and self._semantic_cache is not None:
+            namespace = _ResponseCache.make_key(
+                m=self.model, sys=system_prompt, t=temperature, mx=max_tokens, s=semantic_scope
+            )
+            vector = await self._embed(prompt)
+            if vector is not None:
+                cached = self._semantic_cache.lookup(namespace, vector)
+                if cached is not None:
+                    return cached
+        
+        encoding = _encoding(self.model)
+        budget = max_tokens if shape is None else self._token_stats.budget(shape, max_tokens)
+        content, truncated = await self._complete(system_prompt, prompt, temperature, budget, json_mode, encoding)
+        if truncated and budget < max_tokens:
+            # The learned budget was too tight for this one; retry at the ceiling
+            content, truncated = await self._complete(system_prompt, prompt, temperature, max_tokens, json_mode, encoding)
+        if shape is not None and content and not truncated:
+            self._token_stats.record(shape, _count_tokens(content, encoding))
+        
+        # A reply cut off at the ceiling is returned once but never cached
+        if truncated:
+            return content
+        if key is not None and content:
+            await self._cache.set(key, content)
+        if vector is not None and content:
+            self._semantic_cache.add(namespace, vector, content)
+        return content
+    
+    async def _complete(
+        self,
+        system_prompt: str,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        json_mode: bool,
+        encoding
+    ) -> Tuple[str, bool]:
+        """One rate-limited API call; returns the text and whether it hit max_tokens"""
+        # Prompt tokens plus the completion budget
+        est_tokens = _count_tokens(system_prompt, encoding) + _count_tokens(prompt, encoding) + max_tokens
+        async with self._sem.get():
+            await self._rpm_bucket.acquire(1)
+            await self._tpm_bucket.acquire(est_tokens)
+            messages = [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt}
+            ]
+            if json_mode:
+                # Stream so reading can stop as soon as the JSON object is complete
+                stream = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    stream=True,
+                    **_JSON_RESPONSE_FORMAT,
+                    **_prompt_cache_kwargs(system_prompt)
+                )
+                return await _read_json_stream(stream)
+            response = await self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **_prompt_cache_kwargs(system_prompt)
+            )
+            choice = response.choices[0]
+            return choice.message.content, choice.finish_reason == "length"
+    
+    async def _embed(self, text: str) -> Optional[np.ndarray]:
+        """L2-normalized embedding of text, None if the embedding call fails"""
+        try:
+            response = await self.client.embeddings.create(model=LLM_EMBEDDING_MODEL, input=text)
+        except Exception as e:
+            logger.warning(f"Embedding failed, skipping semantic cache: {e}")
+            return None
+        
+        vector = np.asarray(response.data[0].embedding, dtype=np.float32)
+        return vector / np.linalg.norm(vector)
+    
+    # Kept as class attributes for callers that read them off the analyzer
+    TRADING_STYLES = _TRADING_STYLES
+    ASSET_INFO = _ASSET_INFO
+    
+    def _get_style_params(self, trading_style: str) -> str:
+        """Get formatted trading style parameters for prompts"""
+        return _STYLE_PARAMS.get(trading_style, _DEFAULT_STYLE_PARAMS)
+
+    async def analyze_pair(self, pair: str, articles: List[NewsArticle], timeframe: str = "H1", trading_style: str = "day", articles_index: Optional[ArticleIndex] = None) -> MarketAnalysis:
         """Analyze market for a specific currency pair with timeframe and trading style context"""
         # Filter articles for this pair
-        relevant_articles = [a for a in articles if pair in a.currency_pairs or not a.currency_pairs]
+        relevant_articles = self._relevant_articles(pair, articles, articles_index)
         
-        style_config = self.TRADING_STYLES.get(trading_style, self.TRADING_STYLES['day'])
+        style_config = _TRADING_STYLES.get(trading_style, _DEFAULT_STYLE)
         
         if not relevant_articles:
             return MarketAnalysis(
@@ -184,13 +1042,13 @@ class ForexAnalyzer:
             )
         
         # Prepare articles text
-        articles_text = self._format_articles(relevant_articles[:10])  # Limit to 10 articles
+        articles_text = self._pack_articles(relevant_articles, budget_tokens=1500)
         
         # Get timeframes for this trading style
         style_timeframes = style_config.get('timeframes', ['H1'])
         
         # Generate analysis with full context
-        prompt = ANALYSIS_PROMPT.format(
+        prompt = _ANALYSIS_PROMPT_FN(
             articles=articles_text,
             pair=pair,
             trading_style=style_config['name'],
@@ -198,24 +1056,14 @@ class ForexAnalyzer:
             timeframes=', '.join(style_timeframes)
         )
         
-        system_prompt = f"""You are an expert forex market analyst specializing in {style_config['name']} trading.
-Your analysis should be optimized for {timeframe} timeframe traders.
-Provide actionable insights with specific price levels and clear trade setups.
-Consider multi-timeframe analysis using: {', '.join(style_timeframes)}."""
+        system_prompt = _analysis_system_prompt(style_config['name'], timeframe, tuple(style_timeframes))
         
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=2000
+            analysis_text = await self._cached_completion(
+                system_prompt, prompt, temperature=0.7, max_tokens=2000,
+                semantic=True, semantic_scope=pair
             )
             
-            analysis_text = response.choices[0].message.content
-            
             # Parse the response
             analysis = self._parse_analysis(pair, analysis_text, len(relevant_articles))
             return analysis
@@ -233,221 +1081,227 @@ Consider multi-timeframe analysis using: {', '.join(style_timeframes)}."""
                 sources_count=len(relevant_articles)
             )
     
-    async def get_trade_recommendation(self, pair: str, analysis: MarketAnalysis, timeframe: str = "H1", trading_style: str = "day", timeframes: List[str] = None) -> TradeRecommendation:
-        """Generate trade recommendation based on analysis with timeframe and trading style"""
-        pair_config = PAIR_CONFIGS.get(pair, {
-            "volatility": "medium",
-            "default_sl_pips": 30,
-            "default_tp_pips": 60
-        })
-        
-        style_config = self.TRADING_STYLES.get(trading_style, self.TRADING_STYLES['day'])
-        
-        # Get timeframes list
-        tf_list = timeframes if timeframes else style_config.get('timeframes', [timeframe])
-        
-        # Adjust SL/TP based on trading style
-        adjusted_sl = int(pair_config.get("default_sl_pips", 30) * style_config['sl_multiplier'])
-        adjusted_tp = int(pair_config.get("default_tp_pips", 60) * style_config['tp_multiplier'])
+    async def analyze_pairs(self, pairs: List[str], articles: List[NewsArticle], timeframe: str = "H1", trading_style: str = "day") -> Dict[str, MarketAnalysis]:
+        """Analyze several pairs concurrently (bounded by LLM_CONCURRENCY and the rate limits)"""
+        index = self.build_pair_index(articles)
+        results = await asyncio.gather(*[
+            self.analyze_pair(pair, articles, timeframe, trading_style, articles_index=index) for pair in pairs
+        ])
+        return dict(zip(pairs, results))
+    
+    async def analyze_and_recommend_pairs(
+        self,
+        pairs: List[str],
+        articles: List[NewsArticle],
+        timeframe: str = "H1",
+        trading_style: str = "day"
+    ) -> Dict[str, Tuple[MarketAnalysis, TradeRecommendation]]:
+        """analyze_and_recommend for several pairs concurrently (bounded like analyze_pairs)"""
+        index = self.build_pair_index(articles)
+        results = await asyncio.gather(*[
+            self.analyze_and_recommend(pair, articles, timeframe, trading_style, articles_index=index)
+            for pair in pairs
+        ])
+        return dict(zip(pairs, results))
+    
+    @staticmethod
+    def build_pair_index(articles: List[NewsArticle]) -> ArticleIndex:
+        """
+        Index articles by currency pair in one pass
         
-        # Get style parameters for prompt
-        style_params = self._get_style_params(trading_style)
+        Untagged articles (relevant to every pair) are stored under
+        _ALL_PAIRS. Entries keep the article's position so per-pair lists
+        can be merged back in the original order.
+        """
+        index: ArticleIndex = defaultdict(list)
+        for position, article in enumerate(articles):
+            for pair in dict.fromkeys(article.currency_pairs or (_ALL_PAIRS,)):
+                index[pair].append((position, article))
+        return index
+    
+    @staticmethod
+    def _iter_relevant_articles(
+        pair: str,
+        articles: List[NewsArticle],
+        articles_index: Optional[ArticleIndex] = None
+    ) -> Iterator[NewsArticle]:
+        """
+        Lazily yield articles tagged with pair or with no pair at all, in order
         
-        prompt = TRADE_SUGGESTION_PROMPT.format(
-            analysis=analysis.summary,
-            pair=pair,
-            trading_style=style_config['name'],
-            timeframe=timeframe,
-            timeframes=', '.join(tf_list),
-            volatility=pair_config.get("volatility", "medium"),
-            default_sl=adjusted_sl,
-            default_tp=adjusted_tp,
-            style_params=style_params
+        Consumers that stop early (e.g. _pack_articles once its token budget
+        is spent) never look at the rest of the list.
+        """
+        if articles_index is None:
+            return (a for a in articles if not a.currency_pairs or pair in a.currency_pairs)
+        return (
+            article for _, article in heapq.merge(
+                articles_index.get(pair, ()), articles_index.get(_ALL_PAIRS, ()), key=itemgetter(0)
+            )
         )
+    
+    @classmethod
+    def _relevant_articles(
+        cls,
+        pair: str,
+        articles: List[NewsArticle],
+        articles_index: Optional[ArticleIndex] = None
+    ) -> List[NewsArticle]:
+        """Articles tagged with pair or with no pair at all, in their original order"""
+        return list(cls._iter_relevant_articles(pair, articles, articles_index))
+    
+    async def get_trade_recommendation(self, pair: str, analysis: MarketAnalysis, timeframe: str = "H1", trading_style: str = "day", timeframes: List[str] = None) -> TradeRecommendation:
+        """Generate trade recommendation based on analysis with timeframe and trading style"""
+        pair_config, style_config, context = self._trade_context(pair, timeframe, trading_style, timeframes)
+        prompt = _TRADE_SUGGESTION_PROMPT_FN(analysis=analysis.summary, **context)
         
-        system_prompt = f"""You are an expert forex trading advisor specializing in {style_config['name']}.
-You MUST respond with valid JSON only. No markdown, no explanations outside JSON.
-Provide specific, actionable trade recommendations optimized for {timeframe} timeframe.
-Consider the full analysis context and multi-timeframe alignment."""
+        system_prompt = _trade_system_prompt(style_config['name'], timeframe)
         
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.5,
-                max_tokens=1500
+            response_text = await self._cached_completion(
+                system_prompt, prompt, temperature=0.5, max_tokens=1500, json_mode=True,
+                # Similar summaries can still point in opposite directions; only
+                # reuse a trade for the same pair, sentiment, timeframe and style
+                semantic=True,
+                semantic_scope=f"{pair}|{analysis.sentiment}|{timeframe}|{style_config['name']}"
             )
             
-            response_text = response.choices[0].message.content
-            
-            # Extract JSON from response
-            trade_data = self._extract_json(response_text)
+            trade_data = self._load_json(response_text)
             
             if trade_data:
-                return TradeRecommendation(
-                    pair=pair,
-                    recommendation=trade_data.get("recommendation", "HOLD"),
-                    confidence=trade_data.get("confidence", 50),
-                    timeframe=trade_data.get("timeframe", "H1"),
-                    entry_zone=trade_data.get("entry_zone", {"type": "market", "price_description": "Current market price"}),
-                    stop_loss=trade_data.get("stop_loss", {"pips": pair_config["default_sl_pips"], "description": "Default SL"}),
-                    take_profit=trade_data.get("take_profit", {"pips": pair_config["default_tp_pips"], "description": "Default TP"}),
-                    risk_reward_ratio=trade_data.get("risk_reward_ratio", 1.5),
-                    reasoning=trade_data.get("reasoning", "Based on market analysis"),
-                    key_levels=trade_data.get("key_levels", []),
-                    invalidation=trade_data.get("invalidation", "Price breaks key levels"),
-                    news_to_watch=trade_data.get("news_to_watch", [])
-                )
+                return self._build_trade_recommendation(pair, trade_data, pair_config)
             else:
                 raise ValueError("Could not parse trade recommendation")
                 
         except Exception as e:
             logger.error(f"Error generating trade recommendation for {pair}: {e}")
-            return TradeRecommendation(
+            return TradeRecommendation.model_validate({
+                **_TRADE_ERROR,
+                "pair": pair,
+                "reasoning": f"Error generating recommendation: {str(e)}"
+            })
+    
+    async def analyze_and_recommend(
+        self,
+        pair: str,
+        articles: List[NewsArticle],
+        timeframe: str = "H1",
+        trading_style: str = "day",
+        articles_index: Optional[ArticleIndex] = None
+    ) -> Tuple[MarketAnalysis, TradeRecommendation]:
+        """
+        Analysis and trade recommendation for a pair from a single LLM call
+        
+        Equivalent to analyze_pair followed by get_trade_recommendation, at
+        one round-trip instead of two. Falls back to the two-step path if the
+        combined response cannot be parsed.
+        """
+        relevant_articles = self._relevant_articles(pair, articles, articles_index)
+        if not relevant_articles:
+            return await self._analyze_then_recommend(pair, relevant_articles, timeframe, trading_style)
+        
+        pair_config, style_config, context = self._trade_context(pair, timeframe, trading_style)
+        prompt = _ANALYSIS_AND_TRADE_PROMPT_FN(
+            articles=self._pack_articles(relevant_articles, budget_tokens=1500),
+            **context
+        )
+        
+        system_prompt = _combined_system_prompt(style_config['name'], timeframe, context['timeframes'])
+        
+        try:
+            response_text = await self._cached_completion(
+                system_prompt, prompt, temperature=0.5, max_tokens=3000, json_mode=True,
+                shape=("combined", trading_style)
+            )
+            data = self._load_json(response_text)
+            if not isinstance(data, dict) or not data.get("analysis") or not data.get("trade"):
+                raise ValueError("Could not parse combined analysis")
+            
+            analysis_data = data["analysis"]
+            analysis = MarketAnalysis(
                 pair=pair,
-                recommendation="HOLD",
-                confidence=0,
-                timeframe="H1",
-                entry_zone={"type": "none", "price_description": "No trade recommended"},
-                stop_loss={"pips": 0, "description": "N/A"},
-                take_profit={"pips": 0, "description": "N/A"},
-                risk_reward_ratio=0,
-                reasoning=f"Error generating recommendation: {str(e)}",
-                key_levels=[],
-                invalidation="N/A",
-                news_to_watch=[]
+                sentiment=analysis_data.get("sentiment", "Neutral"),
+                confidence=analysis_data.get("confidence", 50),
+                summary=analysis_data.get("summary", ""),
+                key_factors=analysis_data.get("key_factors") or ["General market conditions"],
+                technical_outlook=analysis_data.get("technical_outlook", "See analysis above"),
+                risk_factors=analysis_data.get("risk_factors") or ["Market volatility", "Unexpected news events"],
+                sources_count=len(relevant_articles)
             )
+            return analysis, self._build_trade_recommendation(pair, data["trade"], pair_config)
+            
+        except Exception as e:
+            logger.warning(f"Combined analysis failed for {pair}, falling back to two calls: {e}")
+            return await self._analyze_then_recommend(pair, relevant_articles, timeframe, trading_style)
+    
+    async def _analyze_then_recommend(
+        self,
+        pair: str,
+        articles: List[NewsArticle],
+        timeframe: str,
+        trading_style: str
+    ) -> Tuple[MarketAnalysis, TradeRecommendation]:
+        analysis = await self.analyze_pair(pair, articles, timeframe, trading_style)
+        recommendation = await self.get_trade_recommendation(pair, analysis, timeframe, trading_style)
+        return analysis, recommendation
+    
+    def _trade_context(
+        self,
+        pair: str,
+        timeframe: str,
+        trading_style: str,
+        timeframes: List[str] = None
+    ) -> Tuple[Dict, Dict, Dict[str, Any]]:
+        """Pair config, style config and the trade prompt fields shared by both prompts"""
+        pair_config = PAIR_CONFIGS.get(pair, {
+            "volatility": "medium",
+            "default_sl_pips": 30,
+            "default_tp_pips": 60
+        })
+        
+        style_config = _TRADING_STYLES.get(trading_style, _DEFAULT_STYLE)
+        
+        # Get timeframes list
+        tf_list = timeframes if timeframes else style_config.get('timeframes', [timeframe])
+        
+        # Adjust SL/TP based on trading style
+        adjusted_sl = int(pair_config.get("default_sl_pips", 30) * style_config['sl_multiplier'])
+        adjusted_tp = int(pair_config.get("default_tp_pips", 60) * style_config['tp_multiplier'])
+        
+        context = {
+            "pair": pair,
+            "trading_style": style_config['name'],
+            "timeframe": timeframe,
+            "timeframes": ', '.join(tf_list),
+            "volatility": pair_config.get("volatility", "medium"),
+            "default_sl": adjusted_sl,
+            "default_tp": adjusted_tp,
+            "style_params": self._get_style_params(trading_style)
+        }
+        return pair_config, style_config, context
+    
+    def _build_trade_recommendation(self, pair: str, trade_data: Dict[str, Any], pair_config: Dict) -> TradeRecommendation:
+        return TradeRecommendation.model_validate({
+            **_TRADE_DEFAULTS,
+            "stop_loss": {"pips": pair_config["default_sl_pips"], "description": "Default SL"},
+            "take_profit": {"pips": pair_config["default_tp_pips"], "description": "Default TP"},
+            **trade_data,
+            "pair": pair
+        })
     
-    # Asset configurations for market overview - multilingual
-    ASSET_INFO = {
-        # Currencies
-        "USD": {"name_fa": "دلار آمریکا", "name_en": "US Dollar", "type": "currency", "country_fa": "آمریکا", "country_en": "USA"},
-        "EUR": {"name_fa": "یورو", "name_en": "Euro", "type": "currency", "country_fa": "اتحادیه اروپا", "country_en": "Eurozone"},
-        "GBP": {"name_fa": "پوند انگلیس", "name_en": "British Pound", "type": "currency", "country_fa": "انگلیس", "country_en": "UK"},
-        "JPY": {"name_fa": "ین ژاپن", "name_en": "Japanese Yen", "type": "currency", "country_fa": "ژاپن", "country_en": "Japan"},
-        "CHF": {"name_fa": "فرانک سوئیس", "name_en": "Swiss Franc", "type": "currency", "country_fa": "سوئیس", "country_en": "Switzerland"},
-        "AUD": {"name_fa": "دلار استرالیا", "name_en": "Australian Dollar", "type": "currency", "country_fa": "استرالیا", "country_en": "Australia"},
-        "CAD": {"name_fa": "دلار کانادا", "name_en": "Canadian Dollar", "type": "currency", "country_fa": "کانادا", "country_en": "Canada"},
-        "NZD": {"name_fa": "دلار نیوزیلند", "name_en": "New Zealand Dollar", "type": "currency", "country_fa": "نیوزیلند", "country_en": "New Zealand"},
-        "CNY": {"name_fa": "یوان چین", "name_en": "Chinese Yuan", "type": "currency", "country_fa": "چین", "country_en": "China"},
-        # Commodities
-        "XAU": {"name_fa": "طلا", "name_en": "Gold", "type": "commodity", "country_fa": "جهانی", "country_en": "Global"},
-        "XAG": {"name_fa": "نقره", "name_en": "Silver", "type": "commodity", "country_fa": "جهانی", "country_en": "Global"},
-        "OIL": {"name_fa": "نفت", "name_en": "Crude Oil", "type": "commodity", "country_fa": "جهانی", "country_en": "Global"},
-        # Indices
-        "SPX": {"name_fa": "اس اند پی ۵۰۰", "name_en": "S&P 500", "type": "index", "country_fa": "آمریکا", "country_en": "USA"},
-        "DJI": {"name_fa": "داوجونز", "name_en": "Dow Jones", "type": "index", "country_fa": "آمریکا", "country_en": "USA"},
-        "NDX": {"name_fa": "نزدک", "name_en": "NASDAQ", "type": "index", "country_fa": "آمریکا", "country_en": "USA"},
-        "FTSE": {"name_fa": "فوتسی ۱۰۰", "name_en": "FTSE 100", "type": "index", "country_fa": "انگلیس", "country_en": "UK"},
-        "DAX": {"name_fa": "داکس", "name_en": "DAX", "type": "index", "country_fa": "آلمان", "country_en": "Germany"},
-        "NKY": {"name_fa": "نیکی", "name_en": "Nikkei 225", "type": "index", "country_fa": "ژاپن", "country_en": "Japan"},
-        # Cryptocurrencies
-        "BTC": {"name_fa": "بیت‌کوین", "name_en": "Bitcoin", "type": "crypto", "country_fa": "جهانی", "country_en": "Global"},
-        "ETH": {"name_fa": "اتریوم", "name_en": "Ethereum", "type": "crypto", "country_fa": "جهانی", "country_en": "Global"},
-        "BNB": {"name_fa": "بایننس کوین", "name_en": "Binance Coin", "type": "crypto", "country_fa": "جهانی", "country_en": "Global"},
-        "XRP": {"name_fa": "ریپل", "name_en": "Ripple", "type": "crypto", "country_fa": "جهانی", "country_en": "Global"},
-        "SOL": {"name_fa": "سولانا", "name_en": "Solana", "type": "crypto", "country_fa": "جهانی", "country_en": "Global"},
-        "ADA": {"name_fa": "کاردانو", "name_en": "Cardano", "type": "crypto", "country_fa": "جهانی", "country_en": "Global"},
-        "DOGE": {"name_fa": "دوج‌کوین", "name_en": "Dogecoin", "type": "crypto", "country_fa": "جهانی", "country_en": "Global"},
-        "DOT": {"name_fa": "پولکادات", "name_en": "Polkadot", "type": "crypto", "country_fa": "جهانی", "country_en": "Global"}
-    }
-
     async def generate_daily_summary(self, articles: List[NewsArticle], timeframe: str = "H1", asset: str = "USD", lang: str = "fa") -> str:
         """Generate a daily market summary with asset trend analysis in any language"""
-        articles_text = self._format_articles(articles[:15])
+        articles_text = self._pack_articles(articles, budget_tokens=2250)
         
         # Get asset info based on language
-        asset_data = self.ASSET_INFO.get(asset, {
-            "name_fa": asset, "name_en": asset, "type": "unknown", 
-            "country_fa": "نامشخص", "country_en": "Unknown"
-        })
+        asset_data = _ASSET_INFO.get(asset, _UNKNOWN_ASSET)
         
         # Use English name as fallback for all languages
         asset_name = asset_data.get(f'name_{lang}', asset_data.get('name_en', asset))
         country = asset_data.get(f'country_{lang}', asset_data.get('country_en', 'Unknown'))
         
-        # Complete prompts in each language
-        lang_prompts = {
-            'en': {
-                'system': "You are an expert financial market analyst. Provide comprehensive market analysis in English.",
-                'sections': ['Market Summary', 'Economic Analysis', 'Political Analysis', 'Financial Markets', 'Key Headlines', 'Upcoming Events', 'Market Sentiment']
-            },
-            'fa': {
-                'system': "شما یک تحلیلگر حرفه‌ای بازارهای مالی هستید. تحلیل جامع بازار را به زبان فارسی ارائه دهید.",
-                'sections': ['خلاصه بازار', 'تحلیل اقتصادی', 'تحلیل سیاسی', 'وضعیت بازارهای مالی', 'تیترهای مهم', 'رویدادهای پیش رو', 'حال و هوای بازار']
-            },
-            'ar': {
-                'system': "أنت محلل خبير في الأسواق المالية. قدم تحليلاً شاملاً للسوق باللغة العربية.",
-                'sections': ['ملخص السوق', 'التحليل الاقتصادي', 'التحليل السياسي', 'حالة الأسواق المالية', 'العناوين الرئيسية', 'الأحداث القادمة', 'معنويات السوق']
-            },
-            'tr': {
-                'system': "Uzman bir finansal piyasa analistisiniz. Kapsamlı piyasa analizini Türkçe olarak sunun.",
-                'sections': ['Piyasa Özeti', 'Ekonomik Analiz', 'Politik Analiz', 'Finansal Piyasalar', 'Önemli Başlıklar', 'Yaklaşan Olaylar', 'Piyasa Duyarlılığı']
-            },
-            'de': {
-                'system': "Sie sind ein erfahrener Finanzmarktanalyst. Erstellen Sie eine umfassende Marktanalyse auf Deutsch.",
-                'sections': ['Marktübersicht', 'Wirtschaftsanalyse', 'Politische Analyse', 'Finanzmärkte', 'Wichtige Schlagzeilen', 'Kommende Ereignisse', 'Marktstimmung']
-            },
-            'fr': {
-                'system': "Vous êtes un analyste expert des marchés financiers. Fournissez une analyse complète du marché en français.",
-                'sections': ['Résumé du marché', 'Analyse économique', 'Analyse politique', 'Marchés financiers', 'Titres importants', 'Événements à venir', 'Sentiment du marché']
-            },
-            'es': {
-                'system': "Eres un analista experto en mercados financieros. Proporciona un análisis completo del mercado en español.",
-                'sections': ['Resumen del mercado', 'Análisis económico', 'Análisis político', 'Mercados financieros', 'Titulares importantes', 'Próximos eventos', 'Sentimiento del mercado']
-            },
-            'ru': {
-                'system': "Вы эксперт-аналитик финансовых рынков. Предоставьте комплексный анализ рынка на русском языке.",
-                'sections': ['Обзор рынка', 'Экономический анализ', 'Политический анализ', 'Финансовые рынки', 'Ключевые заголовки', 'Предстоящие события', 'Настроение рынка']
-            },
-            'zh': {
-                'system': "您是一位专业的金融市场分析师。请用中文提供全面的市场分析。",
-                'sections': ['市场概述', '经济分析', '政治分析', '金融市场', '重要头条', '即将发生的事件', '市场情绪']
-            },
-            'ja': {
-                'system': "あなたは金融市場の専門アナリストです。日本語で包括的な市場分析を提供してください。",
-                'sections': ['市場概要', '経済分析', '政治分析', '金融市場', '重要なヘッドライン', '今後のイベント', '市場センチメント']
-            },
-            'ko': {
-                'system': "당신은 금융 시장 전문 분석가입니다. 한국어로 포괄적인 시장 분석을 제공하세요.",
-                'sections': ['시장 개요', '경제 분석', '정치 분석', '금융 시장', '주요 헤드라인', '다가오는 이벤트', '시장 심리']
-            },
-            'pt': {
-                'system': "Você é um analista especialista em mercados financeiros. Forneça uma análise abrangente do mercado em português.",
-                'sections': ['Resumo do mercado', 'Análise econômica', 'Análise política', 'Mercados financeiros', 'Manchetes importantes', 'Próximos eventos', 'Sentimento do mercado']
-            },
-            'it': {
-                'system': "Sei un analista esperto dei mercati finanziari. Fornisci un'analisi completa del mercato in italiano.",
-                'sections': ['Riepilogo del mercato', 'Analisi economica', 'Analisi politica', 'Mercati finanziari', 'Titoli importanti', 'Prossimi eventi', 'Sentiment del mercato']
-            },
-            'hi': {
-                'system': "आप एक विशेषज्ञ वित्तीय बाजार विश्लेषक हैं। हिंदी में व्यापक बाजार विश्लेषण प्रदान करें।",
-                'sections': ['बाजार सारांश', 'आर्थिक विश्लेषण', 'राजनीतिक विश्लेषण', 'वित्तीय बाजार', 'महत्वपूर्ण सुर्खियां', 'आगामी घटनाएं', 'बाजार भावना']
-            }
-        }
-        
-        lang_data = lang_prompts.get(lang, lang_prompts['en'])
-        sections = lang_data['sections']
-        system_msg = lang_data['system']
-        
-        # Language names for explicit instruction
-        lang_names = {
-            'en': 'English', 'fa': 'Persian/Farsi', 'ar': 'Arabic', 'tr': 'Turkish',
-            'de': 'German', 'fr': 'French', 'es': 'Spanish', 'ru': 'Russian',
-            'zh': 'Chinese', 'ja': 'Japanese', 'ko': 'Korean', 'pt': 'Portuguese',
-            'it': 'Italian', 'hi': 'Hindi'
-        }
-        target_lang_name = lang_names.get(lang, 'English')
-        
-        # Timeframe descriptions
-        tf_desc = {
-            "short": "Short-term", "medium": "Medium-term", "long": "Long-term",
-            "M15": "Short-term", "H1": "Short-term", "H4": "Medium-term", "D1": "Long-term"
-        }
-        tf_name = tf_desc.get(timeframe, timeframe)
+        system_msg, sections = _LANG_PROMPTS_FORMATTED.get(lang, _LANG_PROMPTS_FORMATTED['en'])
+        target_lang_name = _LANG_NAMES.get(lang, 'English')
+        tf_name = _TF_DESC.get(timeframe, timeframe)
         
         # Build prompt with sections in target language - MORE EXPLICIT
         prompt = f"""Analyze the following news articles and provide a comprehensive market analysis.
@@ -476,131 +1330,247 @@ Please provide your analysis using these section headers (write content in {targ
 Remember: Write EVERYTHING in {target_lang_name}. This is mandatory."""
 
         # Enhanced system message with explicit language instruction
-        enhanced_system_msg = f"""{system_msg}
-
-CRITICAL INSTRUCTION: You MUST respond ONLY in {target_lang_name} language. 
-Every word of your response must be in {target_lang_name}.
-Do not use English or any other language unless it's a proper noun or technical term.
-If you cannot write in {target_lang_name}, translate your response to {target_lang_name}."""
+        enhanced_system_msg = _summary_system_prompt(system_msg, target_lang_name)
 
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": enhanced_system_msg},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=2000
+            return await self._cached_completion(
+                enhanced_system_msg, prompt, temperature=0.7, max_tokens=2000,
+                semantic=True, semantic_scope=asset
             )
             
-            return response.choices[0].message.content
-            
         except Exception as e:
             logger.error(f"Error generating summary: {e}")
             return f"Error generating summary: {str(e)}"
     
     async def translate_text(self, text: str, target_lang: str) -> str:
         """Translate text to target language using AI"""
-        
-        # Language names for translation
-        lang_names = {
-            'en': 'English', 'fa': 'Persian/Farsi', 'ar': 'Arabic', 'tr': 'Turkish',
-            'de': 'German', 'fr': 'French', 'es': 'Spanish', 'ru': 'Russian',
-            'zh': 'Chinese', 'ja': 'Japanese', 'ko': 'Korean', 'pt': 'Portuguese',
-            'it': 'Italian', 'hi': 'Hindi'
-        }
-        target_lang_name = lang_names.get(target_lang, 'English')
+        target_lang_name = _LANG_NAMES.get(target_lang, 'English')
         
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system", 
-                        "content": f"You are a professional translator. Translate the given text to {target_lang_name}. "
-                                   f"Preserve all formatting, markdown, and structure. Only output the translated text, nothing else."
-                    },
-                    {
-                        "role": "user", 
-                        "content": f"Translate the following text to {target_lang_name}:\n\n{text}"
-                    }
-                ],
+            return await self._cached_completion(
+                _translation_system_prompt(target_lang_name),
+                f"Translate the following text to {target_lang_name}:\n\n{text}",
                 temperature=0.3,
                 max_tokens=2500
             )
             
-            return response.choices[0].message.content
-            
         except Exception as e:
             logger.error(f"Error translating text: {e}")
             return text  # Return original text if translation fails
     
+    async def translate_many(self, text: str, target_langs: List[str]) -> Dict[str, str]:
+        """Translate text to several languages concurrently, keyed by language code"""
+        results = await asyncio.gather(
+            *(self.translate_text(text, lang) for lang in target_langs),
+            return_exceptions=True
+        )
+        translations = {}
+        for lang, result in zip(target_langs, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Error translating text to {lang}: {result}")
+                result = text
+            translations[lang] = result
+        return translations
+    
     async def classify_article_pairs(self, article: NewsArticle, available_pairs: List[str]) -> List[str]:
         """Use LLM to classify which pairs an article is relevant to"""
-        prompt = PAIR_CLASSIFIER_PROMPT.format(
-            title=article.title,
-            content=article.content[:500],
-            pairs=", ".join(available_pairs)
-        )
+        prompt = self._classifier_prompt(article, available_pairs)
         
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a forex news classifier. Respond only with a JSON array."},
-                    {"role": "user", "content": prompt}
-                ],
+            response_text = await self._cached_completion(
+                CLASSIFIER_SYSTEM_PROMPT,
+                prompt,
                 temperature=0.3,
-                max_tokens=100
+                max_tokens=100,
+                json_mode=True
             )
-            
-            result = self._extract_json(response.choices[0].message.content)
-            if isinstance(result, list):
-                return [p for p in result if p in available_pairs]
-            return []
+            return self._parse_classified_pairs(response_text, available_pairs)
             
         except Exception as e:
             logger.error(f"Error classifying article: {e}")
             return []
     
-    def _format_articles(self, articles: List[NewsArticle]) -> str:
-        """Format articles for prompt"""
-        formatted = []
+    async def classify_article_pairs_batch(
+        self,
+        articles: List[NewsArticle],
+        available_pairs: List[str]
+    ) -> Dict[int, List[str]]:
+        """
+        Classify many articles with a single OpenAI Batch API job
+        
+        Meant for offline/nightly pipelines: the job may take up to the 24h
+        completion window, at half the per-token price. Fewer than
+        BATCH_CLASSIFY_MIN_ARTICLES articles are classified directly.
+        
+        Returns:
+            Dict mapping article index to its relevant pairs
+        """
+        if len(articles) < BATCH_CLASSIFY_MIN_ARTICLES:
+            return {
+                i: await self.classify_article_pairs(article, available_pairs)
+                for i, article in enumerate(articles)
+            }
+        
+        results: Dict[int, List[str]] = {i: [] for i in range(len(articles))}
+        lines = [
+            self._batch_line(
+                f"art-{i}",
+                CLASSIFIER_SYSTEM_PROMPT,
+                self._classifier_prompt(article, available_pairs),
+                temperature=0.3,
+                max_tokens=100
+            )
+            for i, article in enumerate(articles)
+        ]
+        
+        try:
+            batch = await self._create_batch("classify_articles.jsonl", lines)
+            while batch["status"] not in _BATCH_FINAL_STATUSES:
+                await asyncio.sleep(BATCH_POLL_INTERVAL)
+                batch = await self._get_batch(batch["id"])
+            
+            if batch["status"] != "completed":
+                logger.error(f"Classification batch {batch['id']} ended as {batch['status']}")
+            
+            for custom_id, content in (await self._batch_results(batch)).items():
+                index = int(custom_id.removeprefix("art-"))
+                results[index] = self._parse_classified_pairs(content, available_pairs)
+            
+        except Exception as e:
+            logger.error(f"Error in batch article classification: {e}")
+        
+        return results
+    
+    def _batch_line(self, custom_id: str, system_prompt: str, prompt: str, temperature: float, max_tokens: int) -> bytes:
+        """One JSONL request line for a JSON-mode chat completion in a Batch API job"""
+        return orjson.dumps({
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": self.model,
+                "messages": [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt}
+                ],
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+                **_JSON_RESPONSE_FORMAT
+            }
+        })
+    
+    async def _create_batch(self, filename: str, lines: List[bytes]) -> Dict[str, Any]:
+        input_file = await self.client.files.create(
+            file=(filename, b"\n".join(lines)),
+            purpose="batch"
+        )
+        # The pinned SDK predates client.batches; call the endpoint directly
+        response = await self.client.post(
+            "/batches",
+            cast_to=httpx.Response,
+            body={
+                "input_file_id": input_file.id,
+                "endpoint": "/v1/chat/completions",
+                "completion_window": "24h"
+            }
+        )
+        return response.json()
+    
+    async def _get_batch(self, batch_id: str) -> Dict[str, Any]:
+        response = await self.client.get(f"/batches/{batch_id}", cast_to=httpx.Response)
+        return response.json()
+    
+    async def _batch_results(self, batch: Dict[str, Any]) -> Dict[str, str]:
+        """Map custom_id to completion text for every request that produced one"""
+        if not batch.get("output_file_id"):
+            return {}
+        output = await self.client.files.content(batch["output_file_id"])
+        results = {}
+        for line in output.text.splitlines():
+            record = orjson.loads(line)
+            body = (record.get("response") or {}).get("body") or {}
+            if body.get("choices"):
+                results[record["custom_id"]] = body["choices"][0]["message"]["content"]
+        return results
+    
+    def _classifier_prompt(self, article: NewsArticle, available_pairs: List[str]) -> str:
+        return _PAIR_CLASSIFIER_PROMPT_FN(
+            title=article.title,
+            content=article.content[:500],
+            pairs=", ".join(available_pairs)
+        )
+    
+    def _parse_classified_pairs(self, response_text: str, available_pairs: List[str]) -> List[str]:
+        result = self._load_json(response_text)
+        if isinstance(result, dict):
+            result = result.get("pairs")
+        if isinstance(result, list):
+            return [p for p in result if p in available_pairs]
+        return []
+    
+    def _pack_articles(self, articles: Iterable[NewsArticle], budget_tokens: int = 1500) -> str:
+        """
+        Format articles for prompt, packing as many as fit in budget_tokens
+        
+        Each article's content is capped at ARTICLE_CONTENT_TOKENS; the last
+        article that does not fit whole is cut at a token boundary.
+        """
+        encoding = _encoding(self.model)
+        buf = io.StringIO()
+        remaining = budget_tokens
         for i, article in enumerate(articles, 1):
-            formatted.append(f"""
-### Article {i}
-**Source**: {article.source}
-**Title**: {article.title}
-**Content**: {article.content[:500]}...
-**Importance**: {article.importance}
-""")
-        return "\n".join(formatted)
+            content = _truncate_tokens(article.content, ARTICLE_CONTENT_TOKENS, encoding)
+            header = _ARTICLE_FN(
+                i=i,
+                source=article.source,
+                title=article.title,
+                content="",
+                importance=article.importance
+            )
+            if i > 1:
+                header = "\n" + header
+            overhead = _count_tokens(header, encoding)
+            content_tokens = _count_tokens(content, encoding)
+            if overhead + content_tokens > remaining:
+                fit = remaining - overhead
+                if fit < MIN_ARTICLE_CONTENT_TOKENS:
+                    break
+                content = _truncate_tokens(content, fit, encoding)
+                content_tokens = fit
+            
+            if i > 1:
+                buf.write("\n")
+            buf.write(_ARTICLE_FN(
+                i=i,
+                source=article.source,
+                title=article.title,
+                content=content,
+                importance=article.importance
+            ))
+            remaining -= overhead + content_tokens
+            if remaining <= 0:
+                break
+        return buf.getvalue()
     
     def _parse_analysis(self, pair: str, text: str, sources_count: int) -> MarketAnalysis:
         """Parse analysis text into structured format"""
-        # Simple parsing - extract key information
+        # Simple parsing - one case-insensitive sweep collects every keyword
+        hits = {kw.lower() for kw in _ANALYSIS_KEYWORDS_RE.findall(text)}
+        
         sentiment = "Neutral"
         confidence = 50
-        
-        text_lower = text.lower()
-        if "bullish" in text_lower:
+        if "bullish" in hits:
             sentiment = "Bullish"
             confidence = 70
-        elif "bearish" in text_lower:
+        elif "bearish" in hits:
             sentiment = "Bearish"
             confidence = 70
         
         # Extract key factors (simple extraction)
         key_factors = []
-        if "interest rate" in text_lower or "rate" in text_lower:
-            key_factors.append("Interest rate expectations")
-        if "inflation" in text_lower:
-            key_factors.append("Inflation data")
-        if "employment" in text_lower or "jobs" in text_lower:
-            key_factors.append("Employment data")
-        if "gdp" in text_lower:
-            key_factors.append("GDP growth")
+        for factor, keywords in _KEY_FACTOR_KEYWORDS:
+            if not hits.isdisjoint(keywords):
+                key_factors.append(factor)
         
         return MarketAnalysis(
             pair=pair,
@@ -613,29 +1583,34 @@ If you cannot write in {target_lang_name}, translate your response to {target_la
             sources_count=sources_count
         )
     
+    def _load_json(self, text: str) -> Optional[Any]:
+        """Parse a JSON-mode response, tolerating backends that ignore response_format"""
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            return self._extract_json(text)
+    
     def _extract_json(self, text: str) -> Optional[Any]:
-        """Extract JSON from text response"""
-        import re
-        
-        # Try to find JSON in the response
-        json_patterns = [
-            r'\{[\s\S]*\}',  # Object
-            r'\[[\s\S]*\]'   # Array
-        ]
+        """Extract the first JSON object/array from text response"""
+        text = text.strip().removeprefix("```json").removeprefix("```").removesuffix("```").strip()
         
-        for pattern in json_patterns:
-            matches = re.findall(pattern, text)
-            for match in matches:
-                try:
-                    return json.loads(match)
-                except json.JSONDecodeError:
-                    continue
+        start = _json_start(text, 0)
+        if start == -1:
+            return None
         
-        # Try parsing the whole text
+        # Fast path: the response is only JSON (possibly after some prose)
         try:
-            return json.loads(text)
-        except json.JSONDecodeError:
-            return None
+            return orjson.loads(text[start:])
+        except orjson.JSONDecodeError:
+            pass
+        
+        # Parse a JSON prefix, ignoring any trailing text
+        while start != -1:
+            try:
+                return _JSON_DECODER.raw_decode(text, start)[0]
+            except json.JSONDecodeError:
+                start = _json_start(text, start + 1)
+        return None
 
     async def analyze_multi_timeframe(
         self, 
@@ -655,15 +1630,56 @@ If you cannot write in {target_lang_name}, translate your response to {target_la
             trading_style: scalping, day_trading, swing_trading, position_trading
             timeframes: Optional list of specific timeframes to analyze
         """
-        # Map trading style names
-        style_map = {
-            'scalping': 'scalp', 'scalp': 'scalp',
-            'day_trading': 'day', 'day': 'day',
-            'swing_trading': 'swing', 'swing': 'swing',
-            'position_trading': 'position', 'position': 'position'
-        }
-        normalized_style = style_map.get(trading_style, 'day')
-        style_config = self.TRADING_STYLES.get(normalized_style, self.TRADING_STYLES['day'])
+        normalized_style = _STYLE_BUNDLES.get(trading_style, _DEFAULT_STYLE_BUNDLE).normalized
+        tf_list, system_prompt, prompt = self._mtf_request(pair, primary_tf, articles, trading_style, timeframes)
+        
+        key = None
+        if self._result_cache is not None:
+            key = self._result_key("mtf", prompt, normalized_style, tuple(tf_list))
+            cached = self._result_cache.get(key)
+            if cached is not None:
+                return cached.model_copy(deep=True)
+        
+        try:
+            response_text = await self._cached_completion(
+                system_prompt, prompt, temperature=0.5, max_tokens=3000, json_mode=True,
+                shape=("mtf", normalized_style, len(tf_list))
+            )
+            
+            # Parsing a large response would stall every other coroutine; do it in a thread
+            if len(response_text or "") > THREAD_PARSE_MIN_CHARS:
+                analysis = await asyncio.to_thread(self._parse_mtf_response, pair, primary_tf, tf_list, response_text)
+            else:
+                analysis = self._parse_mtf_response(pair, primary_tf, tf_list, response_text)
+                
+        except Exception as e:
+            logger.error(f"Error in MTF analysis for {pair}: {e}")
+            return self._mtf_error(pair, primary_tf, tf_list, e)
+        
+        if key is not None:
+            self._result_cache[key] = analysis.model_copy(deep=True)
+        return analysis
+    
+    @staticmethod
+    def _result_key(kind: str, prompt: str, *params) -> Tuple:
+        """
+        Result cache key: the call's parameters plus a digest of the user prompt
+        
+        The prompt holds the pair and the packed news context, so only articles
+        that actually made it into the prompt affect the key.
+        """
+        return (kind, *params, hashlib.sha1(prompt.encode("utf-8")).digest())
+    
+    def _mtf_request(
+        self,
+        pair: str,
+        primary_tf: str,
+        articles: List[NewsArticle],
+        trading_style: str = "day_trading",
+        timeframes: List[str] = None
+    ) -> Tuple[List[str], str, str]:
+        """Build (timeframes analyzed, system prompt, user prompt) for an MTF analysis"""
+        style = _STYLE_BUNDLES.get(trading_style, _DEFAULT_STYLE_BUNDLE)
         
         # Get timeframes to analyze - use provided list or get from config
         if timeframes and len(timeframes) > 1:
@@ -672,84 +1688,121 @@ If you cannot write in {target_lang_name}, translate your response to {target_la
             tf_list = get_mtf_timeframes(primary_tf)
         
         # Prepare news context
-        relevant_articles = [a for a in articles if pair in a.currency_pairs or not a.currency_pairs]
-        news_context = self._format_articles(relevant_articles[:10])
-        
-        # Get style parameters
-        style_params = self._get_style_params(normalized_style)
+        # Only the articles that fit the budget are needed; filter lazily
+        relevant_articles = self._iter_relevant_articles(pair, articles)
+        news_context = self._pack_articles(relevant_articles, budget_tokens=1500)
         
-        prompt = MULTI_TIMEFRAME_PROMPT.format(
+        prompt = _MULTI_TIMEFRAME_PROMPT_FN(
             pair=pair,
-            trading_style=style_config['name'],
+            trading_style=style.config['name'],
             timeframes=", ".join(tf_list),
             primary_tf=primary_tf,
             news_context=news_context
         )
         
-        system_prompt = f"""You are an expert multi-timeframe forex analyst specializing in {style_config['name']}.
-Analyze ALL provided timeframes: {', '.join(tf_list)}
-Primary entry timeframe: {primary_tf}
-
-Trading Style Parameters:
-{style_params}
-
-You MUST respond with valid JSON only. Provide specific price levels and actionable recommendations.
-Grade the setup quality honestly based on timeframe alignment and confluence."""
+        system_prompt = _mtf_system_prompt(style.config['name'], style.params, tuple(tf_list), primary_tf)
+        return tf_list, system_prompt, prompt
+    
+    def _parse_mtf_response(self, pair: str, primary_tf: str, tf_list: List[str], response_text: str) -> MultiTimeframeAnalysis:
+        result = self._load_json(response_text)
+        if not result:
+            raise ValueError("Could not parse MTF analysis")
+        return self._build_mtf_analysis(pair, primary_tf, tf_list, result)
+    
+    def _build_mtf_analysis(self, pair: str, primary_tf: str, tf_list: List[str], result: Dict) -> MultiTimeframeAnalysis:
+        # Parse timeframe details
+        tf_details = {}
+        for tf, data in result.get("timeframe_analysis", {}).items():
+            tf_details[tf] = TimeframeAnalysis(
+                timeframe=tf,
+                trend=data.get("trend", "neutral"),
+                strength=data.get("strength", "moderate"),
+                support_levels=data.get("support", []),
+                resistance_levels=data.get("resistance", []),
+                momentum=data.get("momentum", "flat"),
+                bias_score=data.get("bias_score", 50)
+            )
         
-        try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.5,
-                max_tokens=3000
+        confluence = result.get("confluence", {})
+        
+        return MultiTimeframeAnalysis(
+            pair=pair,
+            primary_timeframe=primary_tf,
+            timeframes_analyzed=tf_list,
+            timeframe_details=tf_details,
+            confluence=confluence,
+            overall_bias=confluence.get("overall_bias", "neutral"),
+            confidence=confluence.get("confidence", 50),
+            trade_recommendation=result.get("trade_recommendation", {})
+        )
+    
+    @staticmethod
+    def _mtf_error(pair: str, primary_tf: str, tf_list: List[str], error: Exception) -> MultiTimeframeAnalysis:
+        return MultiTimeframeAnalysis.model_validate({
+            **_MTF_ERROR,
+            "pair": pair,
+            "primary_timeframe": primary_tf,
+            "timeframes_analyzed": tf_list,
+            "confluence": {"error": str(error)}
+        })
+    
+    async def submit_mtf_batch(self, requests: List[Dict[str, Any]]) -> str:
+        """
+        Queue many multi-timeframe analyses as one OpenAI Batch API job
+        
+        For background jobs such as portfolio scans, where results can wait
+        up to the 24h completion window in exchange for half the price.
+        
+        Args:
+            requests: One dict per analysis with the analyze_multi_timeframe
+                arguments: pair, primary_tf, articles and optionally
+                trading_style and timeframes
+        
+        Returns:
+            Batch id to pass to poll_mtf_batch
+        """
+        lines = []
+        for i, request in enumerate(requests):
+            pair, primary_tf = request["pair"], request["primary_tf"]
+            tf_list, system_prompt, prompt = self._mtf_request(
+                pair,
+                primary_tf,
+                request.get("articles", []),
+                request.get("trading_style", "day_trading"),
+                request.get("timeframes")
             )
-            
-            result = self._extract_json(response.choices[0].message.content)
-            
+            # The custom id carries what poll_mtf_batch needs to rebuild the result
+            custom_id = f"mtf-{i}|{pair}|{primary_tf}|{','.join(tf_list)}"
+            lines.append(self._batch_line(custom_id, system_prompt, prompt, temperature=0.5, max_tokens=3000))
+        
+        batch = await self._create_batch("mtf_analysis.jsonl", lines)
+        return batch["id"]
+    
+    async def poll_mtf_batch(self, batch_id: str) -> Optional[Dict[int, MultiTimeframeAnalysis]]:
+        """
+        Fetch the results of a submit_mtf_batch job
+        
+        Returns:
+            None while the batch is still running, otherwise a dict mapping
+            request index to its analysis. Requests the batch could not run
+            are missing from the dict.
+        """
+        batch = await self._get_batch(batch_id)
+        if batch["status"] not in _BATCH_FINAL_STATUSES:
+            return None
+        if batch["status"] != "completed":
+            logger.error(f"MTF batch {batch_id} ended as {batch['status']}")
+        
+        analyses: Dict[int, MultiTimeframeAnalysis] = {}
+        for custom_id, content in (await self._batch_results(batch)).items():
+            index, pair, primary_tf, timeframes = custom_id.removeprefix("mtf-").split("|")
+            tf_list = timeframes.split(",")
+            result = self._load_json(content)
             if result:
-                # Parse timeframe details
-                tf_details = {}
-                for tf, data in result.get("timeframe_analysis", {}).items():
-                    tf_details[tf] = TimeframeAnalysis(
-                        timeframe=tf,
-                        trend=data.get("trend", "neutral"),
-                        strength=data.get("strength", "moderate"),
-                        support_levels=data.get("support", []),
-                        resistance_levels=data.get("resistance", []),
-                        momentum=data.get("momentum", "flat"),
-                        bias_score=data.get("bias_score", 50)
-                    )
-                
-                confluence = result.get("confluence", {})
-                
-                return MultiTimeframeAnalysis(
-                    pair=pair,
-                    primary_timeframe=primary_tf,
-                    timeframes_analyzed=tf_list,
-                    timeframe_details=tf_details,
-                    confluence=confluence,
-                    overall_bias=confluence.get("overall_bias", "neutral"),
-                    confidence=confluence.get("confidence", 50),
-                    trade_recommendation=result.get("trade_recommendation", {})
-                )
+                analyses[int(index)] = self._build_mtf_analysis(pair, primary_tf, tf_list, result)
             else:
-                raise ValueError("Could not parse MTF analysis")
-                
-        except Exception as e:
-            logger.error(f"Error in MTF analysis for {pair}: {e}")
-            return MultiTimeframeAnalysis(
-                pair=pair,
-                primary_timeframe=primary_tf,
-                timeframes_analyzed=tf_list,
-                timeframe_details={},
-                confluence={"error": str(e)},
-                overall_bias="neutral",
-                confidence=0,
-                trade_recommendation={"action": "WAIT", "reason": "Analysis failed"}
-            )
+                analyses[int(index)] = self._mtf_error(pair, primary_tf, tf_list, ValueError("Could not parse MTF analysis"))
+        return analyses
 
     async def analyze_specific_timeframe(
         self,
@@ -769,23 +1822,15 @@ Grade the setup quality honestly based on timeframe alignment and confluence."""
             trading_style: Trading style
             risk_profile: conservative, moderate, aggressive
         """
-        # Map trading style
-        style_map = {
-            'scalping': 'scalp', 'scalp': 'scalp',
-            'day_trading': 'day', 'day': 'day',
-            'swing_trading': 'swing', 'swing': 'swing',
-            'position_trading': 'position', 'position': 'position'
-        }
-        normalized_style = style_map.get(trading_style, 'day')
-        style_config = self.TRADING_STYLES.get(normalized_style, self.TRADING_STYLES['day'])
-        
-        relevant_articles = [a for a in articles if pair in a.currency_pairs or not a.currency_pairs]
-        news_context = self._format_articles(relevant_articles[:8])
+        style = _STYLE_BUNDLES.get(trading_style, _DEFAULT_STYLE_BUNDLE)
+        style_config = style.config
+        relevant_articles = self._iter_relevant_articles(pair, articles)
+        news_context = self._pack_articles(relevant_articles, budget_tokens=1200)
         
         # Get timeframe-specific guidelines
         tf_guidelines = TIMEFRAME_GUIDELINES.get(timeframe, TIMEFRAME_GUIDELINES.get('H1', ''))
         
-        prompt = TIMEFRAME_SPECIFIC_PROMPT.format(
+        prompt = _TIMEFRAME_SPECIFIC_PROMPT_FN(
             pair=pair,
             timeframe=timeframe,
             news_context=news_context,
@@ -794,35 +1839,60 @@ Grade the setup quality honestly based on timeframe alignment and confluence."""
             timeframe_guidelines=tf_guidelines
         )
         
-        system_prompt = f"""You are an expert forex analyst specializing in {timeframe} timeframe trading.
-Trading Style: {style_config['name']}
-Risk Profile: {risk_profile}
-
-Timeframe Guidelines: {tf_guidelines}
-
-You MUST respond with valid JSON only. Provide specific, actionable analysis with:
-- Exact entry zones and triggers
-- Precise SL/TP levels in pips
-- Multiple take profit targets
-- Clear trade management rules"""
+        system_prompt = _timeframe_system_prompt(style_config['name'], timeframe, risk_profile, tf_guidelines)
+        
+        key = None
+        if self._result_cache is not None:
+            key = self._result_key("timeframe", prompt, timeframe, style.normalized, risk_profile)
+            cached = self._result_cache.get(key)
+            if cached is not None:
+                return copy.deepcopy(cached)
         
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.5,
-                max_tokens=1500
+            response_text = await self._cached_completion(
+                system_prompt, prompt, temperature=0.5, max_tokens=1500, json_mode=True,
+                shape=("timeframe", timeframe)
             )
             
-            result = self._extract_json(response.choices[0].message.content)
-            return result if result else {"error": "Could not parse response"}
+            result = self._load_json(response_text)
+            if not result:
+                return {"error": "Could not parse response"}
             
         except Exception as e:
             logger.error(f"Error analyzing {pair} for {timeframe}: {e}")
             return {"error": str(e)}
+        
+        if key is not None:
+            self._result_cache[key] = copy.deepcopy(result)
+        return result
+    
+    async def analyze_timeframes_batch(
+        self,
+        pair: str,
+        timeframes: List[str],
+        articles: List[NewsArticle],
+        trading_style: str = "day_trading",
+        risk_profile: str = "moderate"
+    ) -> Dict[str, Dict]:
+        """
+        Run analyze_specific_timeframe for several timeframes concurrently
+        
+        Concurrency is bounded by the analyzer-wide LLM_CONCURRENCY semaphore.
+        
+        Returns:
+            Dict mapping timeframe to its analysis (or {"error": ...})
+        """
+        results = await asyncio.gather(
+            *(self.analyze_specific_timeframe(pair, tf, articles, trading_style, risk_profile) for tf in timeframes),
+            return_exceptions=True
+        )
+        analyses = {}
+        for tf, result in zip(timeframes, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Error analyzing {pair} for {tf}: {result}")
+                result = {"error": str(result)}
+            analyses[tf] = result
+        return analyses
 
     def get_trading_styles(self) -> Dict:
         """Get available trading styles"""
@@ -1,55 +1,125 @@
 """
 Chart Image Analyzer - AI-powered chart analysis using OpenAI Vision
 """
+import asyncio
 import base64
+import copy
+import hashlib
+import importlib.util
+import io
+import json
 import logging
-from typing import Dict, Any, Optional
+import re
+from typing import Dict, Any, Optional, Tuple
+import orjson
+from cachetools import TTLCache
 from openai import AsyncOpenAI
 from datetime import datetime
+from functools import lru_cache
+from types import MappingProxyType
 
-from config.settings import OPENAI_API_KEY, OPENAI_BASE_URL, PAIR_CONFIGS
+from config.settings import PAIR_CONFIGS, LLM_CACHE_TTL
+from .analyzer import (
+    CompletionTokenStats, create_openai_client,
+    _JSON_RESPONSE_FORMAT, _compile_template, _count_tokens, _encoding, _read_json_stream
+)
 
 logger = logging.getLogger(__name__)
 
+# Analyses kept per (image(s), pair, timeframe, style); Vision calls are slow and costly
+CHART_CACHE_SIZE = 512
 
-class ChartImageAnalyzer:
-    """Analyze forex charts using OpenAI Vision API"""
+# Charts are downscaled to this longest side and re-encoded as JPEG before
+# upload; gpt-4o downsamples larger images itself, so detail is not lost.
+# Pillow is optional: without it images are sent unchanged.
+CHART_MAX_SIDE = 1024
+CHART_JPEG_QUALITY = 85
+_PIL_AVAILABLE = importlib.util.find_spec("PIL") is not None
+
+# Fixed fields of the result returned when an analysis fails, see _error_result
+_ERROR_ANALYSIS = MappingProxyType({'sentiment': 'Unknown', 'sentiment_score': 0})
+_ERROR_RECOMMENDATION = MappingProxyType({'recommendation': 'WAIT', 'confidence': 0})
+_ERROR_LEVEL = MappingProxyType({'pips': 0, 'description': 'خطا'})
+
+# Characters that matter for finding where a JSON object ends
+_JSON_OBJECT_RE = re.compile(r'[{}"\\]')
+
+
+def _load_json(text: str) -> Any:
+    """Parse JSON with orjson, falling back to the stdlib for what orjson rejects (NaN etc.)"""
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        return json.loads(text)
+
+
+def _compress_image(image_data: str) -> Tuple[str, str]:
+    """Downscale and re-encode a base64 chart; returns (base64 data, MIME type)"""
+    if not _PIL_AVAILABLE:
+        return image_data, "image/png"
+    from PIL import Image
     
-    def __init__(self):
-        self.client = AsyncOpenAI(
-            api_key=OPENAI_API_KEY,
-            base_url=OPENAI_BASE_URL
-        )
-        self.vision_model = "gpt-4o"  # GPT-4 Vision model
+    try:
+        with Image.open(io.BytesIO(base64.b64decode(image_data))) as img:
+            img.thumbnail((CHART_MAX_SIDE, CHART_MAX_SIDE), Image.LANCZOS)
+            buf = io.BytesIO()
+            img.convert("RGB").save(buf, format="JPEG", quality=CHART_JPEG_QUALITY)
+    except Exception as e:
+        logger.warning(f"Could not re-encode chart image, sending it as is: {e}")
+        return image_data, "image/png"
     
-    async def analyze_chart_image(
-        self,
-        pair: str,
-        image_data: str,  # base64 encoded image
-        timeframe: str = "H1",
-        trading_style: str = "day"
-    ) -> Dict[str, Any]:
-        """
-        Analyze a chart image and provide trade recommendation
-        
-        Args:
-            pair: Currency pair (e.g., EURUSD)
-            image_data: Base64 encoded chart image
-            timeframe: Trading timeframe
-            trading_style: Trading style (scalp, day, swing, position)
-        
-        Returns:
-            Dictionary with analysis and trade recommendation
-        """
-        try:
-            pair_config = PAIR_CONFIGS.get(pair, {
-                "volatility": "medium",
-                "default_sl_pips": 30,
-                "default_tp_pips": 60
-            })
-            
-            # Create detailed prompt for chart analysis
-            prompt = f"""You are an expert forex trader analyzing a {pair} chart on {timeframe} timeframe for {trading_style} trading.
+    compressed = base64.b64encode(buf.getvalue()).decode()
+    if len(compressed) >= len(image_data):
+        return image_data, "image/png"
+    return compressed, "image/jpeg"
+
+
+def _find_json_object(text: str) -> Optional[str]:
+    """
+    Return the first balanced JSON object in text, or None
+    
+    Single forward pass over braces and quotes, ignoring braces inside
+    string values, so large responses never backtrack and trailing prose
+    with its own braces is not swallowed.
+    """
+    depth = 0
+    start = -1
+    in_string = False
+    skip = -1
+    for match in _JSON_OBJECT_RE.finditer(text):
+        pos = match.start()
+        if pos == skip:
+            continue
+        char = match.group()
+        if in_string:
+            if char == "\\":
+                skip = pos + 1
+            elif char == '"':
+                in_string = False
+        elif depth == 0:
+            if char == "{":
+                start = pos
+                depth = 1
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:pos + 1]
+    return None
+
+
+# Request-independent instructions come first in every Vision call so the
+# provider's automatic prompt-prefix cache can reuse them across requests;
+# pair, timeframe and style follow in a short per-request block.
+VISION_SYSTEM_PROMPT = (
+    "You are an expert forex trader. Provide precise, actionable trade setups "
+    "with specific entry, SL, and TP levels."
+)
+
+STATIC_VISION_PROMPT = """You are an expert forex trader analyzing a chart for the pair, timeframe and trading style given below.
 
 Analyze this chart image carefully and provide:
 
@@ -59,92 +129,268 @@ Analyze this chart image carefully and provide:
 4. **Risk Management**: Risk-reward ratio and position sizing
 
 Provide your analysis in this EXACT JSON format:
-{{
+{
     "sentiment": "Bullish|Bearish|Neutral",
     "confidence": 0-100,
     "trend": "uptrend|downtrend|sideways",
-    "key_levels": {{
+    "key_levels": {
         "support": ["level1", "level2"],
         "resistance": ["level1", "level2"]
-    }},
-    "recommendation": {{
+    },
+    "recommendation": {
         "action": "BUY|SELL|WAIT",
-        "entry_zone": {{
+        "entry_zone": {
             "min": "price",
             "max": "price",
             "description": "entry description"
-        }},
-        "stop_loss": {{
+        },
+        "stop_loss": {
             "price": "SL price",
             "pips": number,
             "description": "SL reasoning"
-        }},
-        "take_profit": {{
+        },
+        "take_profit": {
             "price": "TP price",
             "pips": number,
             "description": "TP reasoning"
-        }},
+        },
         "risk_reward_ratio": number,
         "confidence": 0-100
-    }},
+    },
     "reasoning": "Detailed explanation of the trade setup",
     "key_factors": ["factor1", "factor2", "factor3"],
     "invalidation": "What would invalidate this setup",
     "timeframe_alignment": "How this aligns with higher/lower timeframes"
-}}
+}
+
+Be specific with price levels and provide actionable trade recommendations."""
 
-Pair Configuration:
+# Per-request tails, rendered with the placeholders parsed once
+CHART_DETAILS_TEMPLATE = """Chart: {pair} on {timeframe} timeframe for {trading_style} trading.
+
+{pair_config}"""
+_CHART_DETAILS_FN = _compile_template(CHART_DETAILS_TEMPLATE)
+
+MTF_CHART_DETAILS_TEMPLATE = """Charts: {pair} across MULTIPLE TIMEFRAMES: {timeframe_list} for {trading_style} trading.
+I'm providing you with {chart_count} chart images; use these timeframes as the "timeframe_analysis" keys.
+
+{pair_config}"""
+_MTF_CHART_DETAILS_FN = _compile_template(MTF_CHART_DETAILS_TEMPLATE)
+
+_DEFAULT_PAIR_CONFIG = MappingProxyType({
+    "volatility": "medium",
+    "default_sl_pips": 30,
+    "default_tp_pips": 60
+})
+
+
+@lru_cache(maxsize=64)
+def _pair_config_block(pair: str) -> str:
+    """Pair configuration lines of the prompt; fixed per pair, so built once"""
+    pair_config = PAIR_CONFIGS.get(pair, _DEFAULT_PAIR_CONFIG)
+    return f"""Pair Configuration:
 - Volatility: {pair_config.get('volatility', 'medium')}
 - Typical SL: {pair_config.get('default_sl_pips', 30)} pips
-- Typical TP: {pair_config.get('default_tp_pips', 60)} pips
+- Typical TP: {pair_config.get('default_tp_pips', 60)} pips"""
 
-Be specific with price levels and provide actionable trade recommendations."""
+
+MTF_VISION_SYSTEM_PROMPT = (
+    "You are an expert forex trader specializing in multi-timeframe analysis. "
+    "Provide precise, actionable trade setups based on timeframe confluence."
+)
+
+STATIC_MTF_VISION_PROMPT = """You are an expert forex trader analyzing a pair across the MULTIPLE TIMEFRAMES given below.
+
+Analyze ALL charts together to:
+
+1. **Multi-Timeframe Alignment**: Check if trends align across timeframes
+2. **Higher Timeframe Context**: Identify major support/resistance and trend direction
+3. **Lower Timeframe Entry**: Find precise entry points on lower timeframes
+4. **Confluence Zones**: Areas where multiple timeframes show the same signal
+
+Provide your analysis in this EXACT JSON format:
+{
+    "sentiment": "Bullish|Bearish|Neutral",
+    "confidence": 0-100,
+    "trend": "uptrend|downtrend|sideways",
+    "timeframe_analysis": {
+        "<timeframe>": "analysis of this timeframe",
+        "<timeframe>": "analysis of this timeframe"
+    },
+    "alignment": "aligned|conflicting|neutral",
+    "key_levels": {
+        "support": ["level1", "level2"],
+        "resistance": ["level1", "level2"]
+    },
+    "recommendation": {
+        "action": "BUY|SELL|WAIT",
+        "entry_zone": {
+            "min": "price",
+            "max": "price",
+            "description": "entry description with timeframe context"
+        },
+        "stop_loss": {
+            "price": "SL price",
+            "pips": number,
+            "description": "SL reasoning based on higher timeframe"
+        },
+        "take_profit": {
+            "price": "TP price",
+            "pips": number,
+            "description": "TP reasoning based on higher timeframe targets"
+        },
+        "risk_reward_ratio": number,
+        "confidence": 0-100
+    },
+    "reasoning": "Detailed explanation of multi-timeframe setup",
+    "key_factors": ["factor1", "factor2", "factor3"],
+    "invalidation": "What would invalidate this setup",
+    "timeframe_confluence": "How timeframes support each other"
+}
+
+Be specific with price levels and explain how each timeframe contributes to the trade setup."""
+
+
+class ChartImageAnalyzer:
+    """Analyze forex charts using OpenAI Vision API"""
+    
+    def __init__(self, client: Optional[AsyncOpenAI] = None):
+        # Pass ForexAnalyzer's client to share its connection pool
+        self._owns_client = client is None
+        self.client = client if client is not None else create_openai_client()
+        self.vision_model = "gpt-4o"  # GPT-4 Vision model
+        self._result_cache = (
+            TTLCache(maxsize=CHART_CACHE_SIZE, ttl=LLM_CACHE_TTL) if LLM_CACHE_TTL > 0 else None
+        )
+        self._token_stats = CompletionTokenStats()
+    
+    async def aclose(self):
+        """Close the pooled HTTP connections if this analyzer created them"""
+        if self._owns_client:
+            await self.client.close()
+    
+    @staticmethod
+    def _image_digest(image_data: str) -> str:
+        # The base64 text identifies the image as well as its decoded bytes
+        return hashlib.sha256(image_data.encode()).hexdigest()
+    
+    def _cache_get(self, key: str) -> Optional[Dict[str, Any]]:
+        if self._result_cache is None:
+            return None
+        cached = self._result_cache.get(key)
+        if cached is None:
+            return None
+        result = copy.deepcopy(cached)
+        result['generated_at'] = datetime.now().isoformat()
+        return result
+    
+    def _cache_put(self, key: str, result: Dict[str, Any]):
+        if self._result_cache is not None:
+            self._result_cache[key] = copy.deepcopy(result)
+    
+    async def _vision_completion(
+        self, system_prompt: str, content: list, max_tokens: int, shape: Any
+    ) -> Tuple[str, bool]:
+        """
+        Run a Vision completion, asking for the tokens responses of this shape need
+        
+        The response is streamed in JSON mode and reading stops as soon as the
+        JSON object closes. max_tokens is the ceiling; a response cut off at
+        the learned budget is retried once at the ceiling. Returns the text and
+        whether it was still cut off.
+        """
+        budget = self._token_stats.budget(shape, max_tokens)
+        text, truncated = await self._vision_stream(system_prompt, content, budget)
+        if truncated and budget < max_tokens:
+            text, truncated = await self._vision_stream(system_prompt, content, max_tokens)
+        
+        if text and not truncated:
+            self._token_stats.record(shape, _count_tokens(text, _encoding(self.vision_model)))
+        return text, truncated
+    
+    async def _vision_stream(self, system_prompt: str, content: list, max_tokens: int):
+        stream = await self.client.chat.completions.create(
+            model=self.vision_model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": content}
+            ],
+            max_tokens=max_tokens,
+            temperature=0.3,
+            stream=True,
+            **_JSON_RESPONSE_FORMAT
+        )
+        return await _read_json_stream(stream)
+    
+    async def analyze_chart_image(
+        self,
+        pair: str,
+        image_data: str,  # base64 encoded image
+        timeframe: str = "H1",
+        trading_style: str = "day"
+    ) -> Dict[str, Any]:
+        """
+        Analyze a chart image and provide trade recommendation
+        
+        Args:
+            pair: Currency pair (e.g., EURUSD)
+            image_data: Base64 encoded chart image
+            timeframe: Trading timeframe
+            trading_style: Trading style (scalp, day, swing, position)
+        
+        Returns:
+            Dictionary with analysis and trade recommendation
+        """
+        cache_key = f"{self._image_digest(image_data)}|{pair}|{timeframe}|{trading_style}"
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
+        try:
+            # Image re-encoding is CPU-bound; keep it off the event loop
+            upload_data, mime_type = await asyncio.to_thread(_compress_image, image_data)
+            
+            # Per-request details follow the shared instructions so the prefix stays cacheable
+            details = _CHART_DETAILS_FN(
+                pair=pair,
+                timeframe=timeframe,
+                trading_style=trading_style,
+                pair_config=_pair_config_block(pair)
+            )
 
             # Call OpenAI Vision API
-            response = await self.client.chat.completions.create(
-                model=self.vision_model,
-                messages=[
+            analysis_text, truncated = await self._vision_completion(
+                VISION_SYSTEM_PROMPT,
+                [
                     {
-                        "role": "system",
-                        "content": f"You are an expert forex trader specializing in {trading_style} trading on {timeframe} timeframe. Provide precise, actionable trade setups with specific entry, SL, and TP levels."
+                        "type": "text",
+                        "text": STATIC_VISION_PROMPT
                     },
                     {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": prompt
-                            },
-                            {
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": f"data:image/png;base64,{image_data}"
-                                }
-                            }
-                        ]
+                        "type": "text",
+                        "text": details
+                    },
+                    {
+                        "type": "image_url",
+                        "image_url": {
+                            "url": f"data:{mime_type};base64,{upload_data}"
+                        }
                     }
                 ],
                 max_tokens=2000,
-                temperature=0.3
+                shape=("chart", trading_style)
             )
             
-            # Parse response
-            analysis_text = response.choices[0].message.content
-            
-            # Try to extract JSON from response
-            import json
-            import re
-            
             # Find JSON in response
-            json_match = re.search(r'\{.*\}', analysis_text, re.DOTALL)
-            if json_match:
-                analysis_data = json.loads(json_match.group())
+            json_text = _find_json_object(analysis_text)
+            if json_text:
+                analysis_data = _load_json(json_text)
             else:
                 # Fallback parsing
                 analysis_data = self._parse_text_response(analysis_text, pair)
             
             # Format response
-            return {
+            result = {
                 'pair': pair,
                 'timeframe': timeframe,
                 'trading_style': trading_style,
@@ -176,28 +422,17 @@ Be specific with price levels and provide actionable trade recommendations."""
                 'generated_at': datetime.now().isoformat(),
                 'source': 'chart_image_analysis'
             }
+            # A fallback WAIT from an unparseable or cut-off reply is not a result to keep
+            if json_text and not truncated:
+                self._cache_put(cache_key, result)
+            return result
             
         except Exception as e:
             logger.error(f"Chart image analysis error for {pair}: {e}", exc_info=True)
-            return {
-                'pair': pair,
-                'error': str(e),
-                'analysis': {
-                    'sentiment': 'Unknown',
-                    'sentiment_score': 0,
-                    'key_factors': [f'خطا در تحلیل تصویر: {str(e)}'],
-                },
-                'recommendation': {
-                    'recommendation': 'WAIT',
-                    'confidence': 0,
-                    'timeframe': timeframe,
-                    'trading_style': trading_style,
-                    'reasoning': f'خطا در تحلیل: {str(e)}',
-                    'stop_loss': {'pips': 0, 'description': 'خطا'},
-                    'take_profit': {'pips': 0, 'description': 'خطا'}
-                },
-                'generated_at': datetime.now().isoformat()
-            }
+            return self._error_result(
+                pair, e, f'خطا در تحلیل تصویر: {str(e)}',
+                timeframe=timeframe, trading_style=trading_style
+            )
     
     async def analyze_multi_timeframe_charts(
         self,
@@ -216,121 +451,78 @@ Be specific with price levels and provide actionable trade recommendations."""
         Returns:
             Dictionary with multi-timeframe analysis and trade recommendation
         """
+        digests = {tf: self._image_digest(image) if image else '' for tf, image in chart_images.items()}
+        cache_key = "|".join([pair, trading_style, *(f"{tf}:{digest}" for tf, digest in digests.items())])
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
-            pair_config = PAIR_CONFIGS.get(pair, {
-                "volatility": "medium",
-                "default_sl_pips": 30,
-                "default_tp_pips": 60
-            })
-            
             # Build timeframe list for prompt
             timeframe_list = ", ".join(chart_images.keys())
             
-            # Create detailed prompt for multi-timeframe analysis
-            prompt = f"""You are an expert forex trader analyzing {pair} across MULTIPLE TIMEFRAMES: {timeframe_list} for {trading_style} trading.
-
-I'm providing you with {len(chart_images)} chart images showing different timeframes. Analyze ALL charts together to:
-
-1. **Multi-Timeframe Alignment**: Check if trends align across timeframes
-2. **Higher Timeframe Context**: Identify major support/resistance and trend direction
-3. **Lower Timeframe Entry**: Find precise entry points on lower timeframes
-4. **Confluence Zones**: Areas where multiple timeframes show the same signal
-
-Provide your analysis in this EXACT JSON format:
-{{
-    "sentiment": "Bullish|Bearish|Neutral",
-    "confidence": 0-100,
-    "trend": "uptrend|downtrend|sideways",
-    "timeframe_analysis": {{
-        "{list(chart_images.keys())[0] if chart_images else 'H1'}": "analysis of this timeframe",
-        "{list(chart_images.keys())[1] if len(chart_images) > 1 else 'H4'}": "analysis of this timeframe"
-    }},
-    "alignment": "aligned|conflicting|neutral",
-    "key_levels": {{
-        "support": ["level1", "level2"],
-        "resistance": ["level1", "level2"]
-    }},
-    "recommendation": {{
-        "action": "BUY|SELL|WAIT",
-        "entry_zone": {{
-            "min": "price",
-            "max": "price",
-            "description": "entry description with timeframe context"
-        }},
-        "stop_loss": {{
-            "price": "SL price",
-            "pips": number,
-            "description": "SL reasoning based on higher timeframe"
-        }},
-        "take_profit": {{
-            "price": "TP price",
-            "pips": number,
-            "description": "TP reasoning based on higher timeframe targets"
-        }},
-        "risk_reward_ratio": number,
-        "confidence": 0-100
-    }},
-    "reasoning": "Detailed explanation of multi-timeframe setup",
-    "key_factors": ["factor1", "factor2", "factor3"],
-    "invalidation": "What would invalidate this setup",
-    "timeframe_confluence": "How timeframes support each other"
-}}
-
-Pair Configuration:
-- Volatility: {pair_config.get('volatility', 'medium')}
-- Typical SL: {pair_config.get('default_sl_pips', 30)} pips
-- Typical TP: {pair_config.get('default_tp_pips', 60)} pips
-
-Be specific with price levels and explain how each timeframe contributes to the trade setup."""
+            # Per-request details follow the shared instructions so the prefix stays cacheable
+            details = _MTF_CHART_DETAILS_FN(
+                pair=pair,
+                timeframe_list=timeframe_list,
+                trading_style=trading_style,
+                chart_count=len(chart_images),
+                pair_config=_pair_config_block(pair)
+            )
 
             # Build message content with all chart images
-            message_content = [{"type": "text", "text": prompt}]
+            message_content = [
+                {"type": "text", "text": STATIC_MTF_VISION_PROMPT},
+                {"type": "text", "text": details}
+            ]
             
+            # Attach each distinct image once, labelled with every timeframe it is used for
+            image_timeframes: Dict[str, list] = {}
+            images: Dict[str, str] = {}
             for timeframe, image_data in chart_images.items():
                 if image_data:  # Only add if image exists
-                    message_content.append({
-                        "type": "text",
-                        "text": f"\n--- Chart for {timeframe} timeframe ---"
-                    })
-                    message_content.append({
-                        "type": "image_url",
-                        "image_url": {
-                            "url": f"data:image/png;base64,{image_data}"
-                        }
-                    })
+                    image_timeframes.setdefault(digests[timeframe], []).append(timeframe)
+                    images.setdefault(digests[timeframe], image_data)
             
-            # Call OpenAI Vision API
-            response = await self.client.chat.completions.create(
-                model=self.vision_model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": f"You are an expert forex trader specializing in multi-timeframe analysis for {trading_style} trading. Provide precise, actionable trade setups based on timeframe confluence."
-                    },
-                    {
-                        "role": "user",
-                        "content": message_content
+            # Image re-encoding is CPU-bound; keep it off the event loop
+            uploads = dict(zip(images, await asyncio.gather(
+                *(asyncio.to_thread(_compress_image, image_data) for image_data in images.values())
+            )))
+            
+            for digest, timeframes in image_timeframes.items():
+                if len(timeframes) == 1:
+                    label = f"\n--- Chart for {timeframes[0]} timeframe ---"
+                else:
+                    label = f"\n--- Chart used for timeframes: {', '.join(timeframes)} ---"
+                message_content.append({
+                    "type": "text",
+                    "text": label
+                })
+                upload_data, mime_type = uploads[digest]
+                message_content.append({
+                    "type": "image_url",
+                    "image_url": {
+                        "url": f"data:{mime_type};base64,{upload_data}"
                     }
-                ],
+                })
+            
+            # Call OpenAI Vision API
+            analysis_text, truncated = await self._vision_completion(
+                MTF_VISION_SYSTEM_PROMPT,
+                message_content,
                 max_tokens=2500,
-                temperature=0.3
+                shape=("mtf_charts", trading_style, len(chart_images))
             )
             
-            # Parse response
-            analysis_text = response.choices[0].message.content
-            
             # Try to extract JSON from response
-            import json
-            import re
-            
-            json_match = re.search(r'\{.*\}', analysis_text, re.DOTALL)
-            if json_match:
-                analysis_data = json.loads(json_match.group())
+            json_text = _find_json_object(analysis_text)
+            if json_text:
+                analysis_data = _load_json(json_text)
             else:
                 analysis_data = self._parse_text_response(analysis_text, pair)
             
             # Format response
-            return {
+            result = {
                 'pair': pair,
                 'timeframes': list(chart_images.keys()),
                 'trading_style': trading_style,
@@ -365,28 +557,34 @@ Be specific with price levels and explain how each timeframe contributes to the
                 'generated_at': datetime.now().isoformat(),
                 'source': 'multi_timeframe_chart_analysis'
             }
+            # A fallback WAIT from an unparseable or cut-off reply is not a result to keep
+            if json_text and not truncated:
+                self._cache_put(cache_key, result)
+            return result
             
         except Exception as e:
             logger.error(f"Multi-timeframe chart analysis error for {pair}: {e}", exc_info=True)
-            return {
-                'pair': pair,
-                'error': str(e),
-                'analysis': {
-                    'sentiment': 'Unknown',
-                    'sentiment_score': 0,
-                    'key_factors': [f'خطا در تحلیل چند تایم‌فریم: {str(e)}'],
-                },
-                'recommendation': {
-                    'recommendation': 'WAIT',
-                    'confidence': 0,
-                    'timeframes': list(chart_images.keys()) if chart_images else [],
-                    'trading_style': trading_style,
-                    'reasoning': f'خطا در تحلیل: {str(e)}',
-                    'stop_loss': {'pips': 0, 'description': 'خطا'},
-                    'take_profit': {'pips': 0, 'description': 'خطا'}
-                },
-                'generated_at': datetime.now().isoformat()
-            }
+            return self._error_result(
+                pair, e, f'خطا در تحلیل چند تایم‌فریم: {str(e)}',
+                timeframes=list(chart_images.keys()) if chart_images else [], trading_style=trading_style
+            )
+    
+    @staticmethod
+    def _error_result(pair: str, error: Exception, key_factor: str, **recommendation_fields) -> Dict[str, Any]:
+        """Result returned when an analysis fails; recommendation_fields name the timeframe(s) and style"""
+        return {
+            'pair': pair,
+            'error': str(error),
+            'analysis': {**_ERROR_ANALYSIS, 'key_factors': [key_factor]},
+            'recommendation': {
+                **_ERROR_RECOMMENDATION,
+                **recommendation_fields,
+                'reasoning': f'خطا در تحلیل: {str(error)}',
+                'stop_loss': dict(_ERROR_LEVEL),
+                'take_profit': dict(_ERROR_LEVEL)
+            },
+            'generated_at': datetime.now().isoformat()
+        }
     
     def _parse_text_response(self, text: str, pair: str) -> Dict:
         """Fallback parser for non-JSON responses"""
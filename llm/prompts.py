@@ -1,16 +1,13 @@
 """
 Prompt Templates for AI Analysis
-"""
-
-ANALYSIS_PROMPT = """You are an expert forex market analyst. Analyze the following news articles and provide a comprehensive market analysis.
 
-## News Articles:
-{articles}
+The large templates are split into a request-independent *_PREFIX (instructions
+and JSON schema) and a short *_SUFFIX holding the per-request fields, so every
+call starts with the same tokens and the provider's prompt-prefix cache can
+reuse them. *_PROMPT is the full template (prefix + suffix) for str.format.
+"""
 
-## Currency Pair: {pair}
-## Trading Style: {trading_style}
-## Primary Timeframe: {timeframe}
-## Analysis Timeframes: {timeframes}
+ANALYSIS_PREFIX = """You are an expert forex market analyst. Analyze the news articles below and provide a comprehensive market analysis.
 
 Please provide a detailed analysis considering the trading style and timeframes:
 
@@ -45,26 +42,22 @@ Please provide a detailed analysis considering the trading style and timeframes:
    - Best entry timing
    - Recommended position sizing
 
-Respond in a structured format optimized for {trading_style} traders on {timeframe} timeframe.
 """
 
-TRADE_SUGGESTION_PROMPT = """You are an expert forex trading advisor. Based on the following market analysis, provide a specific trade recommendation.
-
-## Market Analysis:
-{analysis}
+ANALYSIS_SUFFIX = """## News Articles:
+{articles}
 
 ## Currency Pair: {pair}
 ## Trading Style: {trading_style}
 ## Primary Timeframe: {timeframe}
 ## Analysis Timeframes: {timeframes}
 
-## Pair Configuration:
-- Volatility: {volatility}
-- Base SL (pips): {default_sl}
-- Base TP (pips): {default_tp}
+Respond in a structured format optimized for {trading_style} traders on {timeframe} timeframe.
+"""
 
-## Trading Style Parameters:
-{style_params}
+ANALYSIS_PROMPT = ANALYSIS_PREFIX + ANALYSIS_SUFFIX
+
+TRADE_SUGGESTION_PREFIX = """You are an expert forex trading advisor. Based on the market analysis below, provide a specific trade recommendation.
 
 IMPORTANT RULES:
 1. You MUST provide a BUY or SELL recommendation. Only use WAIT if there is absolutely NO clear direction.
@@ -83,8 +76,8 @@ Provide your recommendation in this JSON format:
 {{
     "recommendation": "BUY" | "SELL" | "WAIT",
     "confidence": 1-100,
-    "timeframe": "{timeframe}",
-    "trading_style": "{trading_style}",
+    "timeframe": "<primary timeframe>",
+    "trading_style": "<trading style>",
     "entry_zone": {{
         "type": "market" | "limit" | "stop",
         "price_description": "specific entry zone description",
@@ -122,6 +115,98 @@ Guidelines:
 - Grade the setup quality honestly
 """
 
+TRADE_SUGGESTION_SUFFIX = """## Market Analysis:
+{analysis}
+
+## Currency Pair: {pair}
+## Trading Style: {trading_style}
+## Primary Timeframe: {timeframe}
+## Analysis Timeframes: {timeframes}
+
+## Pair Configuration:
+- Volatility: {volatility}
+- Base SL (pips): {default_sl}
+- Base TP (pips): {default_tp}
+
+## Trading Style Parameters:
+{style_params}
+"""
+
+TRADE_SUGGESTION_PROMPT = TRADE_SUGGESTION_PREFIX + TRADE_SUGGESTION_SUFFIX
+
+ANALYSIS_AND_TRADE_PREFIX = """You are an expert forex market analyst and trading advisor. Analyze the news articles below and, based on that analysis, provide a specific trade recommendation.
+
+The analysis must cover market sentiment, fundamental key factors, technical outlook
+(support/resistance levels, trend on each timeframe), timeframe-specific outlook,
+risk factors and trade setup quality, optimized for the trading style and primary timeframe given below.
+
+IMPORTANT RULES for the trade:
+1. You MUST provide a BUY or SELL recommendation. Only use WAIT if there is absolutely NO clear direction.
+2. Adjust SL/TP based on the trading style:
+   - Scalp: Tight SL (10-20 pips), Quick TP (15-30 pips), R:R 1:1.5+
+   - Day Trading: Medium SL (20-40 pips), TP (40-80 pips), R:R 1:2+
+   - Swing: Wide SL (50-100 pips), TP (100-200 pips), R:R 1:2+
+   - Position: Very wide SL (100-200 pips), TP (200-500 pips), R:R 1:2.5+
+3. Entry on lower timeframe, confirmation on higher timeframe, trend direction on highest timeframe.
+
+Respond with a single JSON object in this format:
+{{
+    "analysis": {{
+        "sentiment": "Bullish" | "Bearish" | "Neutral",
+        "confidence": 1-100,
+        "summary": "full structured analysis (markdown allowed inside the string)",
+        "key_factors": ["fundamental factors affecting this pair"],
+        "technical_outlook": "key support/resistance levels and trend per timeframe",
+        "risk_factors": ["upcoming events and risks"]
+    }},
+    "trade": {{
+        "recommendation": "BUY" | "SELL" | "WAIT",
+        "confidence": 1-100,
+        "timeframe": "<primary timeframe>",
+        "entry_zone": {{
+            "type": "market" | "limit" | "stop",
+            "price_description": "specific entry zone description",
+            "best_entry_time": "optimal session/time for entry"
+        }},
+        "stop_loss": {{
+            "pips": <adjusted for trading style>,
+            "description": "technical reason for SL placement"
+        }},
+        "take_profit": {{
+            "pips": <adjusted for trading style>,
+            "tp1_pips": <first target>,
+            "tp2_pips": <second target>,
+            "tp3_pips": <final target>,
+            "description": "technical reason for TP placement"
+        }},
+        "risk_reward_ratio": <calculated R:R>,
+        "reasoning": "detailed explanation including timeframe analysis",
+        "key_levels": ["support1", "support2", "resistance1", "resistance2"],
+        "invalidation": "specific price level or condition that invalidates the trade",
+        "news_to_watch": ["specific upcoming events with dates/times"]
+    }}
+}}
+"""
+
+ANALYSIS_AND_TRADE_SUFFIX = """## News Articles:
+{articles}
+
+## Currency Pair: {pair}
+## Trading Style: {trading_style}
+## Primary Timeframe: {timeframe}
+## Analysis Timeframes: {timeframes}
+
+## Pair Configuration:
+- Volatility: {volatility}
+- Base SL (pips): {default_sl}
+- Base TP (pips): {default_tp}
+
+## Trading Style Parameters:
+{style_params}
+"""
+
+ANALYSIS_AND_TRADE_PROMPT = ANALYSIS_AND_TRADE_PREFIX + ANALYSIS_AND_TRADE_SUFFIX
+
 PAIR_CLASSIFIER_PROMPT = """Analyze the following news article and determine which currency pairs it is most relevant to.
 
 Article Title: {title}
@@ -129,8 +214,8 @@ Article Content: {content}
 
 Available pairs: {pairs}
 
-Return a JSON array of relevant pairs, ordered by relevance. Example: ["EURUSD", "GBPUSD"]
-If no pairs are clearly relevant, return an empty array: []
+Return a JSON object with the relevant pairs, ordered by relevance. Example: {{"pairs": ["EURUSD", "GBPUSD"]}}
+If no pairs are clearly relevant, return an empty list: {{"pairs": []}}
 """
 
 SUMMARY_PROMPT_FA = """شما یک تحلیلگر حرفه‌ای بازار فارکس و اقتصاد جهانی هستید. اخبار زیر را تحلیل کنید.
@@ -186,22 +271,14 @@ Provide a concise and actionable response in English.
 # For backward compatibility
 SUMMARY_PROMPT = SUMMARY_PROMPT_FA
 
-MULTI_TIMEFRAME_PROMPT = """You are an expert forex analyst performing comprehensive multi-timeframe analysis.
-
-## Currency Pair: {pair}
-## Trading Style: {trading_style}
-## Timeframes to Analyze: {timeframes}
-## Primary Timeframe (Entry): {primary_tf}
-
-## Market News & Context:
-{news_context}
+MULTI_TIMEFRAME_PREFIX = """You are an expert forex analyst performing comprehensive multi-timeframe analysis.
 
 ## Multi-Timeframe Analysis Rules:
 1. **Higher Timeframe (HTF)**: Determines overall trend direction
 2. **Middle Timeframe (MTF)**: Confirms trend and identifies key levels
 3. **Lower Timeframe (LTF)**: Provides precise entry timing
 
-For EACH timeframe in {timeframes}, analyze:
+For EACH timeframe listed below, analyze:
 1. **Trend Direction**: Bullish / Bearish / Neutral (with reasoning)
 2. **Trend Strength**: Strong / Moderate / Weak (based on momentum)
 3. **Key Support Levels**: At least 3 levels with descriptions
@@ -269,20 +346,20 @@ IMPORTANT:
 - Grade the setup honestly based on confluence
 """
 
-TIMEFRAME_SPECIFIC_PROMPT = """Analyze {pair} specifically for {timeframe} timeframe trading.
+MULTI_TIMEFRAME_SUFFIX = """## Currency Pair: {pair}
+## Trading Style: {trading_style}
+## Timeframes to Analyze: {timeframes}
+## Primary Timeframe (Entry): {primary_tf}
 
-## News Context:
+## Market News & Context:
 {news_context}
+"""
 
-## Trading Parameters:
-- Trading Style: {trading_style}
-- Risk Profile: {risk_profile}
-- Timeframe: {timeframe}
+MULTI_TIMEFRAME_PROMPT = MULTI_TIMEFRAME_PREFIX + MULTI_TIMEFRAME_SUFFIX
 
-## Timeframe-Specific Guidelines:
-{timeframe_guidelines}
+TIMEFRAME_SPECIFIC_PREFIX = """Analyze the currency pair below specifically for trading on the given timeframe.
 
-Provide a comprehensive analysis for {timeframe} traders:
+Provide a comprehensive analysis for traders on that timeframe:
 
 1. **Market Bias**: Current directional bias with confidence
 2. **Entry Strategy**: 
@@ -304,8 +381,8 @@ Provide a comprehensive analysis for {timeframe} traders:
 
 Respond in JSON:
 {{
-    "timeframe": "{timeframe}",
-    "trading_style": "{trading_style}",
+    "timeframe": "<timeframe>",
+    "trading_style": "<trading style>",
     "analysis": {{
         "bias": "bullish|bearish|neutral",
         "bias_strength": "strong|moderate|weak",
@@ -343,6 +420,22 @@ Respond in JSON:
 }}
 """
 
+TIMEFRAME_SPECIFIC_SUFFIX = """Analyze {pair} specifically for {timeframe} timeframe trading.
+
+## News Context:
+{news_context}
+
+## Trading Parameters:
+- Trading Style: {trading_style}
+- Risk Profile: {risk_profile}
+- Timeframe: {timeframe}
+
+## Timeframe-Specific Guidelines:
+{timeframe_guidelines}
+"""
+
+TIMEFRAME_SPECIFIC_PROMPT = TIMEFRAME_SPECIFIC_PREFIX + TIMEFRAME_SPECIFIC_SUFFIX
+
 # Timeframe-specific guidelines
 TIMEFRAME_GUIDELINES = {
     'M1': 'Ultra short-term scalping. SL: 5-10 pips, TP: 5-15 pips. Duration: seconds to minutes.',
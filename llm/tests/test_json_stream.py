@@ -0,0 +1,196 @@
+"""
+Test streamed JSON handling: end-of-object scanning, truncation and the
+adaptive completion budget
+"""
+
+import asyncio
+import json
+import os
+import sys
+from pathlib import Path
+from types import SimpleNamespace as NS
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+# Keep the analyzer from opening the shared on-disk response cache
+os.environ.setdefault("LLM_CACHE_TTL", "0")
+
+from llm.analyzer import (
+    CompletionTokenStats, ForexAnalyzer, _JsonEndScanner, _ResponseCache, _read_json_stream
+)
+from llm.chart_analyzer import _find_json_object
+
+
+# Braces, quotes and backslashes inside strings, followed by prose with its own braces
+DOC = '{"a": "br{ace} [x] \\"q\\" \\\\", "b": [1, {"c": "}\\\\\\""}], "d": "\\u007d"}'
+TRAILER = ' and then {more} "text"'
+
+
+class FakeStream:
+    """Async iterator of completion chunks, as returned with stream=True"""
+
+    def __init__(self, chunks, finish_reason="stop"):
+        self.chunks = list(chunks)
+        self.finish_reason = finish_reason
+        self.sent = 0
+        self.closed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.closed = True
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.sent >= len(self.chunks):
+            raise StopAsyncIteration
+        self.sent += 1
+        last = self.sent == len(self.chunks)
+        return NS(choices=[NS(
+            delta=NS(content=self.chunks[self.sent - 1]),
+            finish_reason=self.finish_reason if last else None
+        )])
+
+
+def _scan(chunks):
+    """Text kept by the scanner for these chunks, None if it never found the end"""
+    scanner = _JsonEndScanner()
+    parts = []
+    for chunk in chunks:
+        end = scanner.feed(chunk)
+        if end is not None:
+            parts.append(chunk[:end])
+            return "".join(parts)
+        parts.append(chunk)
+    return None
+
+
+def test_document_is_valid_json():
+    assert json.loads(DOC)["a"] == 'br{ace} [x] "q" \\'
+
+
+def test_scanner_single_chunk():
+    assert _scan([DOC + TRAILER]) == DOC
+
+
+def test_scanner_every_two_way_split():
+    text = DOC + TRAILER
+    for i in range(1, len(text)):
+        assert _scan([text[:i], text[i:]]) == DOC, f"split at {i}"
+
+
+def test_scanner_every_three_way_split():
+    text = DOC + TRAILER
+    for i in range(1, len(text)):
+        for j in range(i + 1, len(text)):
+            assert _scan([text[:i], text[i:j], text[j:]]) == DOC, f"split at {i}, {j}"
+
+
+def test_scanner_single_character_chunks():
+    assert _scan(list(DOC + TRAILER)) == DOC
+
+
+def test_scanner_leading_whitespace_and_arrays():
+    assert _scan(["  \n", ' ["]", [1]]', " tail"]) == '  \n ["]", [1]]'
+
+
+def test_scanner_ignores_prose():
+    assert _scan(["Sure: ", DOC]) is None
+    assert _scan(["```json\n", DOC, "\n```"]) is None
+
+
+def test_read_json_stream_stops_at_end():
+    text = DOC + TRAILER
+    stream = FakeStream([text[i:i + 7] for i in range(0, len(text), 7)] + ["never read"])
+    content, truncated = asyncio.run(_read_json_stream(stream))
+    assert content == DOC
+    assert not truncated
+    assert stream.closed
+    assert stream.sent < len(stream.chunks)
+
+
+def test_read_json_stream_reports_truncation():
+    stream = FakeStream(['{"analysis": {"summary": ', '"cut'], finish_reason="length")
+    content, truncated = asyncio.run(_read_json_stream(stream))
+    assert content == '{"analysis": {"summary": "cut'
+    assert truncated
+
+
+def test_find_json_object():
+    assert _find_json_object("Here you go: " + DOC + TRAILER) == DOC
+    assert _find_json_object('{"a": "unterminated') is None
+    assert _find_json_object("no json here") is None
+
+
+def test_token_stats_budget():
+    stats = CompletionTokenStats(window=50, min_samples=5, margin=1.5, floor=100)
+    shape = ("mtf", "day", 3)
+    assert stats.budget(shape, 3000) == 3000
+    for n in (200, 210, 220, 230):
+        stats.record(shape, n)
+    assert stats.budget(shape, 3000) == 3000  # still below min_samples
+    stats.record(shape, 240)
+    assert 230 * 1.5 <= stats.budget(shape, 3000) <= 240 * 1.5  # p95 of 200..240
+    assert stats.budget(shape, 300) == 300  # never above the ceiling
+
+    stats.record(("small",), 1)
+    for _ in range(5):
+        stats.record(("small",), 10)
+    assert stats.budget(("small",), 3000) == 100  # never below the floor
+
+
+class FakeCompletions:
+    """Streams a truncated reply below the ceiling and the full reply at it"""
+
+    def __init__(self, ceiling, full, cut):
+        self.ceiling = ceiling
+        self.full = full
+        self.cut = cut
+        self.max_tokens = []
+
+    async def create(self, **kwargs):
+        self.max_tokens.append(kwargs["max_tokens"])
+        if kwargs["max_tokens"] < self.ceiling:
+            return FakeStream([self.cut], finish_reason="length")
+        return FakeStream([self.full])
+
+
+def _analyzer(completions):
+    # LLM_CACHE_TTL may have been read before this module set it
+    with mock.patch("llm.analyzer.LLM_CACHE_TTL", 0):
+        return ForexAnalyzer(client=NS(chat=NS(completions=completions)))
+
+
+def test_truncated_reply_is_retried_at_ceiling(tmp_path):
+    completions = FakeCompletions(3000, DOC, DOC[:20])
+    analyzer = _analyzer(completions)
+    analyzer._cache = _ResponseCache(tmp_path / "cache.sqlite3", 900, 100)
+    shape = ("timeframe", "H1")
+    for _ in range(20):
+        analyzer._token_stats.record(shape, 50)
+
+    content = asyncio.run(analyzer._cached_completion(
+        "system", "prompt", 0.5, 3000, json_mode=True, shape=shape
+    ))
+    assert content == DOC
+    assert completions.max_tokens[0] < 3000
+    assert completions.max_tokens[1] == 3000
+
+
+def test_truncated_reply_is_not_cached(tmp_path):
+    completions = FakeCompletions(10 ** 9, DOC, DOC[:20])  # every call is cut off
+    analyzer = _analyzer(completions)
+    analyzer._cache = _ResponseCache(tmp_path / "cache.sqlite3", 900, 100)
+
+    for _ in range(2):
+        content = asyncio.run(analyzer._cached_completion("system", "prompt", 0.5, 1500, json_mode=True))
+        assert content == DOC[:20]
+    assert len(completions.max_tokens) == 2
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
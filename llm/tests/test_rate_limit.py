@@ -0,0 +1,116 @@
+"""
+Test the analyzer's rate limiting: token-bucket refill and reuse of the
+limiter across event loops
+"""
+
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace as NS
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+# Keep the analyzer from opening the shared on-disk response cache
+os.environ.setdefault("LLM_CACHE_TTL", "0")
+
+from llm.analyzer import ForexAnalyzer, _LoopLocal, _TokenBucket
+
+
+def _timed(coro_fn):
+    start = time.monotonic()
+    asyncio.run(coro_fn())
+    return time.monotonic() - start
+
+
+def test_bucket_starts_full():
+    bucket = _TokenBucket(600)
+    assert _timed(lambda: bucket.acquire(600)) < 0.05
+
+
+def test_bucket_refills_at_rate():
+    bucket = _TokenBucket(6000)  # 100 tokens per second
+    asyncio.run(bucket.acquire(6000))
+    # 10 tokens take ~0.1 s to come back
+    elapsed = _timed(lambda: bucket.acquire(10))
+    assert 0.08 <= elapsed < 0.5
+    assert bucket.tokens < 1
+
+
+def test_bucket_waiters_are_served_in_turn():
+    bucket = _TokenBucket(6000)
+    asyncio.run(bucket.acquire(6000))
+
+    async def drain():
+        await asyncio.gather(*(bucket.acquire(5) for _ in range(4)))
+
+    # 20 tokens in total at 100 per second
+    assert 0.15 <= _timed(drain) < 0.6
+
+
+def test_bucket_clamps_requests_above_capacity():
+    bucket = _TokenBucket(60)
+    assert _timed(lambda: bucket.acquire(10_000)) < 0.05
+    assert bucket.tokens < 1
+
+
+def test_bucket_is_usable_from_successive_loops():
+    bucket = _TokenBucket(6000)  # 100 tokens per second
+
+    async def contend():
+        # Waiters queue on the lock while the emptied bucket refills
+        bucket.tokens = 0
+        await asyncio.gather(*(bucket.acquire(5) for _ in range(3)))
+
+    asyncio.run(contend())
+    asyncio.run(contend())
+
+
+def test_loop_local_gives_each_loop_its_own_instance():
+    local = _LoopLocal(asyncio.Lock)
+
+    async def get_twice():
+        return local.get(), local.get()
+
+    first, again = asyncio.run(get_twice())
+    assert first is again
+    second, _ = asyncio.run(get_twice())
+    assert second is not first
+
+
+class FakeCompletions:
+    def __init__(self):
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return NS(choices=[NS(message=NS(content="ok"), finish_reason="stop")])
+
+
+def test_analyzer_semaphore_survives_new_event_loops():
+    completions = FakeCompletions()
+    # LLM_CACHE_TTL may have been read before this module set it
+    with mock.patch("llm.analyzer.LLM_CACHE_TTL", 0):
+        analyzer = ForexAnalyzer(client=NS(chat=NS(completions=completions)))
+    analyzer._sem = _LoopLocal(lambda: asyncio.Semaphore(1))  # force contention
+
+    async def batch():
+        return await asyncio.gather(*(
+            analyzer._cached_completion("system", f"prompt {i}", 0.3, 10) for i in range(3)
+        ))
+
+    assert asyncio.run(batch()) == ["ok"] * 3
+    assert asyncio.run(batch()) == ["ok"] * 3
+    loop = asyncio.new_event_loop()
+    try:
+        assert loop.run_until_complete(batch()) == ["ok"] * 3
+    finally:
+        loop.close()
+    assert completions.calls == 9
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,124 @@
+"""
+Test the finished-analysis result cache: hits for an unchanged prompt,
+misses once the news that reaches the prompt changes
+"""
+
+import asyncio
+import json
+import os
+import sys
+from pathlib import Path
+from types import SimpleNamespace as NS
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+# Keep the analyzer from opening the shared on-disk response cache
+os.environ.setdefault("LLM_CACHE_TTL", "0")
+
+from cachetools import TTLCache
+
+from llm.analyzer import ForexAnalyzer
+from scrapers.base_scraper import NewsArticle
+
+
+MTF_REPLY = json.dumps({
+    "timeframe_analysis": {"H1": {"trend": "bullish", "bias_score": 70}},
+    "confluence": {"overall_bias": "bullish", "confidence": 66},
+    "trade_recommendation": {"action": "BUY"}
+})
+
+
+class FakeStream:
+    def __init__(self, text):
+        self.text = text
+        self.sent = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.sent:
+            raise StopAsyncIteration
+        self.sent = True
+        return NS(choices=[NS(delta=NS(content=self.text), finish_reason="stop")])
+
+
+class FakeCompletions:
+    def __init__(self):
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        return FakeStream(MTF_REPLY)
+
+
+def _setup():
+    completions = FakeCompletions()
+    # LLM_CACHE_TTL may have been read before this module set it
+    with mock.patch("llm.analyzer.LLM_CACHE_TTL", 0):
+        analyzer = ForexAnalyzer(client=NS(chat=NS(completions=completions)))
+    analyzer._result_cache = TTLCache(maxsize=16, ttl=60)
+    articles = [
+        NewsArticle(title=f"Story {i}", content="rates inflation outlook " * 100, url="u", source="s")
+        for i in range(30)
+    ]
+    return analyzer, completions, articles
+
+
+def test_repeat_request_is_served_from_cache():
+    analyzer, completions, articles = _setup()
+
+    async def run():
+        first = await analyzer.analyze_multi_timeframe("EURUSD", "H1", articles)
+        first.confidence = 0  # callers get copies
+        second = await analyzer.analyze_multi_timeframe("EURUSD", "H1", articles)
+        tf = await analyzer.analyze_specific_timeframe("EURUSD", "H1", articles)
+        tf["x"] = 1
+        tf_again = await analyzer.analyze_specific_timeframe("EURUSD", "H1", articles)
+        return second, tf_again
+
+    second, tf_again = asyncio.run(run())
+    assert completions.calls == 2
+    assert second.confidence == 66
+    assert "x" not in tf_again
+
+
+def test_changed_prompt_news_misses():
+    analyzer, completions, articles = _setup()
+    asyncio.run(analyzer.analyze_multi_timeframe("EURUSD", "H1", articles))
+    articles[0] = articles[0].model_copy(update={"title": "Breaking"})
+    asyncio.run(analyzer.analyze_multi_timeframe("EURUSD", "H1", articles))
+    assert completions.calls == 2
+
+
+def test_news_outside_the_prompt_does_not_miss():
+    analyzer, completions, articles = _setup()
+    asyncio.run(analyzer.analyze_multi_timeframe("EURUSD", "H1", articles))
+    # Past the token budget, so it never reaches the prompt
+    articles[-1] = articles[-1].model_copy(update={"title": "Breaking"})
+    articles.append(NewsArticle(title="Late", content="late story", url="u", source="s"))
+    asyncio.run(analyzer.analyze_multi_timeframe("EURUSD", "H1", articles))
+    assert completions.calls == 1
+
+
+def test_other_parameters_miss():
+    analyzer, completions, articles = _setup()
+
+    async def run():
+        await analyzer.analyze_multi_timeframe("EURUSD", "H1", articles)
+        await analyzer.analyze_multi_timeframe("GBPUSD", "H1", articles)
+        await analyzer.analyze_multi_timeframe("EURUSD", "H1", articles, trading_style="scalping")
+
+    asyncio.run(run())
+    assert completions.calls == 3
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -39,13 +39,11 @@ async def daily_analysis_job():
         articles = await scraper_manager.scrape_all(pairs)
         logger.info(f"Scraped {len(articles)} articles")
         
-        # Generate analysis for each pair
+        # Generate analysis for all pairs concurrently
+        logger.info(f"Analyzing {len(pairs)} pairs...")
         results = []
-        for pair in pairs:
-            logger.info(f"Analyzing {pair}...")
-            analysis = await analyzer.analyze_pair(pair, articles)
-            recommendation = await analyzer.get_trade_recommendation(pair, analysis)
-            
+        pair_results = await analyzer.analyze_and_recommend_pairs(pairs, articles)
+        for pair, (analysis, recommendation) in pair_results.items():
             results.append({
                 "pair": pair,
                 "sentiment": analysis.sentiment,
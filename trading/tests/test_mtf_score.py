@@ -0,0 +1,48 @@
+"""
+Test batch multi-timeframe scoring against the per-symbol calculate_mtf_score
+"""
+
+import itertools
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from config.timeframes import SIGNAL_CODES, calculate_mtf_score, calculate_mtf_score_batch
+
+
+SIGNALS = list(SIGNAL_CODES)
+
+
+@pytest.mark.parametrize("timeframes", [
+    ["H1"],
+    ["M15", "H1", "H4"],
+    ["H1", "H4", "D1", "W1"],
+    ["M1", "M5", "M15", "M30", "H1"],
+    ["H4", "X9"],  # unknown timeframes weigh 0.1
+])
+def test_batch_matches_single(timeframes):
+    rows = list(itertools.product(SIGNALS, repeat=len(timeframes)))
+    matrix = np.array([[SIGNAL_CODES[s] for s in row] for row in rows])
+
+    batch = calculate_mtf_score_batch(matrix, timeframes)
+
+    for i, row in enumerate(rows):
+        single = calculate_mtf_score(dict(zip(timeframes, row)))
+        assert batch["direction"][i] == single["direction"], row
+        for key in ("confidence", "confluence", "bullish_score", "bearish_score"):
+            assert batch[key][i] == single[key], (row, key)
+
+
+def test_batch_without_timeframes():
+    batch = calculate_mtf_score_batch(np.zeros((3, 0)), [])
+    single = calculate_mtf_score({})
+    assert list(batch["direction"]) == [single["direction"]] * 3
+    assert list(batch["confidence"]) == [single["confidence"]] * 3
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,70 @@
+"""
+Test RiskManager position sizing and the daily loss limit
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from indicators.risk_manager import RiskManager
+
+
+PAIRS = ["EURUSD", "usdjpy", "XAUUSD", "USDCAD", "EXOTIC"]
+
+
+@pytest.mark.parametrize("balance", [250.0, 10_000.0, 1_000_000.0])
+@pytest.mark.parametrize("risk_percent", [None, 0.5, 5.0])
+def test_bulk_sizes_match_single(balance, risk_percent):
+    rm = RiskManager(account_balance=balance)
+    sl_pips = [0, 7, 20, 35, 150]
+    tp_pips = [10, 14, 40, 90, 300]
+    pairs = [pair for pair in PAIRS for _ in sl_pips]
+    sl = sl_pips * len(PAIRS)
+    tp = tp_pips * len(PAIRS)
+
+    bulk = rm.calculate_position_sizes_bulk(pairs, sl, tp, risk_percent)
+
+    assert len(bulk) == len(pairs)
+    for i, (pair, sl_i, tp_i) in enumerate(zip(pairs, sl, tp)):
+        single = rm.calculate_position_size(pair, sl_i, tp_i, risk_percent)
+        got = bulk.get(i)
+        assert got.lots == pytest.approx(single.lots), (pair, sl_i)
+        assert got.risk_amount == single.risk_amount
+        assert got.risk_percent == single.risk_percent
+        assert got.pip_value == single.pip_value
+        assert (got.sl_pips, got.tp_pips) == (single.sl_pips, single.tp_pips)
+        assert got.potential_loss == pytest.approx(single.potential_loss)
+        assert got.potential_profit == pytest.approx(single.potential_profit)
+
+
+def test_bulk_sizes_empty():
+    assert len(RiskManager().calculate_position_sizes_bulk([], [], [])) == 0
+
+
+@pytest.mark.parametrize("percent", [5.0, 2.5])
+def test_should_stop_trading_follows_update_balance(percent):
+    rm = RiskManager(account_balance=10_000.0)
+    limit = 10_000.0 * percent / 100
+    assert not rm.should_stop_trading(-limit + 1, percent)
+    assert rm.should_stop_trading(-limit, percent)
+
+    rm.update_balance(4_000.0)
+    limit = 4_000.0 * percent / 100
+    assert rm.calculate_max_daily_loss(percent) == limit
+    assert not rm.should_stop_trading(-limit + 1, percent)
+    assert rm.should_stop_trading(-limit, percent)
+    assert not rm.should_stop_trading(250.0, percent)
+
+
+def test_default_limit_matches_explicit_five_percent():
+    rm = RiskManager(account_balance=7_300.0)
+    rm.update_balance(12_345.67)
+    for pnl in (-700.0, -617.28, -617.2835, -617.29, -600.0):
+        assert rm.should_stop_trading(pnl) == (pnl <= -rm.calculate_max_daily_loss(5.0))
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
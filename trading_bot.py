@@ -12,9 +12,13 @@ This bot:
 import asyncio
 import json
 import logging
+import signal
+import sys
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Optional
+
+import orjson
 
 from config.settings import DATA_DIR, PAIR_CONFIGS
 from scrapers import ScraperManager
@@ -75,13 +79,15 @@ class TradingBot:
         self.daily_pnl = 0.0
         self.last_trade_time: Dict[str, datetime] = {}
         self.trade_cooldown_minutes = 60
+        self.cycle_interval = 300  # seconds between trading cycles
+        self._stop: Optional[asyncio.Event] = None
         
         # Load pairs configuration
         self.pairs = self._load_pairs()
         
-        # Trade log
-        self.trade_log_file = DATA_DIR / "trade_log.json"
-        self.trade_log = self._load_trade_log()
+        # Trade log (JSON Lines: one trade per line, appended; never loaded whole)
+        self.trade_log_file = DATA_DIR / "trade_log.jsonl"
+        self._migrate_trade_log(DATA_DIR / "trade_log.json")
     
     def _load_pairs(self) -> Dict:
         """Load configured pairs"""
@@ -89,19 +95,26 @@ class TradingBot:
         if pairs_file.exists():
             with open(pairs_file) as f:
                 return json.load(f)
-        return PAIR_CONFIGS
+        return dict(PAIR_CONFIGS)
     
-    def _load_trade_log(self) -> List:
-        """Load trade log"""
-        if self.trade_log_file.exists():
-            with open(self.trade_log_file) as f:
-                return json.load(f)
-        return []
+    def _migrate_trade_log(self, legacy_file: Path):
+        """Convert the old JSON array trade log to JSON Lines, once"""
+        if not legacy_file.exists() or self.trade_log_file.exists():
+            return
+        with open(legacy_file, "rb") as f:
+            trades = orjson.loads(f.read())
+        # Write aside and rename, so an interrupted run is simply retried
+        tmp_file = self.trade_log_file.with_suffix(".jsonl.tmp")
+        with open(tmp_file, "wb") as f:
+            for trade in trades:
+                f.write(orjson.dumps(trade, default=str, option=orjson.OPT_APPEND_NEWLINE))
+        tmp_file.replace(self.trade_log_file)
+        logger.info(f"Migrated {len(trades)} trades from {legacy_file.name} to {self.trade_log_file.name}")
     
-    def _save_trade_log(self):
-        """Save trade log"""
-        with open(self.trade_log_file, "w") as f:
-            json.dump(self.trade_log, f, indent=2, default=str)
+    def _save_trade_log(self, trade_entry: Dict):
+        """Append a trade to the log file"""
+        with open(self.trade_log_file, "ab") as f:
+            f.write(orjson.dumps(trade_entry, default=str, option=orjson.OPT_APPEND_NEWLINE))
     
     async def run(self):
         """Main bot loop"""
@@ -112,17 +125,34 @@ class TradingBot:
             if not self.trade_executor.connect():
                 logger.error("Failed to connect to MT5. Running in analysis-only mode.")
         
+        self._stop = asyncio.Event()
+        if sys.platform != "win32":
+            # Wake the idle wait on SIGTERM/SIGINT instead of polling
+            loop = asyncio.get_running_loop()
+            for sig in (signal.SIGTERM, signal.SIGINT):
+                loop.add_signal_handler(sig, self.stop)
+        
         try:
-            while True:
+            while not self._stop.is_set():
                 await self._trading_cycle()
                 
-                # Wait before next cycle
-                await asyncio.sleep(300)  # 5 minutes
+                # Wait before next cycle, or until stopped
+                try:
+                    await asyncio.wait_for(self._stop.wait(), timeout=self.cycle_interval)
+                except asyncio.TimeoutError:
+                    pass
+            logger.info("Bot stopped")
                 
         except KeyboardInterrupt:
             logger.info("Bot stopped by user")
         finally:
             self.trade_executor.disconnect()
+            await self.analyzer.aclose()
+    
+    def stop(self):
+        """Ask the run loop to exit after the current cycle"""
+        if self._stop is not None:
+            self._stop.set()
     
     async def _trading_cycle(self):
         """Single trading cycle"""
@@ -144,8 +174,9 @@ class TradingBot:
             return
         
         # Analyze each pair
+        articles_index = self.analyzer.build_pair_index(articles)
         for pair in self.pairs.keys():
-            await self._analyze_and_trade(pair, articles)
+            await self._analyze_and_trade(pair, articles, articles_index)
         
         # Update account info
         if self.trade_executor.connected:
@@ -154,7 +185,7 @@ class TradingBot:
                 self.risk_manager.update_balance(account_info["balance"])
                 logger.info(f"Account balance: {account_info['balance']}")
     
-    async def _analyze_and_trade(self, pair: str, articles: list):
+    async def _analyze_and_trade(self, pair: str, articles: list, articles_index: dict = None):
         """Analyze pair and execute trade if conditions met"""
         logger.info(f"Analyzing {pair}...")
         
@@ -164,8 +195,9 @@ class TradingBot:
             return
         
         # Get analysis
-        analysis = await self.analyzer.analyze_pair(pair, articles)
-        recommendation = await self.analyzer.get_trade_recommendation(pair, analysis)
+        analysis, recommendation = await self.analyzer.analyze_and_recommend(
+            pair, articles, articles_index=articles_index
+        )
         
         logger.info(f"{pair}: {recommendation.recommendation} ({recommendation.confidence}% confidence)")
         
@@ -299,8 +331,7 @@ class TradingBot:
             "order_id": order_id
         }
         
-        self.trade_log.append(trade_entry)
-        self._save_trade_log()
+        self._save_trade_log(trade_entry)
     
     def reset_daily_stats(self):
         """Reset daily statistics (call at start of trading day)"""